@@ -8,6 +8,7 @@ from .editor import Editor
 from .copywriter import Copywriter
 from .quality_assurance import QualityAssurance
 from .html_formatter import HTMLFormatter
+from .agent_registry import AgentRegistry
 
 __all__ = [
     'ContentStrategist',
@@ -16,5 +17,6 @@ __all__ = [
     'Editor',
     'Copywriter',
     'QualityAssurance',
-    'HTMLFormatter'
+    'HTMLFormatter',
+    'AgentRegistry'
 ]
\ No newline at end of file
@@ -1,37 +1,114 @@
 """
 Base agent class for press release enhancement system.
 """
-from crewai import Agent
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+# Generation parameters shared by all agents; only the temperature differs per agent
+LLM_PARAMS = {
+    "model": "google/gemini-2.0-flash",  # Added provider prefix
+    "top_p": 0.95,
+    "top_k": 64,
+    "max_output_tokens": 4000,
+}
 
 class BaseAgent:
-    """Base class for all agents in the press release system."""
+    """
+    Base class for all agents in the press release system.
+    
+    Subclasses declare the agent's role, goal, backstory, delegation and
+    temperature; create_agent builds the CrewAI agent from them. The
+    declaration alone describes the agent (see fingerprint), so callers can
+    decide whether an agent is needed before paying for its LLM.
+    """
     
-    def __init__(self, api_key):
+    role = ""
+    goal = ""
+    backstory = ""
+    allow_delegation = False
+    temperature = 0.7
+    
+    def __init__(self, api_key, response_cache=None, cache_sampled=False, trace=None, rate_limiter=None, client_pool=None):
         """
         Initialize the base agent.
         
         Args:
             api_key: Google AI API key
+            response_cache: Optional ResponseCache shared by all agents
+            cache_sampled: Whether to reuse cached responses even when temperature > 0
+            trace: Optional RunTrace recording every LLM call of this agent; without one,
+                calls are recorded in the trace active on the calling thread
+            rate_limiter: Optional RateLimiter shared by all LLM clients of the process
+            client_pool: Optional LLMClientPool; without one, each agent gets its own client
         """
         self.api_key = api_key
+        self.response_cache = response_cache
+        self.cache_sampled = cache_sampled
+        self.trace = trace
+        self.rate_limiter = rate_limiter
+        self.client_pool = client_pool
+    
+    def llm_params(self, temperature=None):
+        """Generation parameters of this agent's LLM."""
+        params = dict(LLM_PARAMS)
+        params["temperature"] = self.temperature if temperature is None else temperature
+        return params
+    
+    def fingerprint(self):
+        """
+        Describe the parts of the agent's configuration that influence its
+        output, without creating the agent.
+        
+        Returns:
+            dict: Role, goal, backstory and LLM generation parameters
+        """
+        return {
+            "role": self.role,
+            "goal": self.goal,
+            "backstory": self.backstory,
+            "llm": self.llm_params(),
+        }
     
-    def create_llm(self, temperature=0.7):
+    def create_llm(self, temperature=None):
         """Create a language model instance for this agent."""
+        params = self.llm_params(temperature)
+        
+        # Sampled (temperature > 0) responses are only reused when explicitly allowed
+        cache = None
+        if self.response_cache is not None and (params["temperature"] == 0 or self.cache_sampled):
+            from llm.langchain_cache import LangChainResponseCache
+            cache = LangChainResponseCache(self.response_cache, params)
+        
+        callbacks = []
+        rate_limiter = None
+        if self.rate_limiter is not None:
+            from llm.langchain_rate_limiter import LangChainRateLimiter, RateLimitCallbackHandler
+            rate_limiter = LangChainRateLimiter(self.rate_limiter)
+            # Must run before the trace callback, which resets the cache hit flag
+            callbacks.append(RateLimitCallbackHandler(self.rate_limiter))
+        from llm.trace_callback import TraceCallbackHandler
+        callbacks.append(TraceCallbackHandler(self.trace, type(self).__name__, model=params["model"]))
+        
+        options = {"cache": cache, "callbacks": callbacks, "rate_limiter": rate_limiter}
+        if self.client_pool is not None:
+            return self.client_pool.get(self.api_key, params, **options)
+        
+        # Imported here so that importing the agents does not load LangChain
         from langchain_google_genai import ChatGoogleGenerativeAI
         
         return ChatGoogleGenerativeAI(
-            model="google/gemini-2.0-flash",  # Added provider prefix
             google_api_key=self.api_key,
-            temperature=temperature,
-            top_p=0.95,
-            top_k=64,
-            max_output_tokens=4000,
+            **options,
+            **params,
         )
     
     def create_agent(self):
-        """
-        Create and return a CrewAI agent. 
-        Must be implemented by subclasses.
-        """
-        raise NotImplementedError("Subclasses must implement create_agent()")
\ No newline at end of file
+        """Create and return the CrewAI agent described by this class."""
+        from crewai import Agent
+        
+        return Agent(
+            role=self.role,
+            goal=self.goal,
+            backstory=self.backstory,
+            verbose=True,
+            allow_delegation=self.allow_delegation,
+            llm=self.create_llm(),
+        )
\ No newline at end of file
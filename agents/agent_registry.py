@@ -0,0 +1,72 @@
+"""
+Lazy agent registry for the press release enhancement system.
+"""
+import re
+import threading
+from typing import Any, Dict, List
+
+from .agent_base import BaseAgent
+
+class AgentRegistry:
+    """
+    Holds the agent wrappers of a workflow and creates each CrewAI agent the
+    first time a stage needs it. Stages whose output is reused never build
+    their agent or its LLM.
+
+    A CrewAI agent keeps per-execution state, so every stage gets its own
+    agent: parallel branches of the same agent (fact_checking_1 and
+    fact_checking_2) never share one. The agents of a wrapper share its
+    pooled LLM client.
+    """
+
+    def __init__(self, wrappers: Dict[str, BaseAgent], stage_agents: Dict[str, str]):
+        """
+        Args:
+            wrappers: Mapping of agent name to agent wrapper
+            stage_agents: Mapping of stage name to agent name. Numbered branch
+                stages (e.g. fact_checking_1) fall back to their base stage.
+        """
+        self.wrappers = wrappers
+        self.stage_agents = stage_agents
+        self._agents: Dict[str, Any] = {}
+        self._stage_agents: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def agent_name(self, stage: str) -> str:
+        """Name of the agent that runs a stage."""
+        name = self.stage_agents.get(stage) or self.stage_agents.get(re.sub(r"_\d+$", "", stage))
+        if name is None:
+            raise ValueError(f"No agent assigned to stage '{stage}'")
+        return name
+
+    def get(self, name: str) -> Any:
+        """Return the CrewAI agent with this name, creating it on first use."""
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                agent = self.wrappers[name].create_agent()
+                self._agents[name] = agent
+            return agent
+
+    def all(self) -> Dict[str, Any]:
+        """Create (if needed) and return all agents."""
+        return {name: self.get(name) for name in self.wrappers}
+
+    def resolve(self, stage: str) -> Any:
+        """Return the agent of a stage (not shared with any other stage), creating it on first use."""
+        name = self.agent_name(stage)
+        with self._lock:
+            agent = self._stage_agents.get(stage)
+            if agent is None:
+                agent = self.wrappers[name].create_agent()
+                self._stage_agents[stage] = agent
+            return agent
+
+    def fingerprint(self, stage: str) -> Dict[str, Any]:
+        """Configuration of the agent that runs a stage, without creating it."""
+        return self.wrappers[self.agent_name(stage)].fingerprint()
+
+    @property
+    def built(self) -> List[str]:
+        """Names of the agents created so far, and of the stages that got their own agent."""
+        return list(self._agents) + list(self._stage_agents)
@@ -0,0 +1,117 @@
+"""
+Batch mode: generate press releases for every prompt in user_input/ concurrently.
+"""
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+def find_prompt_files(prompt_dir: Path) -> List[Path]:
+    """
+    Find all prompt files in a directory.
+
+    Args:
+        prompt_dir: Directory containing user prompt .txt files
+
+    Returns:
+        List of prompt file paths, sorted by name
+    """
+    return sorted(p for p in Path(prompt_dir).glob("*.txt") if p.is_file())
+
+def run_batch(
+    pr_system,
+    run_pipeline: Callable[[Any], Optional[str]],
+    prompt_dir: Optional[Path] = None,
+    output_dir: Optional[Path] = None,
+    workers: int = 4
+) -> Dict[str, Any]:
+    """
+    Run the pipeline for every prompt file, sharing one warm system.
+
+    Args:
+        pr_system: Initialized PressReleaseEnhancementSystem; its corpus, index,
+            client and caches are shared by all jobs
+        run_pipeline: Function that runs one system and returns its output (or None on failure)
+        prompt_dir: Directory with prompt files (defaults to <base_path>/user_input)
+        output_dir: Directory for outputs (defaults to <base_path>/data/batch)
+        workers: Number of pipelines to run concurrently
+
+    Returns:
+        dict: Batch summary with wall time, per-prompt latency and failures
+    """
+    prompt_dir = Path(prompt_dir or pr_system.base_path / "user_input")
+    output_dir = Path(output_dir or pr_system.base_path / "data/batch")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    prompt_files = find_prompt_files(prompt_dir)
+    if not prompt_files:
+        print(f"No prompt files found in {prompt_dir}")
+        return {"prompts": 0, "succeeded": 0, "failed": 0, "wall_time": 0.0, "results": []}
+
+    print(f"Running batch of {len(prompt_files)} prompts with {workers} workers...")
+
+    def run_one(prompt_path: Path) -> Dict[str, Any]:
+        output_path = output_dir / f"{prompt_path.stem}.txt"
+        start = time.time()
+        entry = {"prompt": prompt_path.name, "output": str(output_path), "success": False, "error": None}
+        try:
+            user_prompt = pr_system._load_file(prompt_path)
+            job = pr_system.with_user_prompt(user_prompt, output_path=output_path)
+            result = run_pipeline(job)
+            entry["success"] = bool(result)
+            if not result:
+                entry["error"] = "Pipeline returned no output"
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        entry["latency"] = time.time() - start
+        return entry
+
+    batch_start = time.time()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(run_one, path) for path in prompt_files]
+        for future in as_completed(futures):
+            entry = future.result()
+            status = "OK" if entry["success"] else "FAILED"
+            print(f"[{status}] {entry['prompt']} in {entry['latency']:.2f}s")
+            results.append(entry)
+    wall_time = time.time() - batch_start
+
+    results.sort(key=lambda entry: entry["prompt"])
+    succeeded = sum(1 for entry in results if entry["success"])
+    summary = {
+        "prompts": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "workers": workers,
+        "wall_time": wall_time,
+        "total_latency": sum(entry["latency"] for entry in results),
+        "results": results
+    }
+
+    with open(output_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print_summary(summary)
+    print(f"Batch summary saved to {output_dir / 'summary.json'}")
+    return summary
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """Print a table of per-prompt latency and the overall batch timing."""
+    print("\n" + "=" * 80)
+    print("BATCH SUMMARY")
+    print("=" * 80)
+    print(f"{'Prompt':<40} {'Status':<8} {'Latency':>10}")
+    print("-" * 80)
+    for entry in summary["results"]:
+        status = "OK" if entry["success"] else "FAILED"
+        print(f"{entry['prompt']:<40} {status:<8} {entry['latency']:>9.2f}s")
+        if entry["error"]:
+            print(f"    {entry['error']}")
+    print("-" * 80)
+    print(f"Prompts: {summary['prompts']}, succeeded: {summary['succeeded']}, failed: {summary['failed']}")
+    print(f"Wall time: {summary['wall_time']:.2f}s "
+          f"(sum of per-prompt latency: {summary['total_latency']:.2f}s, workers: {summary['workers']})")
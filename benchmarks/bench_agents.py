@@ -0,0 +1,144 @@
+"""
+Agent creation benchmark: one LLM client per agent versus the shared client pool.
+
+For a number of consecutive runs, builds the seven workflow agents either the
+old way (every agent constructs its own ChatGoogleGenerativeAI) or through one
+LLMClientPool shared across runs. Reports creation time, how many chat model
+clients were constructed and how many sockets the process holds.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_agents --runs 5
+    python -m benchmarks.bench_agents --runs 5 --fake      # without langchain-google-genai / network
+    python -m benchmarks.bench_agents --runs 5 --invoke    # also send one request per agent
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict
+
+from .stub_clients import patched_chat_model
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def open_sockets() -> int:
+    """Number of socket file descriptors of this process (Linux only, -1 elsewhere)."""
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return -1
+    count = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                count += 1
+        except OSError:
+            pass
+    return count
+
+
+@contextmanager
+def counting_constructor(counter: Dict[str, int]):
+    """Count ChatGoogleGenerativeAI constructions while the block runs."""
+    import langchain_google_genai
+
+    original = langchain_google_genai.ChatGoogleGenerativeAI
+
+    def construct(*args: Any, **kwargs: Any) -> Any:
+        counter["constructed"] += 1
+        return original(*args, **kwargs)
+
+    langchain_google_genai.ChatGoogleGenerativeAI = construct
+    try:
+        yield
+    finally:
+        langchain_google_genai.ChatGoogleGenerativeAI = original
+
+
+def make_registry(api_key: str, client_pool: Any):
+    from agents import (
+        AgentRegistry,
+        ContentStrategist,
+        PressReleaseWriter,
+        FactChecker,
+        Editor,
+        Copywriter,
+        QualityAssurance,
+        HTMLFormatter
+    )
+    from press_release_system import STAGE_AGENTS
+
+    classes = {
+        "content_strategist": ContentStrategist,
+        "writer": PressReleaseWriter,
+        "fact_checker": FactChecker,
+        "editor": Editor,
+        "copywriter": Copywriter,
+        "quality_assurance": QualityAssurance,
+        "html_formatter": HTMLFormatter,
+    }
+    wrappers = {name: cls(api_key, client_pool=client_pool) for name, cls in classes.items()}
+    return AgentRegistry(wrappers, STAGE_AGENTS)
+
+
+def run_mode(pooled: bool, runs: int, invoke: bool, api_key: str) -> Dict[str, Any]:
+    """Build all agents once per run and measure it."""
+    from llm import LLMClientPool
+
+    pool = LLMClientPool() if pooled else None
+    counter = {"constructed": 0}
+    sockets_before = open_sockets()
+    times = []
+    with counting_constructor(counter):
+        for _ in range(runs):
+            registry = make_registry(api_key, pool)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                agents = registry.all()
+            times.append(time.perf_counter() - start)
+            if invoke:
+                for agent in agents.values():
+                    agent.llm.invoke("Antwoord met één woord: ok")
+    return {
+        "mode": "pooled" if pooled else "per-agent",
+        "runs": runs,
+        "first_run": times[0],
+        "mean_later_runs": statistics.mean(times[1:]) if len(times) > 1 else times[0],
+        "total": sum(times),
+        "clients_constructed": counter["constructed"] if not pooled else pool.stats()["clients"],
+        "sockets_opened": open_sockets() - sockets_before if sockets_before >= 0 else -1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Agent creation benchmark: per-agent clients vs shared pool')
+    parser.add_argument('--runs', type=int, default=5, help='Consecutive runs that build all agents')
+    parser.add_argument('--fake', action='store_true', help='Use the offline stub chat model')
+    parser.add_argument('--invoke', action='store_true', help='Send one request per agent after building it')
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    sys.path.insert(0, str(REPO_ROOT))
+    api_key = os.environ["GEMINI_API_KEY"]
+
+    context = patched_chat_model() if args.fake else contextlib.nullcontext()
+    with context:
+        results = [run_mode(False, args.runs, args.invoke, api_key), run_mode(True, args.runs, args.invoke, api_key)]
+
+    print(f"{'Mode':<10} {'First run':>10} {'Later runs':>11} {'Total':>9} {'Clients':>8} {'Sockets':>8}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['first_run'] * 1000:>8.1f}ms {r['mean_later_runs'] * 1000:>9.1f}ms "
+              f"{r['total'] * 1000:>7.1f}ms {r['clients_constructed']:>8} {r['sockets_opened']:>8}")
+    baseline, pooled = results
+    if pooled["total"] > 0:
+        print(f"Agent creation is {baseline['total'] / pooled['total']:.1f}x faster with the pool "
+              f"({baseline['clients_constructed']} -> {pooled['clients_constructed']} clients)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Near-duplicate collapse benchmark: context tokens saved by sending each
+near-duplicate article cluster and repeated paragraph only once.
+
+Runs on the repository corpus and on a synthetic corpus of recycled press
+releases: each synthetic article reuses another article's paragraphs, with
+some dropped and some borrowed from a third article, the way releases
+recycle Bouwbalans figures and quotes. For each corpus it reports the
+clusters found, the build time and the estimated tokens of:
+
+    corpus    the whole corpus as sent without retrieval
+    bm25      the top --top_k articles for each query
+    passages  the top --top_passages passages for each query (needs NumPy)
+
+with and without collapsing.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_dedup --articles 2000 --queries 50
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from .bench_retrieval import sample_queries
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def iter_recycled_articles(num_articles: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Synthetic articles that recycle paragraphs of the repository's articles."""
+    rng = random.Random(seed)
+    with open(REPO_ROOT / "data/emv_pers.json", "r", encoding="utf-8") as f:
+        source = json.load(f)
+    for i in range(num_articles):
+        article = dict(source[i % len(source)])
+        if i >= len(source):
+            paragraphs = article["content"].split("\n")
+            if len(paragraphs) > 3 and rng.random() < 0.5:
+                del paragraphs[rng.randrange(len(paragraphs))]
+            donor = source[rng.randrange(len(source))]["content"].split("\n")
+            start = rng.randrange(len(donor))
+            paragraphs[rng.randrange(len(paragraphs) + 1):0] = donor[start:start + rng.randint(1, 3)]
+            article["content"] = "\n".join(paragraphs)
+            article["url"] = f"{article['url'].rstrip('/')}-{i}/"
+            article["title"] = f"{article['title']} ({i})"
+        yield article
+
+
+def _tokens(value) -> int:
+    from corpus import estimate_tokens
+
+    return estimate_tokens(json.dumps(value, ensure_ascii=False, indent=4))
+
+
+def measure(name: str, source: Path, args) -> None:
+    from corpus import (
+        BM25Index, CompiledCorpus, DuplicateIndex, PassageIndex, numpy_available, select_articles, select_passages
+    )
+
+    with CompiledCorpus.load_or_compile(source) as store:
+        start = time.perf_counter()
+        duplicates = DuplicateIndex.build(store)
+        seconds = time.perf_counter() - start
+        clustered = sum(len(members) for members in duplicates.members.values())
+        print(f"{name}: {len(store)} articles, {len(duplicates.members)} article clusters "
+              f"({clustered} articles), {duplicates.num_paragraph_clusters} repeated paragraphs, "
+              f"built in {seconds:.2f}s")
+
+        doc_ids = range(len(store))
+        before, after = _tokens(list(store)), _tokens(duplicates.collapse(store, doc_ids))
+        print(f"  corpus    {before:>9} -> {after:>9} tokens ({1 - after / before:.1%} saved)")
+
+        queries = sample_queries(store, args.queries)
+        selectors = [("bm25", select_articles, BM25Index.build(store), args.top_k)]
+        if numpy_available():
+            selectors.append(("passages", select_passages, PassageIndex.build(store), args.top_passages))
+        for label, select, index, top_k in selectors:
+            savings, totals = [], [0, 0]
+            for query in queries:
+                plain = _tokens(select(store, index, query, top_k=top_k))
+                collapsed = _tokens(select(store, index, query, top_k=top_k, duplicates=duplicates))
+                totals[0] += plain
+                totals[1] += collapsed
+                savings.append(1 - collapsed / max(1, plain))
+            print(f"  {label:<9} {totals[0] // len(queries):>9} -> {totals[1] // len(queries):>9} tokens per query "
+                  f"(median {statistics.median(savings):.1%} saved, max {max(savings):.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicate collapse benchmark')
+    parser.add_argument('--articles', type=int, default=2000, help='Size of the synthetic recycled corpus')
+    parser.add_argument('--queries', type=int, default=50, help='Number of queries per corpus')
+    parser.add_argument('--top_k', type=int, default=8, help='Articles retrieved per query')
+    parser.add_argument('--top_passages', type=int, default=20, help='Passages retrieved per query')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    with tempfile.TemporaryDirectory(prefix="bench_dedup_") as tmp:
+        repo_corpus = Path(tmp) / "repository.json"
+        repo_corpus.write_bytes((REPO_ROOT / "data/emv_pers.json").read_bytes())
+        measure("repository corpus", repo_corpus, args)
+
+        recycled = Path(tmp) / "recycled.json"
+        with open(recycled, "w", encoding="utf-8") as f:
+            json.dump(list(iter_recycled_articles(args.articles)), f, ensure_ascii=False, indent=4)
+        measure("recycled corpus", recycled, args)
+
+
+if __name__ == "__main__":
+    main()
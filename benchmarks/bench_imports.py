@@ -0,0 +1,129 @@
+"""
+Import-time benchmark for the entry-point modules.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+reports the cumulative import time and the slowest imports, and fails when
+a module pulls in one of the heavy dependencies that must only be loaded by
+the code path that needs them (CrewAI, LangChain, the GenAI SDK).
+
+The startup of ``main`` is checked the same way: importing it and creating
+the system from the default command line may not load those dependencies
+either (they are needed once a workflow runs, not to set it up).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_imports --repeats 5 --budget_ms 150
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = ["press_release_system", "main"]
+
+# Entry-point startups: code run in a fresh interpreter, timed as a whole
+STARTUPS = {
+    "main.create_system": "import main; main.create_system(main.build_parser().parse_args(['--base_path', '.']))",
+}
+
+# Top-level packages that may only be imported when a run actually needs them
+HEAVY_PACKAGES = ["crewai", "langchain", "langchain_core", "langchain_google_genai", "google.genai", "requests"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s?( *)(\S+)")
+
+
+def import_profile(module: str, code: Optional[str] = None) -> List[Tuple[str, int, int]]:
+    """
+    Import a module (or run code) in a fresh interpreter with -X importtime.
+
+    Returns:
+        List of (module, self_us, cumulative_us) for every module imported
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    # Creating the system needs a key, but no request is made
+    env.setdefault("GEMINI_API_KEY", "placeholder")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code or f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return entries
+
+
+def heavy_imports(entries: List[Tuple[str, int, int]]) -> List[str]:
+    """Return the heavy packages that were imported."""
+    imported = {name for name, _, _ in entries}
+    return [pkg for pkg in HEAVY_PACKAGES if pkg in imported]
+
+
+def measure(module: str, repeats: int, code: Optional[str] = None) -> Dict[str, object]:
+    """
+    Import a module (or run a startup snippet) several times and summarize the
+    time: the module's cumulative import time, or the wall time of the snippet.
+    """
+    totals = []
+    entries: List[Tuple[str, int, int]] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        entries = import_profile(module, code)
+        if code is not None:
+            totals.append((time.perf_counter() - start) * 1000)
+            continue
+        top = [cumulative for name, _, cumulative in entries if name == module]
+        totals.append(top[-1] / 1000 if top else 0.0)
+    slowest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:10]
+    return {
+        "module": module,
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "heavy": heavy_imports(entries),
+        "slowest": [(name, self_us / 1000) for name, self_us, _ in slowest],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time benchmark and lazy-import guard')
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES, help='Modules to import')
+    parser.add_argument('--repeats', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--budget_ms', type=float, default=None,
+                        help='Fail if the median import time of a module exceeds this budget')
+    parser.add_argument('--no-startup', dest='no_startup', action='store_true',
+                        help='Skip the entry-point startups (%s)' % ", ".join(STARTUPS))
+    args = parser.parse_args()
+
+    targets = [(module, None) for module in args.modules]
+    if not args.no_startup:
+        targets += list(STARTUPS.items())
+
+    failed = False
+    for module, code in targets:
+        result = measure(module, args.repeats, code)
+        print(f"{module}: median {result['median_ms']:.1f} ms, best {result['min_ms']:.1f} ms "
+              f"over {args.repeats} run(s)")
+        for name, self_ms in result["slowest"]:
+            print(f"    {self_ms:>8.2f} ms  {name}")
+        if result["heavy"]:
+            print(f"  FAIL: {module} imports heavy dependencies {'at startup' if code else 'at import time'}: {', '.join(result['heavy'])}")
+            failed = True
+        if code is None and args.budget_ms is not None and result["median_ms"] > args.budget_ms:
+            print(f"  FAIL: {module} exceeds the import budget of {args.budget_ms:.0f} ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Corpus ingestion memory benchmark: whole-file JSON parsing versus streaming.
+
+For each corpus size, writes a synthetic emv_pers.json (streamed, so the
+generator itself stays small) and measures in a fresh interpreter per method:
+
+    load     read the file and json.loads it, as ingestion did before streaming
+    compile  stream the file into the compiled corpus store
+    index    build the BM25 index by streaming articles out of the compiled store
+
+Reports wall time and peak resident memory above the interpreter's baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_ingest --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from .bench_pipeline import iter_synthetic_articles
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+METHODS = ["load", "compile", "index"]
+
+
+def write_synthetic_corpus(path: Path, num_articles: int) -> None:
+    """Write a synthetic corpus JSON one article at a time."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, article in enumerate(iter_synthetic_articles(num_articles)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(article, ensure_ascii=False, indent=4))
+        f.write("\n]")
+
+
+def _current_rss_mb() -> float:
+    """Resident memory of this process in MiB (Linux /proc, falls back to the peak)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def measure(method: str, source: Path) -> Dict[str, Any]:
+    """Run one ingestion method in this process and measure it."""
+    from corpus import BM25Index, CompiledCorpus
+
+    baseline = _current_rss_mb()
+    start = time.perf_counter()
+    if method == "load":
+        with open(source, "r", encoding="utf-8") as f:
+            count = len(json.loads(f.read()))
+    elif method == "compile":
+        count = len(CompiledCorpus.compile(source))
+    elif method == "index":
+        with CompiledCorpus.open(CompiledCorpus.store_path_for(source)) as store:
+            count = BM25Index.build(store).num_docs
+    else:
+        raise ValueError(f"Unknown method '{method}'")
+    return {
+        "method": method,
+        "articles": count,
+        "seconds": time.perf_counter() - start,
+        "peak_mb": _peak_rss_mb() - baseline,
+    }
+
+
+def measure_in_subprocess(method: str, source: Path) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_ingest", "--measure", method, str(source)],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Measuring {method} on {source} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Corpus ingestion memory benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Synthetic corpus sizes (articles)')
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS,
+                        help='Ingestion methods to measure')
+    parser.add_argument('--json', type=str, help='Also write the results to this JSON file')
+    parser.add_argument('--measure', nargs=2, metavar=('METHOD', 'SOURCE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        sys.path.insert(0, str(REPO_ROOT))
+        print(json.dumps(measure(args.measure[0], Path(args.measure[1]))))
+        return
+
+    results = []
+    print(f"{'Articles':>9} {'Source':>9} {'Method':<8} {'Time':>8} {'Peak memory':>12}")
+    with tempfile.TemporaryDirectory(prefix="bench_ingest_") as tmp:
+        for size in args.sizes:
+            source = Path(tmp) / f"emv_pers_{size}.json"
+            write_synthetic_corpus(source, size)
+            source_mb = source.stat().st_size / 2 ** 20
+            methods = list(args.methods)
+            if "index" in methods and "compile" not in methods:
+                methods.insert(methods.index("index"), "compile")
+            for method in methods:
+                result = measure_in_subprocess(method, source)
+                result["size"] = size
+                result["source_mb"] = source_mb
+                results.append(result)
+                print(f"{size:>9} {source_mb:>7.1f}MB {method:<8} {result['seconds']:>7.2f}s "
+                      f"{result['peak_mb']:>10.1f}MB")
+            source.unlink()
+            store_path = source.with_suffix(".corpus")
+            if store_path.exists():
+                store_path.unlink()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+End-to-end pipeline benchmark that runs fully offline.
+
+Drives the crew path and the legacy paths against local stubs (see
+stub_clients.py and fake_gemini_server.py) at several synthetic corpus sizes.
+It reports throughput, pipeline overhead (wall time not spent waiting on the
+model), per-stage overhead and peak Python memory.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pipeline --sizes 60 600 3000 --latency 0.05
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from .fake_gemini_server import FakeGeminiServer
+from .stub_clients import FakeGenaiClient, patched_chat_model, stub_config
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PATHS = ["crew", "crew-parallel", "legacy-client", "legacy-http"]
+
+
+def iter_synthetic_articles(num_articles: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a corpus of the requested size by cycling through the real articles
+    and making URLs and titles unique.
+    """
+    with open(REPO_ROOT / "data/emv_pers.json", "r", encoding="utf-8") as f:
+        source = json.load(f)
+    for i in range(num_articles):
+        article = dict(source[i % len(source)])
+        if i >= len(source):
+            article["url"] = f"{article['url'].rstrip('/')}-{i}/"
+            article["title"] = f"{article['title']} ({i})"
+        yield article
+
+
+def synthetic_articles(num_articles: int) -> List[Dict[str, Any]]:
+    """Build a synthetic corpus of the requested size as a list."""
+    return list(iter_synthetic_articles(num_articles))
+
+
+def make_workspace(root: Path, num_articles: int) -> Path:
+    """Create a base_path with a synthetic corpus and the repository's prompts."""
+    base = root / f"corpus_{num_articles}"
+    (base / "data").mkdir(parents=True, exist_ok=True)
+    shutil.copytree(REPO_ROOT / "prompts", base / "prompts", dirs_exist_ok=True)
+    shutil.copytree(REPO_ROOT / "user_input", base / "user_input", dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("*.pdf"))
+    with open(base / "data/emv_pers.json", "w", encoding="utf-8") as f:
+        json.dump(synthetic_articles(num_articles), f, ensure_ascii=False, indent=4)
+    return base
+
+
+def run_once(path: str, base: Path, server_url: str) -> Dict[str, Any]:
+    """Run one pipeline invocation and measure it."""
+    from press_release_system import PressReleaseEnhancementSystem
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        system = PressReleaseEnhancementSystem(
+            base_path=str(base),
+            use_cache=False,
+            single_crew=(path == "crew"),
+            parallel=(path == "crew-parallel"),
+            api_base_url=server_url
+        )
+        system.paths["output"] = base / "data" / f"output_{path}.txt"
+        if path.startswith("crew"):
+            result = system.run_crew()
+        else:
+            system.client = FakeGenaiClient() if path == "legacy-client" else None
+            result = system.generate_legacy()
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    trace = system.trace
+    llm_time = sum(call["duration"] for call in trace.llm_calls)
+    stage_overhead = {}
+    for span in trace.tasks:
+        stage_llm = sum(c["duration"] for c in trace.llm_calls if c["stage"] == span["stage"])
+        stage_overhead[span["stage"]] = (span["end"] - span["start"]) - stage_llm
+    return {
+        "ok": bool(result),
+        "wall": wall,
+        "llm_time": llm_time,
+        "overhead": wall - llm_time,
+        "stage_overhead": stage_overhead,
+        "peak_mb": peak / (1024 * 1024),
+        "llm_calls": len(trace.llm_calls),
+        "prompt_tokens": sum(call["prompt_tokens"] for call in trace.llm_calls),
+    }
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    walls = [s["wall"] for s in samples]
+    stages: Dict[str, List[float]] = {}
+    for sample in samples:
+        for stage, overhead in sample["stage_overhead"].items():
+            stages.setdefault(stage, []).append(overhead)
+    return {
+        "runs": len(samples),
+        "failures": sum(1 for s in samples if not s["ok"]),
+        "throughput": len(samples) / sum(walls) if sum(walls) else 0.0,
+        "mean_wall": statistics.mean(walls),
+        "mean_overhead": statistics.mean(s["overhead"] for s in samples),
+        "peak_mb": max(s["peak_mb"] for s in samples),
+        "llm_calls": samples[-1]["llm_calls"],
+        "prompt_tokens": samples[-1]["prompt_tokens"],
+        "stage_overhead": {stage: statistics.mean(values) for stage, values in stages.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline end-to-end pipeline benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[60, 600, 3000],
+                        help='Synthetic corpus sizes (number of articles)')
+    parser.add_argument('--paths', nargs='+', default=PATHS, choices=PATHS,
+                        help='Generation paths to benchmark')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per size and path')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated model latency per call (seconds)')
+    parser.add_argument('--response_chars', type=int, default=2000, help='Simulated response length')
+    parser.add_argument('--json', type=str, help='Optional path to write the results as JSON')
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    sys.path.insert(0, str(REPO_ROOT))
+
+    results = []
+    with contextlib.ExitStack() as stack:
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        server = stack.enter_context(FakeGeminiServer(latency=args.latency, response_chars=args.response_chars))
+        stack.enter_context(stub_config(latency=args.latency, response_chars=args.response_chars))
+        # Only the crew paths use LangChain; the legacy paths must run without it
+        if any(path.startswith("crew") for path in args.paths):
+            stack.enter_context(patched_chat_model())
+        for size in args.sizes:
+            base = make_workspace(Path(tmp), size)
+            for path in args.paths:
+                samples = [run_once(path, base, server.base_url) for _ in range(args.repeats)]
+                summary = summarize(samples)
+                summary.update({"size": size, "path": path})
+                results.append(summary)
+                print(f"{size:>7} articles  {path:<14} {summary['throughput']:>7.2f} runs/s  "
+                      f"wall {summary['mean_wall']:.3f}s  overhead {summary['mean_overhead']:.3f}s  "
+                      f"peak {summary['peak_mb']:.1f} MB  ({summary['prompt_tokens']} prompt tokens)")
+
+    print("\nPer-stage overhead (seconds outside model calls, mean):")
+    for summary in results:
+        if summary["stage_overhead"]:
+            stages = ", ".join(f"{stage} {value:.4f}" for stage, value in summary["stage_overhead"].items())
+            print(f"  {summary['size']:>7} {summary['path']:<14} {stages}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+HTML rendering benchmark: the local renderer versus the HTML formatter agent.
+
+First times html_renderer.render_release on synthetic final releases built
+from corpus articles (a headline, a subheading, paragraphs with links and a
+quote, behind the FINAL PRESS RELEASE marker). Then runs the crew-parallel
+pipeline offline (see bench_pipeline.py) with html_renderer "llm" and
+"local" at the simulated model latency and reports the wall time and the
+number of LLM calls of each.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_render --releases 200 --latency 0.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .bench_pipeline import make_workspace
+from .fake_gemini_server import FakeGeminiServer
+from .stub_clients import patched_chat_model, stub_config
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RENDERERS = ["llm", "local"]
+
+
+def make_releases(count: int, seed: int = 0) -> List[str]:
+    """Quality assessment outputs ending in a Markdown final release made of corpus text."""
+    from html_renderer import FINAL_RELEASE_MARKER
+
+    rng = random.Random(seed)
+    with open(REPO_ROOT / "data/emv_pers.json", "r", encoding="utf-8") as f:
+        articles = [article for article in json.load(f) if article.get("content")]
+    releases = []
+    for _ in range(count):
+        article = rng.choice(articles)
+        paragraphs = [p.strip() for p in article["content"].split("\n") if p.strip()][:8]
+        source = rng.choice(articles)
+        lines = [
+            "Beoordeling: versie 1 is sterker in structuur, versie 2 in toon.",
+            "",
+            FINAL_RELEASE_MARKER,
+            "",
+            f"# {article.get('title') or 'Persbericht'}",
+            "",
+            f"## {paragraphs[0][:120] if paragraphs else ''}",
+            "",
+        ]
+        for i, paragraph in enumerate(paragraphs[1:] or paragraphs):
+            if i == 1:
+                paragraph += f" Lees meer in [{source.get('title')}]({source.get('url')})."
+            lines.extend([paragraph, ""])
+            if i == 2:
+                lines.extend(["> “De sector vraagt duidelijkheid”, zegt de woordvoerder.", ""])
+        lines.append("###")
+        releases.append("\n".join(lines))
+    return releases
+
+
+def bench_local(count: int) -> Dict[str, float]:
+    from html_renderer import render_release
+
+    releases = make_releases(count)
+    timings = []
+    for text in releases:
+        start = time.perf_counter()
+        html = render_release(text, require_final=True)
+        timings.append(time.perf_counter() - start)
+        if html is None:
+            raise SystemExit("The local renderer found no final release in a synthetic release")
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+        "chars": statistics.mean(len(text) for text in releases),
+    }
+
+
+def run_once(renderer: str, base: Path, server_url: str) -> Dict[str, Any]:
+    """One offline crew-parallel run with the given HTML renderer."""
+    from press_release_system import PressReleaseEnhancementSystem
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        system = PressReleaseEnhancementSystem(
+            base_path=str(base),
+            use_cache=False,
+            parallel=True,
+            html_renderer=renderer,
+            api_base_url=server_url
+        )
+        system.paths["output"] = base / "data" / f"output_{renderer}.txt"
+        result = system.run_crew()
+    wall = time.perf_counter() - start
+    html_calls = [call for call in system.trace.llm_calls if call["stage"] == "html_formatting"]
+    return {
+        "ok": bool(result),
+        "wall": wall,
+        "llm_calls": len(system.trace.llm_calls),
+        "html_llm_time": sum(call["duration"] for call in html_calls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local HTML rendering benchmark')
+    parser.add_argument('--releases', type=int, default=200, help='Synthetic releases rendered locally')
+    parser.add_argument('--size', type=int, default=60, help='Synthetic corpus size of the pipeline runs')
+    parser.add_argument('--repeats', type=int, default=3, help='Pipeline runs per renderer')
+    parser.add_argument('--latency', type=float, default=0.5, help='Simulated model latency per call (seconds)')
+    parser.add_argument('--response_chars', type=int, default=2000, help='Simulated response length')
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    sys.path.insert(0, str(REPO_ROOT))
+
+    local = bench_local(args.releases)
+    print(f"Local rendering: {args.releases} releases of ~{local['chars']:.0f} chars, "
+          f"mean {local['mean_ms']:.2f}ms, p95 {local['p95_ms']:.2f}ms")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeGeminiServer(latency=args.latency, response_chars=args.response_chars) as server, \
+            stub_config(latency=args.latency, response_chars=args.response_chars), \
+            patched_chat_model():
+        base = make_workspace(Path(tmp), args.size)
+        for renderer in RENDERERS:
+            samples = [run_once(renderer, base, server.base_url) for _ in range(args.repeats)]
+            results[renderer] = samples
+            print(f"{renderer:<6} wall {statistics.mean(s['wall'] for s in samples):.3f}s  "
+                  f"{samples[-1]['llm_calls']} LLM calls  "
+                  f"HTML stage model time {statistics.mean(s['html_llm_time'] for s in samples):.3f}s  "
+                  f"failures {sum(1 for s in samples if not s['ok'])}")
+
+    saved = (statistics.mean(s["wall"] for s in results["llm"])
+             - statistics.mean(s["wall"] for s in results["local"]))
+    print(f"\nLocal rendering saves {saved:.3f}s per run at {args.latency:g}s simulated latency")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Passage retrieval benchmark: build, load, incremental update and query latency
+of the dense passage index, next to BM25 article retrieval.
+
+Builds a synthetic corpus large enough for the requested number of passages,
+compiles it, then measures on the compiled store:
+
+    build    PassageIndex.build over every article
+    load     reading the saved index back
+    update   PassageIndex.update after changing --changed of the articles
+    query    search latency (median and 95th percentile) over sample queries
+
+Usage (from the repository root):
+    python -m benchmarks.bench_retrieval --passages 100000 --queries 200
+"""
+import argparse
+import math
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from .bench_ingest import write_synthetic_corpus
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def sample_queries(articles, count: int) -> List[str]:
+    """Queries made from article titles and subheadings, plus the repository's user prompt."""
+    queries = []
+    prompt = REPO_ROOT / "user_input/prompt_1.txt"
+    if prompt.exists():
+        queries.append(prompt.read_text(encoding="utf-8"))
+    for doc_id in range(len(articles)):
+        article = articles[doc_id]
+        queries.append(f"{article.get('title', '')} {article.get('subheading', '')}")
+        if len(queries) >= count:
+            break
+    return queries
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Passage retrieval benchmark')
+    parser.add_argument('--passages', type=int, default=100000, help='Approximate number of passages to index')
+    parser.add_argument('--queries', type=int, default=200, help='Number of timed queries')
+    parser.add_argument('--top_k', type=int, default=20, help='Passages returned per query')
+    parser.add_argument('--changed', type=float, default=0.01, help='Fraction of articles changed before the update')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    from corpus import BM25Index, CompiledCorpus, PassageIndex
+    from corpus.passage_index import split_passages
+
+    with CompiledCorpus.open(CompiledCorpus.store_path_for(REPO_ROOT / "data/emv_pers.json")) as store:
+        per_article = statistics.mean(len(split_passages(article.get("content"))) for article in store)
+    num_articles = max(1, round(args.passages / per_article))
+
+    with tempfile.TemporaryDirectory(prefix="bench_retrieval_") as tmp:
+        source = Path(tmp) / "emv_pers.json"
+        write_synthetic_corpus(source, num_articles)
+        store = CompiledCorpus.compile(source)
+        print(f"Corpus: {len(store)} articles")
+
+        start = time.perf_counter()
+        index = PassageIndex.build(store)
+        print(f"build    {time.perf_counter() - start:>8.2f}s  {index.num_passages} passages, "
+              f"{index.vectors.nbytes / 2 ** 20:.1f}MB of vectors")
+
+        index_path = PassageIndex.index_path_for(source)
+        index.save(index_path)
+        start = time.perf_counter()
+        index = PassageIndex.load(index_path)
+        print(f"load     {time.perf_counter() - start:>8.2f}s  {index_path.stat().st_size / 2 ** 20:.1f}MB on disk")
+
+        changed = max(1, int(len(store) * args.changed))
+        articles = [dict(store[doc_id]) for doc_id in range(len(store))]
+        for article in articles[:changed]:
+            article["content"] = article.get("content", "") + "\nAanvullende informatie volgt."
+        start = time.perf_counter()
+        index, stats = index.update(articles)
+        print(f"update   {time.perf_counter() - start:>8.2f}s  {stats['added']} of {len(articles)} articles re-embedded")
+
+        queries = sample_queries(store, args.queries)
+        index.search(queries[0], top_k=args.top_k)
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, top_k=args.top_k)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"query    median {statistics.median(timings):.2f}ms, p95 {percentile(timings, 95):.2f}ms "
+              f"over {len(timings)} queries (top {args.top_k} of {index.num_passages} passages)")
+
+        bm25 = BM25Index.build(store)
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            bm25.search(query, top_k=args.top_k)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"bm25     median {statistics.median(timings):.2f}ms, p95 {percentile(timings, 95):.2f}ms "
+              f"(articles, for comparison)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Topic detection benchmark: the single-pass topic registry versus one regex
+scan per topic.
+
+Writes a directory of synthetic special instruction files, each declaring
+keywords drawn from the repository corpus vocabulary, and builds prompts of
+several lengths from corpus articles. For each number of topics it reports:
+
+    load      reading the instruction files and compiling the matcher
+    per-topic scoring every topic with its own alternation (one scan per topic,
+              the way the hard-coded detection scaled)
+    registry  TopicRegistry.score (one scan for all topics)
+
+and checks that both find the same set of matching topics.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_topics --topics 10 100 500 --prompt_chars 2000 20000 100000
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def corpus_vocabulary(min_length: int = 6) -> List[str]:
+    """Distinct words of the repository corpus, in a stable order."""
+    from corpus.tokens import tokenize
+
+    with open(REPO_ROOT / "data/emv_pers.json", "r", encoding="utf-8") as f:
+        articles = json.load(f)
+    words = {word for article in articles for word in tokenize(article.get("content")) if len(word) >= min_length}
+    return sorted(words)
+
+
+def write_topics(directory: Path, num_topics: int, vocabulary: List[str], seed: int = 0) -> Dict[str, List[str]]:
+    """Instruction files with 4 to 12 keywords each; returns the keywords per topic."""
+    rng = random.Random(seed)
+    topics = {}
+    for i in range(num_topics):
+        keywords = rng.sample(vocabulary, rng.randint(4, 12))
+        name = f"topic_{i:04d}"
+        with open(directory / f"{name}.txt", "w", encoding="utf-8") as f:
+            f.write(f"# keywords: {', '.join(keywords)}\n# priority: {rng.randint(0, 5)}\n\n")
+            f.write(f"SPECIALISTISCHE INSTRUCTIES: {name.upper()}\n\nRichtlijnen voor {keywords[0]}.\n")
+        topics[name] = keywords
+    return topics
+
+
+def make_prompts(num_chars: int, count: int, seed: int = 0) -> List[str]:
+    """Prompts of about num_chars characters stitched from corpus article contents."""
+    rng = random.Random(seed)
+    with open(REPO_ROOT / "data/emv_pers.json", "r", encoding="utf-8") as f:
+        contents = [article.get("content") or "" for article in json.load(f)]
+    prompts = []
+    for _ in range(count):
+        parts, length = [], 0
+        while length < num_chars:
+            part = rng.choice(contents)
+            parts.append(part)
+            length += len(part) + 2
+        prompts.append("\n\n".join(parts)[:num_chars])
+    return prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Topic detection benchmark')
+    parser.add_argument('--topics', type=int, nargs='+', default=[10, 100, 500], help='Numbers of registered topics')
+    parser.add_argument('--prompt_chars', type=int, nargs='+', default=[2000, 20000, 100000],
+                        help='Prompt lengths in characters')
+    parser.add_argument('--prompts', type=int, default=5, help='Prompts per length')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    from topic_registry import TopicRegistry
+
+    vocabulary = corpus_vocabulary()
+    prompts = {chars: make_prompts(chars, args.prompts) for chars in args.prompt_chars}
+    print(f"{'Topics':>6} {'Prompt':>8} {'load':>8} {'per-topic':>10} {'registry':>9} {'speedup':>8} {'matched':>8}")
+    for num_topics in args.topics:
+        with tempfile.TemporaryDirectory(prefix="bench_topics_") as tmp:
+            topics = write_topics(Path(tmp), num_topics, vocabulary)
+            start = time.perf_counter()
+            registry = TopicRegistry.load(Path(tmp))
+            load = time.perf_counter() - start
+
+        patterns = {
+            name: re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+            for name, keywords in topics.items()
+        }
+        for chars, texts in prompts.items():
+            per_topic = registry_time = 0.0
+            matched = 0
+            for text in texts:
+                start = time.perf_counter()
+                legacy = {name: len(pattern.findall(text)) for name, pattern in patterns.items()}
+                per_topic += time.perf_counter() - start
+                start = time.perf_counter()
+                scores = registry.score(text)
+                registry_time += time.perf_counter() - start
+                expected = {name for name, count in legacy.items() if count}
+                if set(scores) != expected:
+                    raise SystemExit(f"Topic mismatch for a {chars} character prompt: "
+                                     f"{sorted(set(scores) ^ expected)[:5]}")
+                matched += len(scores)
+            per_topic, registry_time = per_topic / len(texts), registry_time / len(texts)
+            print(f"{num_topics:>6} {chars:>8} {load * 1000:>6.1f}ms {per_topic * 1000:>8.2f}ms "
+                  f"{registry_time * 1000:>7.2f}ms {per_topic / max(registry_time, 1e-9):>7.1f}x "
+                  f"{matched / len(texts):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Incremental corpus update benchmark: cost of applying a small delta versus
+rebuilding the store and indexes from scratch.
+
+Compiles a synthetic corpus and builds its BM25 and passage indexes once.
+Then, for each delta size, starts from a copy of that state, adds, updates
+and removes that many articles in the corpus JSON and measures:
+
+    diff      streaming the source and comparing it with the store by URL
+    patch     appending the changed articles to the store and journaling them
+    bm25      BM25Index.apply_changes for the journaled changes
+    passages  PassageIndex.apply_changes for the journaled changes
+
+next to a full compile, BM25 build and passage index build.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_updates --articles 10000 --deltas 1 10 100 1000
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from .bench_ingest import write_synthetic_corpus
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_delta(articles: List[Dict], delta: int, salt: str):
+    """Half updates, a quarter additions and a quarter removals, spread over the corpus."""
+    updates = max(1, delta // 2)
+    additions = (delta - updates) // 2
+    removals = delta - updates - additions
+    step = max(1, len(articles) // max(1, delta))
+    picked = articles[::step][:updates + removals]
+    upserts = [dict(article, content=f"{article.get('content', '')}\nAanvulling {salt}.")
+               for article in picked[:updates]]
+    for i in range(additions):
+        article = dict(articles[i % len(articles)])
+        article["url"] = f"{article['url'].rstrip('/')}-new-{salt}-{i}/"
+        upserts.append(article)
+    return upserts, [article["url"] for article in picked[updates:]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental corpus update benchmark')
+    parser.add_argument('--articles', type=int, default=10000, help='Synthetic corpus size')
+    parser.add_argument('--deltas', type=int, nargs='+', default=[1, 10, 100, 1000],
+                        help='Number of changed articles per update')
+    parser.add_argument('--no-passages', dest='no_passages', action='store_true',
+                        help='Skip the passage index (it needs NumPy)')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    from corpus import BM25Index, CompiledCorpus, PassageIndex, iter_articles, numpy_available, rewrite_articles
+
+    passages = not args.no_passages and numpy_available()
+    with tempfile.TemporaryDirectory(prefix="bench_updates_") as tmp:
+        base = Path(tmp) / "base"
+        base.mkdir()
+        source = base / "emv_pers.json"
+        write_synthetic_corpus(source, args.articles)
+        articles = list(iter_articles(source))
+
+        start = time.perf_counter()
+        store = CompiledCorpus.compile(source)
+        full = {"compile": time.perf_counter() - start}
+        start = time.perf_counter()
+        BM25Index.load_or_build(source, store)
+        full["bm25"] = time.perf_counter() - start
+        if passages:
+            start = time.perf_counter()
+            PassageIndex.load_or_build(source, store)
+            full["passages"] = time.perf_counter() - start
+        store.close()
+        print(f"Full rebuild of {args.articles} articles: " +
+              ", ".join(f"{step} {seconds:.2f}s" for step, seconds in full.items()))
+
+        print(f"{'Delta':>6} {'diff':>8} {'patch':>8} {'bm25':>8} {'passages':>9} {'total':>8} {'vs full':>8}")
+        for delta in args.deltas:
+            work = Path(tmp) / f"delta_{delta}"
+            shutil.copytree(base, work)
+            source = work / "emv_pers.json"
+            upserts, removals = make_delta(articles, delta, str(delta))
+            rewrite_articles(source, upserts, removals)
+
+            timings = {}
+            with CompiledCorpus.open(CompiledCorpus.store_path_for(source)) as store:
+                start = time.perf_counter()
+                changed, removed = store.diff(source)
+                timings["diff"] = time.perf_counter() - start
+                start = time.perf_counter()
+                updated = store.patch(source, changed, removed)
+                timings["patch"] = time.perf_counter() - start
+
+            changes = updated.changes_since(0)
+            index = BM25Index.load(BM25Index.index_path_for(source))
+            start = time.perf_counter()
+            index.apply_changes(updated, changes)
+            timings["bm25"] = time.perf_counter() - start
+            if passages:
+                index = PassageIndex.load(PassageIndex.index_path_for(source))
+                start = time.perf_counter()
+                index.apply_changes(updated, changes)
+                timings["passages"] = time.perf_counter() - start
+            updated.close()
+
+            total = sum(timings.values())
+            print(f"{delta:>6} {timings['diff']:>7.3f}s {timings['patch']:>7.3f}s {timings['bm25']:>7.3f}s "
+                  f"{timings.get('passages', 0):>8.3f}s {total:>7.3f}s {total / sum(full.values()):>7.1%}")
+            shutil.rmtree(work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Local stand-in for the Gemini REST API (generativelanguage.googleapis.com).
+
+Speaks the request/response shape used by
+PressReleaseEnhancementSystem._generate_with_direct_request, with
+configurable latency, response size and failure rate.
+
+Run standalone:
+    python -m benchmarks.fake_gemini_server --port 8765 --latency 0.5
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+FILLER_TEXT = (
+    "Embuild Vlaanderen stelt vast dat het aantal vergunningsaanvragen voor nieuwbouw "
+    "opnieuw daalt, terwijl renovatie op peil blijft. "
+)
+
+
+def make_response_text(num_chars: int) -> str:
+    """Build deterministic Dutch filler text of the requested length."""
+    repeats = num_chars // len(FILLER_TEXT) + 1
+    return (FILLER_TEXT * repeats)[:num_chars]
+
+
+def _prompt_chars(payload: Dict[str, Any]) -> int:
+    return sum(
+        len(part.get("text", ""))
+        for content in payload.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+class FakeGeminiServer:
+    """Threaded HTTP server answering generateContent and streamGenerateContent calls."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        response_chars: int = 2000,
+        failure_rate: float = 0.0,
+        failure_status: int = 429,
+        retry_after: Optional[float] = None,
+        seed: int = 0
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds to wait before answering each request
+            response_chars: Length of the generated response text
+            failure_rate: Fraction of requests answered with failure_status
+            failure_status: HTTP status used for injected failures
+            retry_after: Optional Retry-After header value (seconds) on injected failures
+            seed: Random seed for failure injection
+        """
+        self.latency = latency
+        self.response_chars = response_chars
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+            return fail
+
+    def _candidate(self, text: str, prompt_chars: int) -> Dict[str, Any]:
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt_chars // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (prompt_chars + len(text)) // 4,
+            },
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON payload"}})
+                    return
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if server._should_fail():
+                    headers = {}
+                    if server.retry_after is not None:
+                        headers["Retry-After"] = str(server.retry_after)
+                    self._send_json(server.failure_status, {
+                        "error": {"code": server.failure_status, "message": "Injected failure", "status": "UNAVAILABLE"}
+                    }, headers)
+                    return
+
+                text = make_response_text(server.response_chars)
+                prompt_chars = _prompt_chars(payload)
+                if ":streamGenerateContent" in self.path:
+                    chunks: List[Dict[str, Any]] = []
+                    step = max(1, len(text) // 4)
+                    for i in range(0, len(text), step):
+                        chunks.append(server._candidate(text[i:i + step], prompt_chars))
+                    self._send_json(200, chunks)
+                elif ":generateContent" in self.path:
+                    self._send_json(200, server._candidate(text, prompt_chars))
+                else:
+                    self._send_json(404, {"error": {"code": 404, "message": f"Unknown method {self.path}"}})
+
+        return Handler
+
+    def start(self) -> "FakeGeminiServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGeminiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local fake Gemini REST API')
+    parser.add_argument('--host', type=str, default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds of latency per request')
+    parser.add_argument('--response_chars', type=int, default=2000, help='Length of each response')
+    parser.add_argument('--failure_rate', type=float, default=0.0, help='Fraction of requests that fail')
+    parser.add_argument('--failure_status', type=int, default=429, help='HTTP status of injected failures')
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        response_chars=args.response_chars,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status
+    )
+    print(f"Fake Gemini API listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Drop-in stubs for the Google GenAI client and the LangChain chat model.
+
+FakeGenaiClient replaces ``genai.Client`` on the legacy path and
+FakeChatGoogleGenerativeAI replaces ``ChatGoogleGenerativeAI`` in
+BaseAgent.create_llm. Both honour STUB_CONFIG for latency and response size.
+"""
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Optional
+
+from .fake_gemini_server import make_response_text
+
+STUB_CONFIG = {
+    "latency": 0.0,
+    "response_chars": 2000,
+}
+
+
+@contextmanager
+def stub_config(**overrides):
+    """Temporarily change the stub latency / response size."""
+    previous = dict(STUB_CONFIG)
+    STUB_CONFIG.update(overrides)
+    try:
+        yield STUB_CONFIG
+    finally:
+        STUB_CONFIG.clear()
+        STUB_CONFIG.update(previous)
+
+
+def _contents_chars(contents: Any) -> int:
+    """Approximate prompt size of genai ``contents`` (Content objects or strings)."""
+    if isinstance(contents, str):
+        return len(contents)
+    total = 0
+    for content in contents or []:
+        for part in getattr(content, "parts", None) or []:
+            total += len(getattr(part, "text", "") or "")
+    return total
+
+
+class _FakeModels:
+    def generate_content_stream(self, model: str, contents: Any, config: Any = None) -> Iterator[Any]:
+        time.sleep(STUB_CONFIG["latency"])
+        text = make_response_text(STUB_CONFIG["response_chars"])
+        step = max(1, len(text) // 4)
+        chunks = [text[i:i + step] for i in range(0, len(text), step)]
+        for i, chunk in enumerate(chunks):
+            usage = None
+            if i == len(chunks) - 1:
+                usage = SimpleNamespace(
+                    prompt_token_count=_contents_chars(contents) // 4,
+                    candidates_token_count=len(text) // 4
+                )
+            yield SimpleNamespace(text=chunk, usage_metadata=usage)
+
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> Any:
+        chunks = list(self.generate_content_stream(model, contents, config))
+        return SimpleNamespace(text="".join(c.text for c in chunks), usage_metadata=chunks[-1].usage_metadata)
+
+
+class FakeGenaiClient:
+    """Offline replacement for ``google.genai.Client``."""
+
+    def __init__(self, api_key: Optional[str] = None, **kwargs: Any):
+        self.api_key = api_key
+        self.models = _FakeModels()
+
+
+def _fake_chat_model_class():
+    """Build the LangChain stub lazily so importing this module does not require langchain."""
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class FakeChatGoogleGenerativeAI(BaseChatModel):
+        """Offline replacement for ``langchain_google_genai.ChatGoogleGenerativeAI``."""
+
+        model: str = "fake-gemini"
+        google_api_key: Optional[str] = None
+        temperature: float = 0.7
+        top_p: Optional[float] = None
+        top_k: Optional[int] = None
+        max_output_tokens: Optional[int] = None
+
+        @property
+        def _llm_type(self) -> str:
+            return "fake-gemini"
+
+        def _generate(self, messages: List[Any], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> Any:
+            time.sleep(STUB_CONFIG["latency"])
+            text = make_response_text(STUB_CONFIG["response_chars"])
+            prompt_chars = sum(len(str(m.content)) for m in messages)
+            message = AIMessage(
+                content=text,
+                usage_metadata={
+                    "input_tokens": prompt_chars // 4,
+                    "output_tokens": len(text) // 4,
+                    "total_tokens": (prompt_chars + len(text)) // 4,
+                }
+            )
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    return FakeChatGoogleGenerativeAI
+
+
+@contextmanager
+def patched_chat_model():
+    """Replace ChatGoogleGenerativeAI with the stub for the duration of the block."""
+    import langchain_google_genai
+
+    original = langchain_google_genai.ChatGoogleGenerativeAI
+    langchain_google_genai.ChatGoogleGenerativeAI = _fake_chat_model_class()
+    try:
+        yield
+    finally:
+        langchain_google_genai.ChatGoogleGenerativeAI = original
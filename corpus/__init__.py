@@ -0,0 +1,33 @@
+"""
+Package initialization for corpus module.
+"""
+from .bm25_index import BM25Index, select_articles
+from .claim_verifier import verify_claims
+from .compiled_store import CompiledCorpus, clean_article
+from .fact_table import FactTable
+from .journal import ChangeJournal
+from .near_duplicates import DuplicateIndex
+from .source_index import SourceIndex
+from .source_linker import link_sources
+from .stream import iter_articles, rewrite_articles
+from .passage_index import PassageIndex, numpy_available, select_passages
+from .tokens import estimate_tokens
+
+__all__ = [
+    'BM25Index',
+    'select_articles',
+    'CompiledCorpus',
+    'clean_article',
+    'FactTable',
+    'verify_claims',
+    'ChangeJournal',
+    'DuplicateIndex',
+    'SourceIndex',
+    'link_sources',
+    'iter_articles',
+    'rewrite_articles',
+    'PassageIndex',
+    'numpy_available',
+    'select_passages',
+    'estimate_tokens'
+]
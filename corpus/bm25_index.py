@@ -0,0 +1,329 @@
+"""
+BM25 retrieval index over the press release corpus.
+"""
+import hashlib
+import json
+import math
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .tokens import estimate_tokens, tokenize
+
+# Relative weight of each article field when computing term frequencies
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "subheading": 2.0,
+    "meta_description": 2.0,
+    "content": 1.0,
+}
+
+# Frequent Dutch function words that carry no retrieval signal
+STOPWORDS = frozenset("""
+de het een en van in op te dat die voor met is zijn er aan om als ook bij
+door of naar uit over tot maar dan nog wel niet worden wordt werd kan meer
+zo al dit deze hun wij we ze zij hij je u ons onze haar hem na tegen
+""".split())
+
+INDEX_VERSION = 4
+
+# Up to this many changed articles are removed from posting lists one by one
+SMALL_BATCH = 50
+
+
+def _article_terms(article: Dict[str, Any]) -> Counter:
+    """Compute the field-weighted term frequencies of a single article."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(article.get(field)):
+            if token not in STOPWORDS:
+                terms[token] += weight
+    return terms
+
+
+def _file_fingerprint(path: Path) -> str:
+    """Return a content hash of a file, used to detect stale indexes."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _new_postings() -> Tuple[array, array]:
+    """Empty posting list: parallel arrays of document ids and term frequencies."""
+    return array("I"), array("f")
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring over title, subheading,
+    meta_description and content of each article.
+
+    Posting lists are kept as compact arrays, so the index of a large corpus
+    costs a few bytes per posting instead of a Python tuple each.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation parameter
+            b: BM25 document length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_lengths: List[float] = []
+        self.avg_doc_length = 0.0
+        self.source_hash: Optional[str] = None
+        self.generation: Optional[str] = None
+        self.journal_seq = 0
+
+    @property
+    def num_docs(self) -> int:
+        """Number of indexed articles."""
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, articles: Iterable[Dict[str, Any]], **kwargs) -> "BM25Index":
+        """
+        Build an index from articles, consuming them one at a time.
+
+        Args:
+            articles: Article dicts as stored in emv_pers.json (a list, a
+                compiled corpus or any other iterable)
+            **kwargs: BM25 parameters passed to the constructor
+
+        Returns:
+            BM25Index: The populated index; document ids are positions in the input
+        """
+        index = cls(**kwargs)
+        postings = defaultdict(_new_postings)
+        for doc_id, article in enumerate(articles):
+            terms = _article_terms(article)
+            index.doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                doc_ids, tfs = postings[term]
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+        index.postings = dict(postings)
+        index._update_avg_doc_length()
+        return index
+
+    def _update_avg_doc_length(self) -> None:
+        # Removed articles of a compiled corpus are empty and do not count
+        lengths = [length for length in self.doc_lengths if length]
+        self.avg_doc_length = sum(lengths) / max(1, len(lengths))
+
+    def apply_changes(self, articles, changes: Dict[int, Optional[Tuple[int, int]]]) -> None:
+        """
+        Patch the index for articles changed in a compiled corpus.
+
+        Args:
+            articles: The compiled corpus in its current version
+            changes: Doc id -> location of the version the index holds (None
+                for articles added since), from CompiledCorpus.changes_since
+        """
+        while len(self.doc_lengths) < len(articles):
+            self.doc_lengths.append(0.0)
+        # Drop the old versions' postings: one lookup per term of a few
+        # articles, or one filtering pass per affected term for larger batches
+        stale = {}
+        for doc_id, old_location in changes.items():
+            if old_location is not None:
+                for term in _article_terms(articles.read_at(old_location)):
+                    stale.setdefault(term, []).append(doc_id)
+        for term, doc_ids_to_drop in stale.items():
+            doc_ids, tfs = self.postings[term]
+            if len(changes) <= SMALL_BATCH:
+                for doc_id in doc_ids_to_drop:
+                    position = doc_ids.index(doc_id)
+                    del doc_ids[position]
+                    del tfs[position]
+            else:
+                kept = _new_postings()
+                for doc_id, tf in zip(doc_ids, tfs):
+                    if doc_id not in changes:
+                        kept[0].append(doc_id)
+                        kept[1].append(tf)
+                self.postings[term] = doc_ids, tfs = kept
+            if not doc_ids:
+                del self.postings[term]
+        for doc_id in changes:
+            terms = _article_terms(articles[doc_id])
+            self.doc_lengths[doc_id] = sum(terms.values())
+            for term, tf in terms.items():
+                doc_ids, tfs = self.postings.setdefault(term, _new_postings())
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+        self._update_avg_doc_length()
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term (BM25+ variant, never negative)."""
+        df = len(self.postings[term][0]) if term in self.postings else 0
+        return math.log(1.0 + (self.num_docs - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Score all articles against a query.
+
+        Args:
+            query: Free text query, typically the user prompt
+            top_k: Maximum number of results to return
+
+        Returns:
+            List of (doc_id, score) tuples, best match first
+        """
+        scores = defaultdict(float)
+        query_terms = Counter(t for t in tokenize(query) if t not in STOPWORDS)
+        for term, query_tf in query_terms.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in zip(*postings):
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_doc_length)
+                scores[doc_id] += query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
+
+    def save(self, path: Path) -> None:
+        """Persist the index as JSON."""
+        payload = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "source_hash": self.source_hash,
+            "generation": self.generation,
+            "journal_seq": self.journal_seq,
+            "doc_lengths": self.doc_lengths,
+            "postings": {term: [doc_ids.tolist(), tfs.tolist()] for term, (doc_ids, tfs) in self.postings.items()},
+        }
+        tmp_path = Path(str(path) + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BM25Index"]:
+        """Load a persisted index, returning None if it is missing or incompatible."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if payload.get("version") != INDEX_VERSION:
+            return None
+        index = cls(k1=payload["k1"], b=payload["b"])
+        index.source_hash = payload.get("source_hash")
+        index.generation = payload.get("generation")
+        index.journal_seq = payload.get("journal_seq", 0)
+        index.doc_lengths = payload["doc_lengths"]
+        index.postings = {
+            term: (array("I", doc_ids), array("f", tfs)) for term, (doc_ids, tfs) in payload["postings"].items()
+        }
+        index._update_avg_doc_length()
+        return index
+
+    @staticmethod
+    def index_path_for(json_path: Path) -> Path:
+        """Location of the persisted index next to the corpus JSON."""
+        json_path = Path(json_path)
+        return json_path.with_name(json_path.stem + ".bm25.json")
+
+    @classmethod
+    def load_or_build(cls, json_path: Path, articles: List[Dict[str, Any]], debug: bool = False) -> "BM25Index":
+        """
+        Load the index saved next to the corpus, updating it when the corpus changed.
+
+        If articles is a compiled corpus whose change journal covers the
+        changes since the index was saved, only the changed articles are
+        reindexed; otherwise the index is rebuilt.
+
+        Args:
+            json_path: Path to the corpus JSON file
+            articles: Parsed articles from that file (a list or a compiled corpus)
+            debug: Whether to print index maintenance messages
+
+        Returns:
+            BM25Index: An index that matches the current corpus
+        """
+        index_path = cls.index_path_for(json_path)
+        source_hash = _file_fingerprint(json_path)
+        index = cls.load(index_path)
+        if index is not None and index.source_hash == source_hash and index.num_docs == len(articles):
+            if debug:
+                print(f"Loaded retrieval index from {index_path}")
+            return index
+
+        generation = getattr(articles, "generation", None)
+        changes = None
+        if index is not None and generation is not None and index.generation == generation:
+            changes = articles.changes_since(index.journal_seq)
+        if changes is not None:
+            index.apply_changes(articles, changes)
+            message = f"Updated retrieval index: {len(changes)} articles reindexed"
+        else:
+            index = cls.build(articles)
+            message = f"Built retrieval index over {index.num_docs} articles"
+        index.source_hash = source_hash
+        index.generation = generation
+        index.journal_seq = getattr(articles, "journal_seq", 0)
+        try:
+            index.save(index_path)
+            if debug:
+                print(f"{message}: {index_path}")
+        except OSError as e:
+            print(f"Could not save retrieval index to {index_path}: {e}")
+        return index
+
+
+def select_articles(
+    articles: List[Dict[str, Any]],
+    index: BM25Index,
+    query: str,
+    top_k: int = 8,
+    token_budget: Optional[int] = None,
+    duplicates=None
+) -> List[Dict[str, Any]]:
+    """
+    Pick the most relevant articles for a query within a token budget.
+
+    Args:
+        articles: Corpus articles, positionally aligned with the index
+        index: BM25 index over the articles
+        query: Query text, typically the user prompt
+        top_k: Maximum number of articles to return
+        token_budget: Optional cap on the estimated tokens of the selection
+        duplicates: Optional DuplicateIndex; near-duplicate articles are then
+            returned once (with "duplicate_urls") and repeated paragraphs dropped
+
+    Returns:
+        List of article dicts, most relevant first. If no query term occurs in
+        the corpus, the whole corpus in its own order, within the token budget.
+    """
+    hits = index.search(query, top_k=top_k)
+    if not hits:
+        # An empty context is worse than the unranked corpus
+        hits = [(doc_id, 0.0) for doc_id in range(min(index.num_docs, len(articles)))]
+    selected = []
+    used_tokens = 0
+    for doc_id, _ in hits:
+        if not articles[doc_id]:
+            # Removed from the compiled corpus
+            continue
+        if duplicates is not None:
+            doc_id = duplicates.representative(doc_id)
+            if doc_id in selected:
+                continue
+        cost = estimate_tokens(json.dumps(articles[doc_id], ensure_ascii=False))
+        if token_budget is not None and selected and used_tokens + cost > token_budget:
+            continue
+        selected.append(doc_id)
+        used_tokens += cost
+    if duplicates is not None:
+        return duplicates.collapse(articles, selected)
+    return [articles[doc_id] for doc_id in selected]
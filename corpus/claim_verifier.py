@@ -0,0 +1,185 @@
+"""
+Deterministic verification of the figures in press release drafts.
+
+Numeric and dated claims are extracted from the drafts with the fact table's
+Dutch number parsing and matched against the corpus facts:
+
+    verified    a source sentence states the same value (at the precision
+                the claim was written with) in the same context, and no
+                source is closer to the claim with a different value
+    mismatched  a source sentence about the same thing states a different value
+    unsourced   no source sentence could be matched
+
+How close a source is to a claim is decided by the keywords their clauses
+share (the part of the sentence around each figure, see iter_clauses), then by
+the keywords their sentences share. A sentence listing "Antwerpen (-12%)"
+and "Oost-Vlaanderen (-9%)" therefore does not verify "Antwerpen (-9%)".
+
+Only mismatched and unsourced claims need the Fact Checker agent.
+"""
+import heapq
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fact_table import NUMBER, YEAR, FactRef, FactTable, iter_clauses, iter_sentences, keywords
+
+VERIFIED = "verified"
+MISMATCHED = "mismatched"
+UNSOURCED = "unsourced"
+
+# Sentence keywords a fact must share with a claim to verify it
+MIN_VERIFY_OVERLAP = 2
+
+# A fact with a different value marks a claim as mismatched when it shares at
+# least this many keywords, and at least MISMATCH_SHARE of the claim's keywords
+MIN_MISMATCH_OVERLAP = 3
+MISMATCH_SHARE = 0.5
+
+# Source sentences shown for each unresolved claim
+EVIDENCE_LIMIT = 3
+
+# Facts sharing the most keywords with a claim that are considered as a mismatch or evidence
+RELATED_LIMIT = 50
+
+_DRAFT_HEADING_PATTERN = re.compile(r"^\W*(?:press release\s+|persbericht\s+)?draft\s*(\d+)\b", re.IGNORECASE)
+
+
+def is_claim(quantity: Dict[str, Any]) -> bool:
+    """Whether a quantity is worth checking (years and small whole numbers are not)."""
+    if quantity["unit"] == YEAR:
+        return False
+    value = quantity["value"]
+    return not (quantity["unit"] == NUMBER and abs(value) < 10 and value == int(value))
+
+
+def extract_claims(drafts: str, draft_label: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Numeric and dated claims of the drafts, each with its sentence.
+
+    Args:
+        drafts: Output of the writing task
+        draft_label: Only return claims of this draft ("1", "2", ...) if the
+            drafts are headed "Draft 1", "Draft 2", ...
+
+    Returns:
+        List of claim dicts: draft (label or None), text, value, unit,
+        precision, sentence and clause
+    """
+    claims = []
+    draft = None
+    for line in (drafts or "").split("\n"):
+        heading = _DRAFT_HEADING_PATTERN.match(line)
+        if heading:
+            draft = heading.group(1)
+        for _, sentence in iter_sentences(line):
+            sentence = sentence.strip()
+            for quantity, clause in iter_clauses(sentence):
+                if is_claim(quantity):
+                    claims.append({
+                        "draft": draft,
+                        "text": quantity["text"],
+                        "value": quantity["value"],
+                        "unit": quantity["unit"],
+                        "precision": quantity["precision"],
+                        "sentence": sentence,
+                        "clause": clause.strip(),
+                    })
+    if draft_label is not None and any(claim["draft"] for claim in claims):
+        claims = [claim for claim in claims if claim["draft"] in (draft_label, None)]
+    return claims
+
+
+def _source(fact: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: fact[key] for key in ("text", "sentence", "url", "publication_date")}
+
+
+def verify_claim(claim: Dict[str, Any], table: FactTable) -> Dict[str, Any]:
+    """Classify one claim against the fact table (see the module docstring)."""
+    claim_keywords = keywords(claim["sentence"])
+    clause_keywords = set(keywords(claim.get("clause")))
+    overlap = table.find_keywords(claim_keywords)
+
+    def closeness(ref: FactRef) -> Tuple[int, int]:
+        clause_overlap = len(clause_keywords.intersection(keywords(table.fact(ref).get("clause"))))
+        return clause_overlap, overlap.get(ref, 0)
+
+    matches = sorted(
+        table.find_value(claim["value"], claim["unit"], claim["precision"]),
+        key=lambda ref: (-overlap.get(ref, 0), ref)
+    )
+    matching = set(matches)
+    related = heapq.nsmallest(RELATED_LIMIT, overlap, key=lambda ref: (-overlap[ref], ref))
+    candidates = [ref for ref in matches if overlap.get(ref, 0) >= MIN_VERIFY_OVERLAP]
+    if candidates:
+        best = max(candidates, key=lambda ref: (closeness(ref), -ref[0], -ref[1]))
+        # A source with a different value that is closer to the claim outranks the match
+        rivals = [
+            ref for ref in related
+            if overlap[ref] >= MIN_VERIFY_OVERLAP and ref not in matching
+            and table.fact(ref)["unit"] == claim["unit"]
+        ]
+        rival = max(rivals, key=lambda ref: (closeness(ref), -ref[0], -ref[1]), default=None)
+        if rival is None or closeness(rival) <= closeness(best):
+            return dict(claim, status=VERIFIED, sources=[_source(table.fact(best))])
+        return dict(claim, status=MISMATCHED, sources=[_source(table.fact(rival)), _source(table.fact(best))])
+
+    required = max(MIN_MISMATCH_OVERLAP, MISMATCH_SHARE * len(claim_keywords))
+    for ref in related:
+        if overlap[ref] < required:
+            break
+        fact = table.fact(ref)
+        if fact["unit"] == claim["unit"] and ref not in matching:
+            return dict(claim, status=MISMATCHED, sources=[_source(fact)])
+
+    evidence = [ref for ref in matches if overlap.get(ref, 0)] + [ref for ref in related if ref not in matching]
+    return dict(claim, status=UNSOURCED, sources=[_source(table.fact(ref)) for ref in evidence[:EVIDENCE_LIMIT]])
+
+
+def verify_claims(drafts: str, table: FactTable, draft_label: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract and verify the claims of the drafts.
+
+    Returns:
+        dict: claims (each with status and sources), counts per status and
+        elapsed_ms
+    """
+    start = time.perf_counter()
+    claims = [verify_claim(claim, table) for claim in extract_claims(drafts, draft_label)]
+    counts = {status: 0 for status in (VERIFIED, MISMATCHED, UNSOURCED)}
+    for claim in claims:
+        counts[claim["status"]] += 1
+    return {
+        "draft": draft_label,
+        "claims": claims,
+        "counts": counts,
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def render_unresolved(report: Dict[str, Any]) -> str:
+    """
+    The claims the verifier could not settle, with their candidate source
+    sentences, as plain text for the Fact Checker agent.
+    """
+    lines = [
+        f"CLAIM VERIFIER: {report['counts'][VERIFIED]} figures verified against the source articles, "
+        f"{report['counts'][MISMATCHED]} mismatched, {report['counts'][UNSOURCED]} without a source."
+    ]
+    for status, heading in (
+        (MISMATCHED, "MISMATCHED (a source sentence about the same subject gives a different figure):"),
+        (UNSOURCED, "UNSOURCED (no source sentence states this figure):"),
+    ):
+        claims = [claim for claim in report["claims"] if claim["status"] == status]
+        if not claims:
+            continue
+        lines.append("")
+        lines.append(heading)
+        for number, claim in enumerate(claims, 1):
+            draft = f"draft {claim['draft']}, " if claim["draft"] else ""
+            lines.append(f'{number}. "{claim["text"]}" ({draft}sentence: "{claim["sentence"]}")')
+            for source in claim["sources"]:
+                lines.append(f'   source ({source["url"]}, {source["publication_date"]}): "{source["sentence"]}"')
+            if not claim["sources"]:
+                lines.append("   no related source sentence found")
+    return "\n".join(lines)
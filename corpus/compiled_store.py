@@ -0,0 +1,555 @@
+"""
+Compiled corpus store: a cleaned, compact, memory-mapped copy of emv_pers.json.
+
+The source JSON contains mojibake (UTF-8 text that was decoded as Latin-1 /
+cp1252 somewhere upstream), irregular whitespace and fields the workflow never
+uses. Compiling it once repairs the text, keeps only the used fields and writes
+a binary store with an offset table, so a run maps the file and decodes only
+the articles it actually reads. Compilation streams the source article by
+article, so its memory use does not grow with the size of the corpus text.
+
+Articles are keyed by URL: a URL that occurs more than once keeps its last
+version. When the source changes, only the added, updated and removed
+articles are written: they are appended to the store together with a new
+offset table, and recorded in the change journal (see journal.py) so the
+indexes built on the store can be patched as well.
+
+File layout (all integers little-endian):
+    preamble   4 bytes magic b"EMVC", uint32 version
+    segments   article records (compact UTF-8 JSON), offset tables, the URL
+               list of the last full compile and headers (UTF-8 JSON)
+    footer     uint64 table position, uint32 count, uint64 header position,
+               uint32 header length, 4 bytes magic
+
+An offset table holds count x (uint64 position, uint32 length); length 0
+marks a removed article, whose doc id is not reused until the next full
+compile. Updates only append, so a process that mapped the file earlier keeps
+a consistent view; replaced bytes are reclaimed by the next full compile.
+"""
+import hashlib
+import io
+import json
+import mmap
+import re
+import struct
+import threading
+import uuid
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .bm25_index import _file_fingerprint
+from .journal import ChangeJournal, Location, coalesce_changes
+from .stream import iter_articles
+
+STORE_MAGIC = b"EMVC"
+STORE_VERSION = 2
+
+# Recompile from scratch instead of patching when more than this fraction of
+# the articles changed, or when replaced bytes make up more than this
+# fraction of the file
+REBUILD_FRACTION = 0.5
+
+# Fields the agents and the retrieval index use, in output order
+KEEP_FIELDS = ("url", "publication_date", "title", "subheading", "meta_description", "content")
+
+_PREAMBLE = struct.Struct("<4sI")
+_FOOTER = struct.Struct("<QIQI4s")
+_OFFSET_ENTRY = struct.Struct("<QI")
+
+# Characters that can stand for a UTF-8 continuation byte after a wrong
+# Latin-1 or cp1252 decode
+_CONTINUATION = "[\u0080-\u00bf\u0152\u0153\u0160\u0161\u0178\u017d\u017e\u0192\u02c6\u02dc\u2013\u2014\u2018-\u201a\u201c-\u201e\u2020-\u2022\u2026\u2030\u2039\u203a\u20ac\u2122]"
+_MOJIBAKE_PATTERN = re.compile(
+    f"[\u00c2-\u00df]{_CONTINUATION}|[\u00e0-\u00ef]{_CONTINUATION}{{2}}|[\u00f0-\u00f4]{_CONTINUATION}{{3}}"
+)
+_ZERO_WIDTH_PATTERN = re.compile("[\u200b-\u200d\ufeff]")
+# Only runs that actually change are matched; single plain spaces are left alone
+_SPACE_PATTERN = re.compile("[\t\u00a0\u2007\u202f][ \t\u00a0\u2007\u202f]*| [ \t\u00a0\u2007\u202f]+")
+_LINE_EDGE_PATTERN = re.compile(r" \n ?|\n ")
+_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+
+def _as_byte(char: str) -> int:
+    """Byte value a character had before it was wrongly decoded."""
+    try:
+        return char.encode("cp1252")[0]
+    except UnicodeEncodeError:
+        return ord(char)
+
+
+def _repair_sequence(match: "re.Match") -> str:
+    sequence = match.group(0)
+    try:
+        return bytes(_as_byte(char) for char in sequence).decode("utf-8")
+    except (UnicodeDecodeError, ValueError):
+        return sequence
+
+
+def repair_mojibake(text: str) -> str:
+    """
+    Repair UTF-8 text that was decoded as Latin-1 or cp1252, e.g. "â\\x80\\x98" -> "‘".
+
+    Only character sequences that form a valid UTF-8 byte sequence are
+    replaced, so correctly encoded text is left alone.
+    """
+    if text.isascii():
+        return text
+    return _MOJIBAKE_PATTERN.sub(_repair_sequence, text)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Drop zero-width characters, collapse runs of spaces and blank lines, trim lines."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if not text.isascii():
+        text = _ZERO_WIDTH_PATTERN.sub("", text)
+    text = _LINE_EDGE_PATTERN.sub("\n", _SPACE_PATTERN.sub(" ", text))
+    if "\n\n\n" in text:
+        text = _BLANK_LINES_PATTERN.sub("\n\n", text)
+    return text.strip()
+
+
+def clean_text(value: Any) -> Any:
+    """Repair and normalize a string field (other values are returned unchanged)."""
+    if not isinstance(value, str):
+        return value
+    return normalize_whitespace(repair_mojibake(value))
+
+
+def clean_article(article: Dict[str, Any], fields=KEEP_FIELDS) -> Dict[str, Any]:
+    """Keep only the used fields of an article, with repaired text."""
+    return {field: clean_text(article[field]) for field in fields if article.get(field) is not None}
+
+
+def _source_stamp(source: Path) -> Dict[str, Any]:
+    stat = source.stat()
+    return {"source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size}
+
+
+def article_key(article: Dict[str, Any], position: int) -> str:
+    """Identity of an article across corpus versions: its URL (or its position if it has none)."""
+    return article.get("url") or f"#{position}"
+
+
+def source_digest(article: Dict[str, Any]) -> str:
+    """Hash of an article as it appears in the source, used to detect changes."""
+    data = json.dumps(article, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _StoreWriter:
+    """Appends records and the closing table, header and footer of a store version."""
+
+    def __init__(self, out: BinaryIO, position: int):
+        self.out = out
+        self.position = position
+
+    def write(self, data: bytes) -> int:
+        start = self.position
+        self.out.write(data)
+        self.position += len(data)
+        return start
+
+    def finish(self, offsets: array, lengths: array, header: Dict[str, Any]) -> None:
+        table_pos = self.position
+        entries = array("B")
+        for entry in zip(offsets, lengths):
+            entries.frombytes(_OFFSET_ENTRY.pack(*entry))
+        self.write(entries.tobytes())
+        header_bytes = _encode(header)
+        header_pos = self.write(header_bytes)
+        self.write(_FOOTER.pack(table_pos, len(offsets), header_pos, len(header_bytes), STORE_MAGIC))
+
+
+def write_store(articles: Iterable[Dict[str, Any]], header: Dict[str, Any], out: BinaryIO) -> int:
+    """
+    Serialize source articles and a header into the store format.
+
+    Articles are cleaned and written one at a time; a URL seen before
+    replaces the earlier version. The URL list (with source digests) is
+    stored once so later updates can be computed as a diff.
+
+    Returns:
+        int: Number of distinct articles written
+    """
+    writer = _StoreWriter(out, 0)
+    writer.write(_PREAMBLE.pack(STORE_MAGIC, STORE_VERSION))
+    offsets, lengths = array("Q"), array("I")
+    keys: List[List[str]] = []
+    slots: Dict[str, int] = {}
+    replaced = 0
+    for position, article in enumerate(articles):
+        key = article_key(article, position)
+        record = _encode(clean_article(article))
+        record_pos = writer.write(record)
+        slot = slots.get(key)
+        if slot is None:
+            slots[key] = len(offsets)
+            offsets.append(record_pos)
+            lengths.append(len(record))
+            keys.append([key, source_digest(article)])
+        else:
+            replaced += lengths[slot]
+            offsets[slot], lengths[slot] = record_pos, len(record)
+            keys[slot] = [key, source_digest(article)]
+    keys_bytes = _encode(keys)
+    keys_pos = writer.write(keys_bytes)
+    header = dict(header, keys=[keys_pos, len(keys_bytes)], garbage=replaced, journal_seq=0)
+    writer.finish(offsets, lengths, header)
+    return len(offsets)
+
+
+class CompiledCorpus:
+    """
+    Read-only view of a compiled store. Behaves like a list of article dicts;
+    each article is decoded from the mapped file the first time it is read.
+    Removed articles read as empty dicts.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], path: Optional[Path] = None):
+        """
+        Args:
+            buffer: Store contents (a memory map or bytes)
+            path: File the buffer was mapped from, if any
+
+        Raises:
+            ValueError: If the buffer is not a compatible store
+        """
+        if len(buffer) < _PREAMBLE.size + _FOOTER.size:
+            raise ValueError("Compiled corpus is truncated")
+        magic, version = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise ValueError("Not a compiled corpus of a supported version")
+        table_pos, count, header_pos, header_length, end_magic = _FOOTER.unpack_from(buffer, len(buffer) - _FOOTER.size)
+        if end_magic != STORE_MAGIC or header_pos + header_length > len(buffer) or \
+                table_pos + count * _OFFSET_ENTRY.size > len(buffer):
+            raise ValueError("Compiled corpus is truncated")
+        self.header: Dict[str, Any] = json.loads(bytes(buffer[header_pos:header_pos + header_length]).decode("utf-8"))
+        self._table_pos = table_pos
+        self._buffer = buffer
+        self._count = count
+        self._cache: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.path = path
+        self.journal = ChangeJournal(ChangeJournal.path_for(path)) if path else None
+
+    @classmethod
+    def open(cls, path: Path) -> "CompiledCorpus":
+        """Memory-map a compiled store."""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer, Path(path))
+        except ValueError:
+            buffer.close()
+            raise
+
+    def __len__(self) -> int:
+        """Number of doc ids, including removed articles."""
+        return self._count
+
+    @property
+    def generation(self) -> Optional[str]:
+        """Id of the full compile this store descends from."""
+        return self.header.get("generation")
+
+    @property
+    def journal_seq(self) -> int:
+        """Journal position of the last incremental change applied to the store."""
+        return self.header.get("journal_seq", 0)
+
+    def location(self, doc_id: int) -> Location:
+        """(position, length) of the current record of an article (length 0 if removed)."""
+        if not 0 <= doc_id < self._count:
+            raise IndexError(f"Article {doc_id} out of range")
+        return _OFFSET_ENTRY.unpack_from(self._buffer, self._table_pos + doc_id * _OFFSET_ENTRY.size)
+
+    def is_removed(self, doc_id: int) -> bool:
+        return self.location(doc_id)[1] == 0
+
+    @property
+    def live_count(self) -> int:
+        """Number of articles that have not been removed."""
+        return sum(1 for doc_id in range(self._count) if not self.is_removed(doc_id))
+
+    def read_at(self, location: Location) -> Dict[str, Any]:
+        """Decode the record at a location, e.g. an earlier version of an article."""
+        position, length = location
+        if not length:
+            return {}
+        return json.loads(bytes(self._buffer[position:position + length]).decode("utf-8"))
+
+    def raw(self, doc_id: int) -> bytes:
+        """Compact JSON bytes of one article, without decoding it (b"" if removed)."""
+        position, length = self.location(doc_id)
+        return bytes(self._buffer[position:position + length])
+
+    def __getitem__(self, doc_id: int) -> Dict[str, Any]:
+        if doc_id < 0:
+            doc_id += self._count
+        article = self._cache.get(doc_id)
+        if article is None:
+            article = self.read_at(self.location(doc_id))
+            with self._lock:
+                self._cache[doc_id] = article
+        return article
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Decode the articles in order without keeping them (for streaming consumers)."""
+        for doc_id in range(self._count):
+            article = self._cache.get(doc_id)
+            yield article if article is not None else self.read_at(self.location(doc_id))
+
+    def to_json(self) -> str:
+        """All current articles as an indented JSON array (the shape of the source file)."""
+        return json.dumps([article for article in self if article], ensure_ascii=False, indent=4)
+
+    def keys(self) -> List[Optional[Tuple[str, str]]]:
+        """(URL, source digest) of each doc id, None for removed articles."""
+        keys_pos, keys_length = self.header["keys"]
+        keys: List[Optional[Tuple[str, str]]] = [
+            tuple(key) for key in json.loads(bytes(self._buffer[keys_pos:keys_pos + keys_length]).decode("utf-8"))
+        ]
+        if self.journal is not None and self.journal_seq:
+            for entry in self.journal.entries(self.generation, 0, self.journal_seq):
+                while len(keys) <= entry["doc_id"]:
+                    keys.append(None)
+                keys[entry["doc_id"]] = None if entry["op"] == "remove" else (entry["url"], entry["hash"])
+        return keys
+
+    def changes_since(self, seq: int) -> Optional[Dict[int, Optional[Location]]]:
+        """
+        Articles changed after journal position seq, coalesced per doc id.
+
+        Returns:
+            Mapping of doc id to the location of the version current at seq
+            (None for articles added since), or None if the journal does not
+            cover the range and the caller has to rebuild
+        """
+        if self.journal is None or seq > self.journal_seq:
+            return None
+        entries = self.journal.entries(self.generation, seq, self.journal_seq)
+        if len(entries) != self.journal_seq - seq:
+            return None
+        return coalesce_changes(entries)
+
+    def is_current(self, source: Path) -> bool:
+        """
+        Whether the store was compiled from the current source file.
+
+        The source's mtime and size are compared first; only if they differ
+        is the content hash computed, so touching the file does not force a
+        recompile.
+        """
+        source = Path(source)
+        if _source_stamp(source) == {key: self.header.get(key) for key in ("source_mtime_ns", "source_size")}:
+            return True
+        return _file_fingerprint(source) == self.header.get("source_hash")
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "CompiledCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def store_path_for(json_path: Path) -> Path:
+        """Location of the compiled store next to the corpus JSON."""
+        json_path = Path(json_path)
+        return json_path.with_name(json_path.stem + ".corpus")
+
+    @staticmethod
+    def _source_header(source: Path) -> Dict[str, Any]:
+        return dict(_source_stamp(source), source_hash=_file_fingerprint(source), fields=list(KEEP_FIELDS))
+
+    @classmethod
+    def compile(cls, source: Path, target: Optional[Path] = None) -> "CompiledCorpus":
+        """
+        Compile a corpus JSON file and open the result.
+
+        Starts a new generation and clears the change journal.
+
+        Args:
+            source: Path to the corpus JSON file
+            target: Where to write the store (defaults to store_path_for(source))
+
+        Returns:
+            CompiledCorpus: The freshly compiled store. If it cannot be written,
+                the store is kept in memory instead.
+        """
+        source = Path(source)
+        target = Path(target) if target else cls.store_path_for(source)
+        header = dict(cls._source_header(source), generation=uuid.uuid4().hex)
+        try:
+            tmp_path = Path(str(target) + ".tmp")
+            with open(tmp_path, "wb") as f:
+                write_store(iter_articles(source), header, f)
+            tmp_path.replace(target)
+        except OSError as e:
+            print(f"Could not save compiled corpus to {target}: {e}")
+            buffer = io.BytesIO()
+            write_store(iter_articles(source), header, buffer)
+            return cls(buffer.getvalue())
+        ChangeJournal(ChangeJournal.path_for(target)).reset()
+        return cls.open(target)
+
+    def diff(self, source: Path) -> Tuple[Dict[str, Tuple[Dict[str, Any], str]], List[str]]:
+        """
+        Compare a source file with the store, by URL.
+
+        The source is streamed once; only new and changed articles are kept.
+
+        Returns:
+            tuple: ({url: (source article, digest)} to add or update, [urls] to remove)
+        """
+        current = {key[0]: key[1] for key in self.keys() if key is not None}
+        upserts: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        seen = set()
+        for position, article in enumerate(iter_articles(source)):
+            key = article_key(article, position)
+            digest = source_digest(article)
+            seen.add(key)
+            if current.get(key) == digest:
+                # A later duplicate that matches the store undoes an earlier change
+                upserts.pop(key, None)
+            else:
+                upserts[key] = (article, digest)
+        return upserts, [key for key in current if key not in seen]
+
+    def patch(self, source: Path, upserts: Dict[str, Tuple[Dict[str, Any], str]], removals: List[str]) -> "CompiledCorpus":
+        """
+        Apply added, updated and removed articles to the store file in place.
+
+        New records, a new offset table, header and footer are appended;
+        the changes are journaled first.
+
+        Args:
+            source: Corpus JSON file the store now corresponds to
+            upserts: {url: (source article, digest)} to add or update
+            removals: URLs to remove
+
+        Returns:
+            CompiledCorpus: The store reopened at its new version
+        """
+        if self.path is None or self.generation is None:
+            raise ValueError("Only a saved store can be patched")
+        slots = {key[0]: doc_id for doc_id, key in enumerate(self.keys()) if key is not None}
+        offsets, lengths = array("Q"), array("I")
+        table = bytes(self._buffer[self._table_pos:self._table_pos + self._count * _OFFSET_ENTRY.size])
+        for position, length in _OFFSET_ENTRY.iter_unpack(table):
+            offsets.append(position)
+            lengths.append(length)
+
+        changes = []
+        replaced = 0
+        with open(self.path, "r+b") as f:
+            end = f.seek(0, 2)
+            writer = _StoreWriter(f, end)
+            for key, (article, digest) in upserts.items():
+                record_pos = writer.write(_encode(clean_article(article)))
+                record_length = writer.position - record_pos
+                doc_id = slots.get(key)
+                if doc_id is None:
+                    doc_id = len(offsets)
+                    offsets.append(record_pos)
+                    lengths.append(record_length)
+                    changes.append({"op": "add", "url": key, "doc_id": doc_id, "hash": digest, "old": None})
+                else:
+                    old = [offsets[doc_id], lengths[doc_id]]
+                    replaced += lengths[doc_id]
+                    offsets[doc_id], lengths[doc_id] = record_pos, record_length
+                    changes.append({"op": "update", "url": key, "doc_id": doc_id, "hash": digest, "old": old})
+            for key in removals:
+                doc_id = slots[key]
+                changes.append({"op": "remove", "url": key, "doc_id": doc_id, "hash": None,
+                                "old": [offsets[doc_id], lengths[doc_id]]})
+                replaced += lengths[doc_id]
+                lengths[doc_id] = 0
+
+            journal_seq = self.journal.append(self.generation, self.journal_seq, changes)
+            replaced += (end - self._table_pos)
+            header = dict(
+                self.header,
+                **self._source_header(source),
+                journal_seq=journal_seq,
+                garbage=self.header.get("garbage", 0) + replaced
+            )
+            writer.finish(offsets, lengths, header)
+        return CompiledCorpus.open(self.path)
+
+    def sync(self, source: Path) -> Tuple["CompiledCorpus", Dict[str, int]]:
+        """
+        Bring the store in line with a changed source file.
+
+        Patches the store in place when the delta is small; recompiles when
+        most articles changed or the file holds mostly replaced bytes.
+
+        Returns:
+            tuple: (up-to-date store, counts of added / updated / removed articles,
+                or {"recompiled": n} after a full compile)
+        """
+        source = Path(source)
+        upserts, removals = self.diff(source)
+        changed = len(upserts) + len(removals)
+        live = self.live_count
+        size = len(self._buffer)
+        if self.path is None or self.generation is None or changed > REBUILD_FRACTION * max(1, live) \
+                or self.header.get("garbage", 0) > REBUILD_FRACTION * size:
+            store = CompiledCorpus.compile(source, self.path)
+            return store, {"recompiled": len(store)}
+        slots = {key[0] for key in self.keys() if key is not None}
+        added = sum(1 for key in upserts if key not in slots)
+        stats = {"added": added, "updated": len(upserts) - added, "removed": len(removals)}
+        return self.patch(source, upserts, removals), stats
+
+    @classmethod
+    def load_or_compile(cls, source: Path, debug: bool = False) -> Optional["CompiledCorpus"]:
+        """
+        Open the store compiled from a corpus file, updating it when the source changed.
+
+        Args:
+            source: Path to the corpus JSON file
+            debug: Whether to print store maintenance messages
+
+        Returns:
+            CompiledCorpus, or None if the source is missing or cannot be parsed
+        """
+        source = Path(source)
+        if not source.exists():
+            print(f"File not found: {source}")
+            return None
+        target = cls.store_path_for(source)
+        try:
+            store = cls.open(target)
+        except (OSError, ValueError):
+            store = None
+        try:
+            if store is None:
+                store = cls.compile(source, target)
+                if debug:
+                    print(f"Compiled {len(store)} articles from {source} into {target}")
+                return store
+            if store.is_current(source):
+                if debug:
+                    print(f"Loaded compiled corpus from {target}")
+                return store
+            updated, stats = store.sync(source)
+        except (OSError, ValueError) as e:
+            print(f"Could not compile corpus {source}: {e}")
+            return None
+        store.close()
+        if debug:
+            if "recompiled" in stats:
+                print(f"Recompiled {stats['recompiled']} articles from {source} into {target}")
+            else:
+                print(f"Updated compiled corpus {target}: {stats['added']} added, "
+                      f"{stats['updated']} updated, {stats['removed']} removed")
+        return updated
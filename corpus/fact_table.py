@@ -0,0 +1,442 @@
+"""
+Numeric fact table of the press release corpus.
+
+Every number, percentage, euro amount and date in the corpus articles is
+extracted once, with the sentence it occurs in, its unit and the article's
+URL and publication date. Facts are indexed by (unit, value), so a claim
+such as "40 %" is found with a range lookup, and by the keywords of their
+sentence, so the candidates can be narrowed to the right context.
+
+Numbers are parsed the Dutch way: "1.250" and "1 250" are one thousand two
+hundred and fifty, "2,5" is two and a half, and "1,2 miljard" is 1.2e9. A
+number with a decimal point ("12.5") is ambiguous and is skipped rather than
+read as 12.
+"""
+import bisect
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .bm25_index import STOPWORDS, _file_fingerprint
+from .tokens import tokenize
+
+INDEX_VERSION = 3
+
+FACT_FIELDS = ("title", "subheading", "content")
+
+MONTHS = {
+    "jan": 1, "januari": 1, "feb": 2, "februari": 2, "maa": 3, "mrt": 3, "maart": 3,
+    "apr": 4, "april": 4, "mei": 5, "jun": 6, "juni": 6, "jul": 7, "juli": 7,
+    "aug": 8, "augustus": 8, "sep": 9, "sept": 9, "september": 9, "okt": 10, "oktober": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+
+SCALES = {
+    "duizend": 1e3, "miljoen": 1e6, "mio": 1e6, "miljard": 1e9, "mld": 1e9, "biljoen": 1e12,
+}
+
+_DATE_PATTERN = re.compile(
+    r"(?<![\w.,])(?P<day>\d{1,2})\s+(?P<month>" + "|".join(sorted(MONTHS, key=len, reverse=True)) +
+    r")\.?\s+(?P<year>(?:19|20)\d{2})(?!\d)",
+    re.IGNORECASE
+)
+
+_QUANTITY_PATTERN = re.compile(
+    r"(?<![\w.,])(?P<currency>€\s?)?(?P<sign>[+-])?"
+    r"(?P<number>\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d{1,3}(?:[ \u00a0]\d{3})+(?:,\d+)?|\d+(?:,\d+)?)"
+    # Not followed by another digit or a decimal part, so "12.5" is not read as 12
+    r"(?!\d|[.,]\d)"
+    r"(?:\s?(?P<scale>" + "|".join(SCALES) + r")\b\.?)?"
+    r"(?:\s?(?P<unit>%|procentpunt(?:en)?\b|procent\b|euro\b))?",
+    re.IGNORECASE
+)
+
+_CLAUSE_BREAK_PATTERN = re.compile(r"[,;:]\s+|\s+[-\u2013\u2014]\s+|\s+en\s+")
+
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[^a-z])|\n+")
+
+# Quantity units
+PERCENT = "percent"
+POINTS = "points"
+EUR = "eur"
+DATE = "date"
+YEAR = "year"
+NUMBER = "number"
+
+
+def parse_number(text: str) -> Tuple[float, int]:
+    """
+    Parse a Dutch number literal.
+
+    Returns:
+        tuple: (value, number of decimals written)
+
+    Raises:
+        ValueError: For a number with a decimal point ("12.5") or other
+            text that is not a Dutch number
+    """
+    text = text.replace(" ", "").replace("\u00a0", "")
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+(?:,\d+)?", text):
+        text = text.replace(".", "")
+    elif "." in text:
+        raise ValueError(f"Not a Dutch number: {text!r}")
+    integer, _, decimals = text.partition(",")
+    value = float(f"{integer}.{decimals}" if decimals else integer)
+    return value, len(decimals)
+
+
+def iter_quantities(text: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Find the numbers, percentages, euro amounts and dates in a text.
+
+    Yields:
+        dict: value (float; dates as yyyymmdd), unit, precision (half the
+            value of the last digit written), text (the literal) and
+            start/end offsets
+    """
+    if not text:
+        return
+    taken = []
+    for match in _DATE_PATTERN.finditer(text):
+        day, year = int(match.group("day")), int(match.group("year"))
+        month = MONTHS[match.group("month").lower()]
+        if 1 <= day <= 31:
+            taken.append((match.start(), match.end()))
+            yield {
+                "value": float(year * 10000 + month * 100 + day), "unit": DATE, "precision": 0.0,
+                "text": match.group(0), "start": match.start(), "end": match.end(),
+            }
+    for match in _QUANTITY_PATTERN.finditer(text):
+        if any(start < match.end() and match.start() < end for start, end in taken):
+            continue
+        value, decimals = parse_number(match.group("number"))
+        if match.group("sign") == "-":
+            value = -value
+        scale = (match.group("scale") or "").lower().rstrip(".")
+        precision = 0.5 * 10 ** -decimals
+        if scale:
+            value *= SCALES[scale]
+            precision *= SCALES[scale]
+        unit_text = (match.group("unit") or "").lower()
+        if unit_text in ("%", "procent"):
+            unit = PERCENT
+        elif unit_text.startswith("procentpunt"):
+            unit = POINTS
+        elif unit_text == "euro" or match.group("currency"):
+            unit = EUR
+        elif not scale and not decimals and 1900 <= value <= 2099 and not match.group("sign"):
+            unit, precision = YEAR, 0.0
+        else:
+            unit = NUMBER
+        yield {
+            "value": value, "unit": unit, "precision": precision,
+            "text": match.group(0).strip(), "start": match.start(), "end": match.end(),
+        }
+
+
+def iter_clauses(text: Optional[str]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """
+    Quantities of a text in order of position, each with its clause: the part
+    of the text between commas, semicolons, colons, dashes or "en" around it, cut
+    off at the neighbouring quantities. In "daling van 18% in Vlaams-Brabant,
+    gevolgd door Antwerpen (-12%), en Oost-Vlaanderen (-9%)" every figure
+    gets its own clause.
+    """
+    if not text:
+        return
+    quantities = sorted(iter_quantities(text), key=lambda quantity: quantity["start"])
+    breaks = [(match.start(), match.end()) for match in _CLAUSE_BREAK_PATTERN.finditer(text)]
+    for i, quantity in enumerate(quantities):
+        start = max([quantities[i - 1]["end"] if i else 0] +
+                    [end for start, end in breaks if end <= quantity["start"]])
+        end = min([quantities[i + 1]["start"] if i + 1 < len(quantities) else len(text)] +
+                  [start for start, end in breaks if start >= quantity["end"]])
+        yield quantity, text[start:end]
+
+
+def iter_sentences(text: Optional[str]) -> Iterator[Tuple[int, str]]:
+    """(start offset, sentence) pairs of a text, split at sentence ends and line breaks."""
+    if not text:
+        return
+    start = 0
+    for match in _SENTENCE_END_PATTERN.finditer(text):
+        if text[start:match.start()].strip():
+            yield start, text[start:match.start()]
+        start = match.end()
+    if text[start:].strip():
+        yield start, text[start:]
+
+
+def keywords(text: Optional[str]) -> List[str]:
+    """Distinct content words of a text (no stopwords or numbers)."""
+    seen = []
+    for token in tokenize(text):
+        if token not in STOPWORDS and not token.isdigit() and len(token) > 2 and token not in seen:
+            seen.append(token)
+    return seen
+
+
+def extract_facts(article: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    All quantities of an article with their sentence.
+
+    Returns:
+        List of fact dicts: value, unit, precision, text, field, sentence and
+        clause (see iter_clauses)
+    """
+    facts = []
+    for field in FACT_FIELDS:
+        for _, sentence in iter_sentences(article.get(field)):
+            sentence = sentence.strip()
+            for quantity, clause in iter_clauses(sentence):
+                facts.append({
+                    "value": quantity["value"],
+                    "unit": quantity["unit"],
+                    "precision": quantity["precision"],
+                    "text": quantity["text"],
+                    "field": field,
+                    "sentence": sentence,
+                    "clause": clause.strip(),
+                })
+    return facts
+
+
+# A fact is referenced by (doc id, position in the article's fact list)
+FactRef = Tuple[int, int]
+
+
+class FactTable:
+    """
+    Facts of every article, indexed by (unit, value) and by sentence keyword.
+    """
+
+    def __init__(self):
+        self.facts: List[List[Dict[str, Any]]] = []
+        self.sources: List[Dict[str, Optional[str]]] = []
+        self.source_hash: Optional[str] = None
+        self.generation: Optional[str] = None
+        self.journal_seq = 0
+        self._values: Dict[str, List[Tuple[float, int, int]]] = {}
+        self._keywords: Dict[str, List[FactRef]] = {}
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.facts)
+
+    @property
+    def num_facts(self) -> int:
+        return sum(len(facts) for facts in self.facts)
+
+    def _index(self, doc_ids: Iterable[int]) -> None:
+        for doc_id in doc_ids:
+            for position, fact in enumerate(self.facts[doc_id]):
+                self._values.setdefault(fact["unit"], []).append((fact["value"], doc_id, position))
+                for keyword in keywords(fact["sentence"]):
+                    self._keywords.setdefault(keyword, []).append((doc_id, position))
+        for entries in self._values.values():
+            entries.sort()
+
+    def _unindex(self, doc_ids: set) -> None:
+        """Remove the facts of some articles from the indexes, filtering each list once."""
+        for unit, entries in self._values.items():
+            entries[:] = [entry for entry in entries if entry[1] not in doc_ids]
+        stale = {
+            keyword for doc_id in doc_ids if doc_id < self.num_docs
+            for fact in self.facts[doc_id] for keyword in keywords(fact["sentence"])
+        }
+        for keyword in stale:
+            refs = [ref for ref in self._keywords.get(keyword, []) if ref[0] not in doc_ids]
+            if refs:
+                self._keywords[keyword] = refs
+            else:
+                self._keywords.pop(keyword, None)
+
+    def _set_article(self, doc_id: int, article: Dict[str, Any]) -> None:
+        while len(self.facts) <= doc_id:
+            self.facts.append([])
+            self.sources.append({"url": None, "publication_date": None})
+        self.facts[doc_id] = extract_facts(article) if article else []
+        self.sources[doc_id] = {"url": article.get("url"), "publication_date": article.get("publication_date")}
+
+    def _reindex(self) -> None:
+        self._values, self._keywords = {}, {}
+        self._index(range(self.num_docs))
+
+    @classmethod
+    def build(cls, articles: Iterable[Dict[str, Any]]) -> "FactTable":
+        """
+        Extract the facts of every article, consuming them one at a time.
+
+        Args:
+            articles: Article dicts (a list, a compiled corpus or any iterable);
+                document ids are positions in the input
+        """
+        table = cls()
+        for doc_id, article in enumerate(articles):
+            table._set_article(doc_id, article)
+        table._reindex()
+        return table
+
+    def apply_changes(self, articles, changes: Dict[int, Any]) -> None:
+        """
+        Re-extract the facts of articles changed in a compiled corpus.
+
+        Args:
+            articles: The compiled corpus in its current version
+            changes: Doc ids changed since the table was synced (see
+                CompiledCorpus.changes_since)
+        """
+        self._unindex(set(changes))
+        for doc_id in sorted(changes):
+            self._set_article(doc_id, articles[doc_id])
+        while self.num_docs < len(articles):
+            self._set_article(self.num_docs, {})
+        self._index(sorted(changes))
+
+    def fact(self, ref: FactRef) -> Dict[str, Any]:
+        """A fact with the URL and publication date of its article."""
+        doc_id, position = ref
+        return dict(self.facts[doc_id][position], doc_id=doc_id, **self.sources[doc_id])
+
+    def find_value(self, value: float, unit: str, precision: float = 0.5) -> List[FactRef]:
+        """
+        Facts of a unit whose value matches a claimed value at the claim's precision.
+
+        "40 %" (precision 0.5) matches anything from 39.5 to 40.5 %, "39,7 %"
+        only 39.65 to 39.75 %. Dates and years must match exactly.
+        """
+        entries = self._values.get(unit)
+        if not entries:
+            return []
+        tolerance = precision
+        if unit in (EUR, NUMBER) and abs(value) >= 1e3:
+            # Large amounts are usually rounded to their leading digits
+            tolerance = max(tolerance, abs(value) * 0.005)
+        tolerance += 1e-9
+        low = bisect.bisect_left(entries, (value - tolerance, -1, -1))
+        high = bisect.bisect_right(entries, (value + tolerance, float("inf"), float("inf")))
+        return [(doc_id, position) for _, doc_id, position in entries[low:high]]
+
+    def find_keywords(self, words: Iterable[str]) -> Dict[FactRef, int]:
+        """Facts whose sentence contains some of the words, with the number of words shared."""
+        counts: Dict[FactRef, int] = {}
+        for word in set(words):
+            for ref in self._keywords.get(word, []):
+                counts[ref] = counts.get(ref, 0) + 1
+        return counts
+
+    def lookup(
+        self,
+        value: Optional[float] = None,
+        unit: Optional[str] = None,
+        context: Optional[str] = None,
+        precision: float = 0.5,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the facts that back a claim.
+
+        Args:
+            value: Claimed value (None to search by keyword only)
+            unit: Unit of the value (PERCENT, EUR, DATE, ...); all units if None
+            context: Text around the claim; facts whose sentence shares more
+                keywords with it rank first
+            precision: Half the value of the claim's last written digit
+            limit: Maximum number of facts returned
+
+        Returns:
+            Fact dicts (with url, publication_date and an "overlap" keyword
+            count), best first
+        """
+        overlap = self.find_keywords(keywords(context)) if context else {}
+        if value is None:
+            refs = list(overlap)
+        else:
+            units = [unit] if unit else list(self._values)
+            refs = [ref for u in units for ref in self.find_value(value, u, precision)]
+        refs.sort(key=lambda ref: (-overlap.get(ref, 0), ref))
+        return [dict(self.fact(ref), overlap=overlap.get(ref, 0)) for ref in refs[:limit]]
+
+    def save(self, path: Path) -> None:
+        """Persist the table as JSON (the indexes are rebuilt on load)."""
+        payload = {
+            "version": INDEX_VERSION,
+            "source_hash": self.source_hash,
+            "generation": self.generation,
+            "journal_seq": self.journal_seq,
+            "sources": self.sources,
+            "facts": self.facts,
+        }
+        tmp_path = Path(str(path) + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["FactTable"]:
+        """Load a persisted table, returning None if it is missing or incompatible."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if payload.get("version") != INDEX_VERSION:
+            return None
+        table = cls()
+        table.source_hash = payload.get("source_hash")
+        table.generation = payload.get("generation")
+        table.journal_seq = payload.get("journal_seq", 0)
+        table.sources = payload["sources"]
+        table.facts = payload["facts"]
+        table._reindex()
+        return table
+
+    @staticmethod
+    def index_path_for(json_path: Path) -> Path:
+        """Location of the persisted table next to the corpus JSON."""
+        json_path = Path(json_path)
+        return json_path.with_name(json_path.stem + ".facts.json")
+
+    @classmethod
+    def load_or_build(cls, json_path: Path, articles, debug: bool = False) -> "FactTable":
+        """
+        Load the table saved next to the corpus, updating it when the corpus changed.
+
+        If articles is a compiled corpus whose change journal covers the
+        changes since the table was saved, only the changed articles are
+        re-extracted; otherwise the table is rebuilt.
+
+        Args:
+            json_path: Path to the corpus JSON file
+            articles: Articles of that file (a list or a compiled corpus)
+            debug: Whether to print table maintenance messages
+        """
+        index_path = cls.index_path_for(json_path)
+        source_hash = _file_fingerprint(json_path)
+        table = cls.load(index_path)
+        if table is not None and table.source_hash == source_hash and table.num_docs == len(articles):
+            if debug:
+                print(f"Loaded fact table from {index_path}")
+            return table
+
+        generation = getattr(articles, "generation", None)
+        changes = None
+        if table is not None and generation is not None and table.generation == generation:
+            changes = articles.changes_since(table.journal_seq)
+        if changes is not None:
+            table.apply_changes(articles, changes)
+            message = f"Updated fact table: {len(changes)} articles re-extracted"
+        else:
+            table = cls.build(articles)
+            message = f"Built fact table with {table.num_facts} facts from {table.num_docs} articles"
+        table.source_hash = source_hash
+        table.generation = generation
+        table.journal_seq = getattr(articles, "journal_seq", 0)
+        try:
+            table.save(index_path)
+            if debug:
+                print(f"{message}: {index_path}")
+        except OSError as e:
+            print(f"Could not save fact table to {index_path}: {e}")
+        return table
@@ -0,0 +1,107 @@
+"""
+Change journal of the compiled corpus store.
+
+Every incremental change to the store (an article added, updated or removed,
+keyed by URL) is appended to a JSON-lines journal next to it. Each derived
+structure (retrieval indexes, fact table) remembers the journal sequence
+number it was last synced to and catches up by replaying the entries after
+it, instead of being rebuilt. A full recompile starts a new generation and
+an empty journal.
+"""
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# A stored article version: (offset, length) of its record in the store file
+Location = Tuple[int, int]
+
+
+class ChangeJournal:
+    """Append-only JSON-lines log of store changes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @staticmethod
+    def path_for(store_path: Path) -> Path:
+        """Location of the journal next to a compiled store."""
+        store_path = Path(store_path)
+        return store_path.with_name(store_path.stem + ".journal.jsonl")
+
+    def entries(self, generation: str, after_seq: int = 0, until_seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Entries of a store generation with after_seq < seq <= until_seq, in order.
+        """
+        entries = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get("generation") != generation or entry["seq"] <= after_seq:
+                        continue
+                    if until_seq is not None and entry["seq"] > until_seq:
+                        continue
+                    entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def append(self, generation: str, after_seq: int, changes: List[Dict[str, Any]]) -> int:
+        """
+        Record a batch of changes made on top of journal position after_seq.
+
+        Entries beyond after_seq (left behind by an interrupted update that
+        never reached the store) are dropped first.
+
+        Args:
+            generation: Store generation the changes apply to
+            after_seq: Journal position of the store before the changes
+            changes: Dicts with op ("add", "update" or "remove"), url, doc_id,
+                hash (source digest, None for removals) and old (previous
+                record location, None for additions)
+
+        Returns:
+            int: Sequence number of the last entry written
+        """
+        stale = self.entries(generation, after_seq)
+        if stale:
+            kept = self.entries(generation, 0, after_seq)
+            with open(self.path, "w", encoding="utf-8") as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        seq = after_seq
+        now = time.time()
+        with open(self.path, "a", encoding="utf-8") as f:
+            for change in changes:
+                seq += 1
+                entry = dict(change, seq=seq, generation=generation, time=now)
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return seq
+
+    def reset(self) -> None:
+        """Forget all entries (after a full recompile)."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def coalesce_changes(entries: List[Dict[str, Any]]) -> Dict[int, Optional[Location]]:
+    """
+    Collapse journal entries into one change per document.
+
+    Returns:
+        Mapping of doc id to the location of the version a structure synced
+        before the first entry holds (None if the document did not exist then).
+        The current version, if any, is read from the store.
+    """
+    changes: Dict[int, Optional[Location]] = {}
+    for entry in entries:
+        if entry["doc_id"] not in changes:
+            old = entry.get("old")
+            changes[entry["doc_id"]] = tuple(old) if old else None
+    return changes
@@ -0,0 +1,326 @@
+"""
+Near-duplicate detection over the press release corpus.
+
+Press releases often recycle whole paragraphs ("Bouwbalans" figures, quotes,
+boilerplate), and some are republished almost unchanged. Articles and their
+paragraphs are fingerprinted with MinHash signatures over word shingles;
+locality-sensitive hashing (banding) proposes candidate pairs, which are
+kept when their estimated Jaccard similarity reaches a threshold. Candidates
+are merged into clusters with union-find.
+
+When context is built, each article cluster is represented by one article
+that lists the URLs of the others, and a paragraph is sent only the first
+time its cluster occurs. NumPy is used for the signatures when available.
+"""
+import json
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .bm25_index import _file_fingerprint
+from .tokens import tokenize
+
+INDEX_VERSION = 1
+
+# MinHash permutations, split into LSH bands of NUM_PERM // BANDS rows
+NUM_PERM = 64
+BANDS = 16
+
+# Words per shingle
+SHINGLE_WORDS = 4
+
+# Minimum estimated Jaccard similarity of near-duplicates
+ARTICLE_THRESHOLD = 0.8
+PARAGRAPH_THRESHOLD = 0.8
+
+# Shorter paragraphs (headings, captions) are never collapsed
+MIN_PARAGRAPH_CHARS = 120
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_numpy = None
+
+
+def _np():
+    """NumPy, or None if it cannot be imported."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _permutations() -> List[Tuple[int, int]]:
+    # Fixed seeds: signatures must be comparable across processes
+    params = []
+    for i in range(NUM_PERM):
+        a = (zlib.crc32(f"a{i}".encode()) >> 1) | 1
+        b = zlib.crc32(f"b{i}".encode())
+        params.append((a, b))
+    return params
+
+
+_PERMUTATIONS = _permutations()
+
+
+def shingles(text: Optional[str]) -> set:
+    """Hashed word shingles of a text (the words themselves if it is shorter than a shingle)."""
+    words = tokenize(text)
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash(shingle_hashes: Iterable[int]) -> Tuple[int, ...]:
+    """MinHash signature of a set of 32-bit shingle hashes."""
+    values = list(shingle_hashes)
+    if not values:
+        return (_MAX_HASH,) * NUM_PERM
+    np = _np()
+    if np is not None:
+        x = np.asarray(values, dtype=np.uint64)[:, None]
+        a = np.asarray([p[0] for p in _PERMUTATIONS], dtype=np.uint64)
+        b = np.asarray([p[1] for p in _PERMUTATIONS], dtype=np.uint64)
+        # a < 2**31 and x < 2**32, so a * x + b cannot overflow 64 bits
+        return tuple(int(v) for v in ((a * x + b) % _PRIME & _MAX_HASH).min(axis=0))
+    return tuple(min(((a * v + b) % _PRIME) & _MAX_HASH for v in values) for a, b in _PERMUTATIONS)
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def cluster(signatures: Dict[Any, Tuple[int, ...]], threshold: float) -> List[List[Any]]:
+    """
+    Group items whose signatures are near-duplicates.
+
+    Returns:
+        Clusters of two or more item keys, each in insertion order
+    """
+    parent = {key: key for key in signatures}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        buckets: Dict[Tuple[int, ...], List[Any]] = {}
+        for key, signature in signatures.items():
+            buckets.setdefault(signature[band * rows:(band + 1) * rows], []).append(key)
+        for keys in buckets.values():
+            for other in keys[1:]:
+                root, other_root = find(keys[0]), find(other)
+                if root != other_root and similarity(signatures[keys[0]], signatures[other]) >= threshold:
+                    parent[other_root] = root
+
+    groups: Dict[Any, List[Any]] = {}
+    for key in signatures:
+        groups.setdefault(find(key), []).append(key)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def _paragraphs(content: Optional[str]) -> List[str]:
+    return (content or "").split("\n")
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate clusters of a corpus: articles mapped to the representative
+    of their cluster, and paragraphs (doc id, line number) mapped to a
+    paragraph cluster id.
+    """
+
+    def __init__(self):
+        self.representatives: Dict[int, int] = {}
+        self.members: Dict[int, List[int]] = {}
+        self.paragraph_clusters: Dict[int, Dict[int, int]] = {}
+        self.num_docs = 0
+        self.source_hash: Optional[str] = None
+
+    @property
+    def num_paragraph_clusters(self) -> int:
+        return len({cid for lines in self.paragraph_clusters.values() for cid in lines.values()})
+
+    @classmethod
+    def build(cls, articles) -> "DuplicateIndex":
+        """
+        Cluster near-duplicate articles and paragraphs.
+
+        Each cluster is represented by its longest article (the lowest doc
+        id on ties), so the most complete version is the one kept.
+
+        Args:
+            articles: Sequence of article dicts (a list or a compiled corpus)
+        """
+        index = cls()
+        article_signatures = {}
+        paragraph_signatures = {}
+        lengths = {}
+        for doc_id, article in enumerate(articles):
+            index.num_docs += 1
+            content = article.get("content")
+            if not content:
+                continue
+            lengths[doc_id] = len(content)
+            article_signatures[doc_id] = minhash(shingles(content))
+            for line_no, paragraph in enumerate(_paragraphs(content)):
+                if len(paragraph) >= MIN_PARAGRAPH_CHARS:
+                    paragraph_signatures[(doc_id, line_no)] = minhash(shingles(paragraph))
+
+        for members in cluster(article_signatures, ARTICLE_THRESHOLD):
+            representative = max(members, key=lambda doc_id: (lengths[doc_id], -doc_id))
+            index.members[representative] = sorted(members)
+            for doc_id in members:
+                index.representatives[doc_id] = representative
+
+        for cluster_id, members in enumerate(cluster(paragraph_signatures, PARAGRAPH_THRESHOLD)):
+            for doc_id, line_no in members:
+                index.paragraph_clusters.setdefault(doc_id, {})[line_no] = cluster_id
+        return index
+
+    def representative(self, doc_id: int) -> int:
+        """Doc id of the article that stands in for an article's cluster."""
+        return self.representatives.get(doc_id, doc_id)
+
+    def duplicate_urls(self, articles, doc_id: int) -> List[str]:
+        """URLs of the other articles in the cluster of a representative."""
+        return [
+            articles[member].get("url") for member in self.members.get(doc_id, [])
+            if member != doc_id and articles[member].get("url")
+        ]
+
+    def strip_repeated(self, doc_id: int, text: str, start_line: int, seen: set) -> str:
+        """
+        Remove paragraphs of a text whose cluster is in seen, adding the others' clusters to it.
+
+        Args:
+            doc_id: Article the text comes from
+            text: Content, or a passage of it
+            start_line: Line number of the text's first paragraph within the content
+            seen: Paragraph cluster ids already in the context (updated in place)
+        """
+        clusters = self.paragraph_clusters.get(doc_id)
+        if not clusters:
+            return text
+        kept = []
+        for line_no, paragraph in enumerate(text.split("\n"), start_line):
+            cluster_id = clusters.get(line_no)
+            if cluster_id is None:
+                kept.append(paragraph)
+            elif cluster_id not in seen:
+                seen.add(cluster_id)
+                kept.append(paragraph)
+        return "\n".join(kept)
+
+    def collapse(self, articles, doc_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Articles for a context, with near-duplicates collapsed.
+
+        Each article cluster appears once, as its representative with a
+        "duplicate_urls" list; paragraphs already included by an earlier
+        article are left out.
+
+        Args:
+            articles: Corpus articles, positionally aligned with the index
+            doc_ids: Articles to include, in context order
+        """
+        collapsed = []
+        included = set()
+        seen_paragraphs: set = set()
+        for doc_id in doc_ids:
+            doc_id = self.representative(doc_id)
+            if doc_id in included:
+                continue
+            included.add(doc_id)
+            article = dict(articles[doc_id])
+            if article.get("content"):
+                article["content"] = self.strip_repeated(doc_id, article["content"], 0, seen_paragraphs)
+            urls = self.duplicate_urls(articles, doc_id)
+            if urls:
+                article["duplicate_urls"] = urls
+            collapsed.append(article)
+        return collapsed
+
+    def save(self, path: Path) -> None:
+        """Persist the clusters as JSON."""
+        payload = {
+            "version": INDEX_VERSION,
+            "source_hash": self.source_hash,
+            "num_docs": self.num_docs,
+            "members": [members for _, members in sorted(self.members.items())],
+            "representatives": sorted(self.members),
+            "paragraphs": {str(doc_id): lines for doc_id, lines in self.paragraph_clusters.items()},
+        }
+        tmp_path = Path(str(path) + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["DuplicateIndex"]:
+        """Load persisted clusters, returning None if they are missing or incompatible."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if payload.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        index.source_hash = payload.get("source_hash")
+        index.num_docs = payload["num_docs"]
+        for representative, members in zip(payload["representatives"], payload["members"]):
+            index.members[representative] = members
+            for doc_id in members:
+                index.representatives[doc_id] = representative
+        index.paragraph_clusters = {
+            int(doc_id): {int(line_no): cid for line_no, cid in lines.items()}
+            for doc_id, lines in payload["paragraphs"].items()
+        }
+        return index
+
+    @staticmethod
+    def index_path_for(json_path: Path) -> Path:
+        """Location of the persisted clusters next to the corpus JSON."""
+        json_path = Path(json_path)
+        return json_path.with_name(json_path.stem + ".duplicates.json")
+
+    @classmethod
+    def load_or_build(cls, json_path: Path, articles, debug: bool = False) -> "DuplicateIndex":
+        """
+        Load the clusters saved next to the corpus, rebuilding them when the corpus changed.
+
+        Args:
+            json_path: Path to the corpus JSON file
+            articles: Articles of that file (a list or a compiled corpus)
+            debug: Whether to print index maintenance messages
+        """
+        index_path = cls.index_path_for(json_path)
+        source_hash = _file_fingerprint(json_path)
+        index = cls.load(index_path)
+        if index is not None and index.source_hash == source_hash and index.num_docs == len(articles):
+            if debug:
+                print(f"Loaded near-duplicate clusters from {index_path}")
+            return index
+
+        index = cls.build(articles)
+        index.source_hash = source_hash
+        try:
+            index.save(index_path)
+            if debug:
+                print(f"Found {len(index.members)} near-duplicate article clusters and "
+                      f"{index.num_paragraph_clusters} repeated paragraphs: {index_path}")
+        except OSError as e:
+            print(f"Could not save near-duplicate clusters to {index_path}: {e}")
+        return index
@@ -0,0 +1,546 @@
+"""
+Passage-level dense retrieval over the press release corpus.
+
+Each article's content is split into passages of a few paragraphs. Passages
+are embedded fully offline: words and their character 4-grams are hashed
+into a fixed number of buckets, weighted by TF-IDF, and projected onto the
+leading principal directions of the corpus (latent semantic analysis). The
+4-grams let compounds that share a stem match ("woningbouw" / "nieuwbouw");
+the projection groups words that occur in the same contexts.
+
+The embeddings are one NumPy matrix, so a query is a single matrix-vector
+product. NumPy is an optional dependency, imported on first use.
+"""
+import hashlib
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .bm25_index import STOPWORDS, _file_fingerprint
+from .compiled_store import article_key
+from .tokens import estimate_tokens, tokenize
+
+INDEX_VERSION = 2
+
+# Hashed feature buckets, embedding dimensions and character n-gram length
+HASH_DIM = 2048
+EMBED_DIM = 128
+NGRAM = 4
+
+# Target passage length in characters; longer paragraphs are split at sentence ends
+PASSAGE_CHARS = 600
+
+# At most this many passages are used to fit the projection
+FIT_SAMPLE = 20000
+
+# Rebuild from scratch (refitting IDF and the projection) when more than this
+# fraction of the articles changed since the index was built
+REFIT_FRACTION = 0.5
+
+BATCH_SIZE = 1024
+
+_LINE_PATTERN = re.compile(r"[^\n]+")
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+_numpy = None
+
+
+def _np():
+    """Import NumPy on first use."""
+    global _numpy
+    if _numpy is None:
+        import numpy
+        _numpy = numpy
+    return _numpy
+
+
+def numpy_available() -> bool:
+    """Whether NumPy can be imported."""
+    try:
+        _np()
+        return True
+    except ImportError:
+        return False
+
+
+def _units(text: str) -> Iterable[Tuple[int, int]]:
+    """Spans of the lines of a text, with long lines split after sentence ends."""
+    for line in _LINE_PATTERN.finditer(text):
+        start, end = line.span()
+        if end - start <= PASSAGE_CHARS:
+            yield start, end
+            continue
+        for sentence_end in _SENTENCE_END_PATTERN.finditer(text, start, end):
+            if sentence_end.start() - start >= PASSAGE_CHARS // 2:
+                yield start, sentence_end.start()
+                start = sentence_end.end()
+        yield start, end
+
+
+def split_passages(text: Optional[str], max_chars: int = PASSAGE_CHARS) -> List[Tuple[int, int]]:
+    """
+    Split article content into passages.
+
+    Consecutive lines are merged until a passage would exceed max_chars.
+
+    Returns:
+        List of (start, end) character offsets into the text
+    """
+    spans = []
+    start = end = None
+    for unit_start, unit_end in _units(text or ""):
+        if start is None:
+            start = unit_start
+        elif unit_end - start > max_chars:
+            spans.append((start, end))
+            start = unit_start
+        end = unit_end
+    if start is not None:
+        spans.append((start, end))
+    return spans
+
+
+def article_hash(article: Dict[str, Any]) -> str:
+    """Hash of the fields that go into an article's passages."""
+    digest = hashlib.sha1()
+    digest.update((article.get("title") or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((article.get("content") or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _Featurizer:
+    """Maps text to sparse hashed word + character n-gram counts."""
+
+    def __init__(self, dim: int = HASH_DIM, max_memo: int = 500000):
+        self.dim = dim
+        self.max_memo = max_memo
+        self._memo: Dict[str, List[Tuple[int, float]]] = {}
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        # crc32 rather than hash(): bucket assignment must survive restarts
+        value = zlib.crc32(feature.encode("utf-8"))
+        return value % self.dim, 1.0 if value & 0x80000000 else -1.0
+
+    def word_features(self, word: str) -> List[Tuple[int, float]]:
+        """Signed buckets of a word: the word itself plus its n-grams sharing one unit of weight."""
+        features = self._memo.get(word)
+        if features is None:
+            weights = defaultdict(float)
+            bucket, sign = self._bucket(word)
+            weights[bucket] += sign
+            padded = f"<{word}>"
+            grams = [padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1))]
+            for gram in grams:
+                bucket, sign = self._bucket("#" + gram)
+                weights[bucket] += sign / len(grams)
+            features = list(weights.items())
+            if len(self._memo) >= self.max_memo:
+                self._memo.clear()
+            self._memo[word] = features
+        return features
+
+    def features(self, text: str) -> Dict[int, float]:
+        """Sublinear term-frequency weights per bucket."""
+        vector = defaultdict(float)
+        for word, count in Counter(t for t in tokenize(text) if t not in STOPWORDS).items():
+            tf = 1.0 + math.log(count)
+            for bucket, weight in self.word_features(word):
+                vector[bucket] += tf * weight
+        return vector
+
+
+def _passage_text(article: Dict[str, Any], span: Tuple[int, int]) -> str:
+    return (article.get("content") or "")[span[0]:span[1]]
+
+
+class PassageIndex:
+    """
+    Dense passage index: one L2-normalized embedding row per passage, plus
+    the IDF weights and projection needed to embed queries and new passages.
+    """
+
+    def __init__(self, hash_dim: int = HASH_DIM, embed_dim: int = EMBED_DIM):
+        np = _np()
+        self.hash_dim = hash_dim
+        self.embed_dim = embed_dim
+        self.idf = np.ones(hash_dim, dtype=np.float32)
+        self.projection = np.zeros((hash_dim, embed_dim), dtype=np.float32)
+        self.vectors = np.zeros((0, embed_dim), dtype=np.float32)
+        self.passage_doc = np.zeros(0, dtype=np.int32)
+        self.spans = np.zeros((0, 2), dtype=np.int32)
+        self.article_keys: List[str] = []
+        self.article_hashes: List[str] = []
+        self.source_hash: Optional[str] = None
+        self.generation: Optional[str] = None
+        self.journal_seq = 0
+        self._featurizer = _Featurizer(hash_dim)
+
+    @property
+    def num_passages(self) -> int:
+        return len(self.passage_doc)
+
+    @property
+    def num_articles(self) -> int:
+        return len(self.article_keys)
+
+    def _hashed_batch(self, texts: List[str]):
+        """TF-IDF weighted hashed vectors of some texts as a dense matrix."""
+        np = _np()
+        batch = np.zeros((len(texts), self.hash_dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._featurizer.features(text)
+            if features:
+                batch[row, list(features)] = list(features.values())
+        return batch * self.idf
+
+    def _embed(self, texts: List[str]):
+        """Project texts into the embedding space, normalized to unit length."""
+        np = _np()
+        vectors = self._hashed_batch(texts) @ self.projection
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _embed_articles(self, articles: Iterable[Tuple[int, Dict[str, Any]]]):
+        """Embed the passages of (doc_id, article) pairs in batches."""
+        np = _np()
+        vectors, docs, spans = [], [], []
+        texts = []
+
+        def flush():
+            if texts:
+                vectors.append(self._embed(texts))
+                texts.clear()
+
+        for doc_id, article in articles:
+            title = article.get("title") or ""
+            for span in split_passages(article.get("content")):
+                texts.append(f"{title}\n{_passage_text(article, span)}")
+                docs.append(doc_id)
+                spans.append(span)
+                if len(texts) >= BATCH_SIZE:
+                    flush()
+        flush()
+        return (
+            np.vstack(vectors) if vectors else np.zeros((0, self.embed_dim), dtype=np.float32),
+            np.asarray(docs, dtype=np.int32),
+            np.asarray(spans, dtype=np.int32).reshape(-1, 2)
+        )
+
+    @classmethod
+    def build(cls, articles, **kwargs) -> "PassageIndex":
+        """
+        Build an index over a corpus.
+
+        The corpus is read three times, one article at a time: to count
+        document frequencies, to fit the projection on a sample of passages
+        and to embed every passage.
+
+        Args:
+            articles: Sequence of article dicts (a list or a compiled corpus)
+            **kwargs: hash_dim / embed_dim passed to the constructor
+
+        Returns:
+            PassageIndex: The populated index; article positions are document ids
+        """
+        np = _np()
+        index = cls(**kwargs)
+
+        # Pass 1: document frequency of each bucket over all passages
+        df = np.zeros(index.hash_dim, dtype=np.float64)
+        num_passages = 0
+        for doc_id, article in enumerate(articles):
+            index.article_keys.append(article_key(article, doc_id))
+            index.article_hashes.append(article_hash(article))
+            title = article.get("title") or ""
+            for span in split_passages(article.get("content")):
+                features = index._featurizer.features(f"{title}\n{_passage_text(article, span)}")
+                df[list(features)] += 1
+                num_passages += 1
+        index.idf = (np.log((1 + num_passages) / (1 + df)) + 1).astype(np.float32)
+
+        # Pass 2: principal directions of the TF-IDF vectors of a passage sample
+        step = max(1, math.ceil(num_passages / FIT_SAMPLE))
+        covariance = np.zeros((index.hash_dim, index.hash_dim), dtype=np.float64)
+        texts, position = [], 0
+        for article in articles:
+            title = article.get("title") or ""
+            for span in split_passages(article.get("content")):
+                if position % step == 0:
+                    texts.append(f"{title}\n{_passage_text(article, span)}")
+                position += 1
+                if len(texts) >= BATCH_SIZE:
+                    batch = index._hashed_batch(texts)
+                    covariance += batch.T @ batch
+                    texts = []
+        if texts:
+            batch = index._hashed_batch(texts)
+            covariance += batch.T @ batch
+        _, eigenvectors = np.linalg.eigh(covariance)
+        index.projection = np.ascontiguousarray(eigenvectors[:, ::-1][:, :index.embed_dim], dtype=np.float32)
+
+        # Pass 3: embed every passage
+        index.vectors, index.passage_doc, index.spans = index._embed_articles(enumerate(articles))
+        return index
+
+    def update(self, articles) -> Tuple["PassageIndex", Dict[str, int]]:
+        """
+        Bring the index in line with a new version of the corpus.
+
+        Passages of unchanged articles (same URL and content hash) are kept;
+        only new and changed articles are embedded, with the existing IDF
+        weights and projection. If most of the corpus changed, the index is
+        rebuilt instead.
+
+        Returns:
+            tuple: (updated index, counts of kept / added / removed articles)
+        """
+        np = _np()
+        old_positions = {key: position for position, key in enumerate(self.article_keys)}
+        keys, hashes, changed = [], [], []
+        mapping = np.full(max(1, self.num_articles), -1, dtype=np.int64)
+        for doc_id, article in enumerate(articles):
+            key, digest = article_key(article, doc_id), article_hash(article)
+            keys.append(key)
+            hashes.append(digest)
+            old = old_positions.get(key)
+            if old is not None and self.article_hashes[old] == digest:
+                mapping[old] = doc_id
+            else:
+                changed.append(doc_id)
+
+        kept = int((mapping >= 0).sum())
+        stats = {"kept": kept, "added": len(changed), "removed": self.num_articles - kept}
+        if len(changed) > REFIT_FRACTION * max(1, len(keys)):
+            return PassageIndex.build(articles, hash_dim=self.hash_dim, embed_dim=self.embed_dim), stats
+
+        rows = mapping[self.passage_doc] >= 0 if self.num_passages else np.zeros(0, dtype=bool)
+        vectors, docs, spans = self._embed_articles((doc_id, articles[doc_id]) for doc_id in changed)
+        self.vectors = np.vstack([self.vectors[rows], vectors])
+        self.passage_doc = np.concatenate([mapping[self.passage_doc[rows]].astype(np.int32), docs])
+        self.spans = np.vstack([self.spans[rows], spans])
+        self.article_keys = keys
+        self.article_hashes = hashes
+        return self, stats
+
+    def apply_changes(self, articles, changes: Dict[int, Any]) -> Tuple["PassageIndex", Dict[str, int]]:
+        """
+        Patch the index for articles changed in a compiled corpus.
+
+        Passages of the changed doc ids are dropped and their current
+        versions embedded, with the existing IDF weights and projection.
+        If most of the corpus changed, the index is rebuilt instead.
+
+        Args:
+            articles: The compiled corpus in its current version
+            changes: Doc ids changed since the index was synced (see
+                CompiledCorpus.changes_since)
+
+        Returns:
+            tuple: (updated index, counts of kept / added / removed articles)
+        """
+        np = _np()
+        live = [doc_id for doc_id in sorted(changes) if articles[doc_id]]
+        stats = {
+            "kept": self.num_articles - sum(1 for doc_id in changes if doc_id < self.num_articles),
+            "added": len(live),
+            "removed": len(changes) - len(live),
+        }
+        if len(changes) > REFIT_FRACTION * max(1, len(articles)):
+            return PassageIndex.build(articles, hash_dim=self.hash_dim, embed_dim=self.embed_dim), stats
+
+        rows = ~np.isin(self.passage_doc, np.fromiter(changes, dtype=np.int64, count=len(changes)))
+        vectors, docs, spans = self._embed_articles((doc_id, articles[doc_id]) for doc_id in live)
+        self.vectors = np.vstack([self.vectors[rows], vectors])
+        self.passage_doc = np.concatenate([self.passage_doc[rows], docs])
+        self.spans = np.vstack([self.spans[rows], spans])
+        for doc_id in range(self.num_articles, len(articles)):
+            self.article_keys.append(f"#{doc_id}")
+            self.article_hashes.append("")
+        for doc_id in changes:
+            article = articles[doc_id]
+            self.article_keys[doc_id] = article_key(article, doc_id)
+            self.article_hashes[doc_id] = article_hash(article)
+        return self, stats
+
+    def search(self, query: str, top_k: int = 20) -> List[Tuple[int, float]]:
+        """
+        Rank passages by cosine similarity to a query.
+
+        Returns:
+            List of (passage id, score) tuples, best match first
+        """
+        np = _np()
+        if not self.num_passages or not query:
+            return []
+        scores = self.vectors @ self._embed([query])[0]
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(row), float(scores[row])) for row in best]
+
+    def passage(self, articles, passage_id: int) -> Tuple[int, str]:
+        """Document id and text of a passage."""
+        doc_id = int(self.passage_doc[passage_id])
+        start, end = self.spans[passage_id]
+        return doc_id, _passage_text(articles[doc_id], (int(start), int(end)))
+
+    def save(self, path: Path) -> None:
+        """Persist the index as an .npz archive."""
+        np = _np()
+        tmp_path = Path(str(path) + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=np.asarray(INDEX_VERSION),
+                source_hash=np.asarray(self.source_hash or ""),
+                generation=np.asarray(self.generation or ""),
+                journal_seq=np.asarray(self.journal_seq),
+                idf=self.idf,
+                projection=self.projection,
+                vectors=self.vectors,
+                passage_doc=self.passage_doc,
+                spans=self.spans,
+                article_keys=np.asarray(self.article_keys, dtype=str),
+                article_hashes=np.asarray(self.article_hashes, dtype=str)
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PassageIndex"]:
+        """Load a persisted index, returning None if it is missing or incompatible."""
+        np = _np()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != INDEX_VERSION:
+                    return None
+                projection = data["projection"]
+                index = cls(hash_dim=projection.shape[0], embed_dim=projection.shape[1])
+                index.projection = projection
+                index.idf = data["idf"]
+                index.vectors = data["vectors"]
+                index.passage_doc = data["passage_doc"]
+                index.spans = data["spans"]
+                index.article_keys = data["article_keys"].tolist()
+                index.article_hashes = data["article_hashes"].tolist()
+                index.source_hash = str(data["source_hash"]) or None
+                index.generation = str(data["generation"]) or None
+                index.journal_seq = int(data["journal_seq"])
+        except (OSError, KeyError, ValueError):
+            return None
+        return index
+
+    @staticmethod
+    def index_path_for(json_path: Path) -> Path:
+        """Location of the persisted index next to the corpus JSON."""
+        json_path = Path(json_path)
+        return json_path.with_name(json_path.stem + ".passages.npz")
+
+    @classmethod
+    def load_or_build(cls, json_path: Path, articles, debug: bool = False) -> "PassageIndex":
+        """
+        Load the index saved next to the corpus, updating it when the corpus changed.
+
+        Changes are taken from the compiled corpus' change journal when it
+        covers them, and found by comparing article hashes otherwise.
+
+        Args:
+            json_path: Path to the corpus JSON file
+            articles: Articles of that file (a list or a compiled corpus)
+            debug: Whether to print index maintenance messages
+
+        Returns:
+            PassageIndex: An index that matches the current corpus
+        """
+        index_path = cls.index_path_for(json_path)
+        source_hash = _file_fingerprint(json_path)
+        index = cls.load(index_path)
+        if index is not None and index.source_hash == source_hash and index.num_articles == len(articles):
+            if debug:
+                print(f"Loaded passage index from {index_path}")
+            return index
+
+        generation = getattr(articles, "generation", None)
+        changes = None
+        if index is not None and generation is not None and index.generation == generation:
+            changes = articles.changes_since(index.journal_seq)
+        if index is None:
+            index = cls.build(articles)
+            message = f"Built passage index over {index.num_passages} passages"
+        else:
+            if changes is not None:
+                index, stats = index.apply_changes(articles, changes)
+            else:
+                index, stats = index.update(articles)
+            message = (f"Updated passage index: {stats['kept']} articles kept, {stats['added']} embedded, "
+                       f"{stats['removed']} removed ({index.num_passages} passages)")
+        index.source_hash = source_hash
+        index.generation = generation
+        index.journal_seq = getattr(articles, "journal_seq", 0)
+        try:
+            index.save(index_path)
+            if debug:
+                print(f"{message}: {index_path}")
+        except OSError as e:
+            print(f"Could not save passage index to {index_path}: {e}")
+        return index
+
+
+def select_passages(
+    articles,
+    index: PassageIndex,
+    query: str,
+    top_k: int = 20,
+    token_budget: Optional[int] = None,
+    duplicates=None
+) -> List[Dict[str, Any]]:
+    """
+    Pick the most relevant passages for a query within a token budget.
+
+    Passages are grouped by article so each keeps the URL, title and date
+    needed for citations and hyperlinks.
+
+    Args:
+        articles: Corpus articles, positionally aligned with the index
+        index: Passage index over the articles
+        query: Query text, typically the user prompt
+        top_k: Maximum number of passages to return
+        token_budget: Optional cap on the estimated tokens of the selection
+        duplicates: Optional DuplicateIndex; passages of near-duplicate
+            articles are then grouped under one article (with
+            "duplicate_urls") and repeated paragraphs dropped
+
+    Returns:
+        List of article dicts with a "passages" list, ordered by their best passage
+    """
+    selected: Dict[int, Dict[str, Any]] = {}
+    seen_paragraphs: set = set()
+    used_tokens = 0
+    for passage_id, _ in index.search(query, top_k=top_k):
+        doc_id, text = index.passage(articles, passage_id)
+        if duplicates is not None:
+            start = int(index.spans[passage_id][0])
+            start_line = (articles[doc_id].get("content") or "").count("\n", 0, start)
+            text = duplicates.strip_repeated(doc_id, text, start_line, seen_paragraphs)
+            if not text.strip():
+                continue
+            doc_id = duplicates.representative(doc_id)
+        cost = estimate_tokens(text)
+        if token_budget is not None and selected and used_tokens + cost > token_budget:
+            continue
+        entry = selected.get(doc_id)
+        if entry is None:
+            article = articles[doc_id]
+            entry = {field: article.get(field) for field in ("url", "publication_date", "title")}
+            urls = duplicates.duplicate_urls(articles, doc_id) if duplicates is not None else []
+            if urls:
+                entry["duplicate_urls"] = urls
+            entry["passages"] = []
+            selected[doc_id] = entry
+            cost += estimate_tokens(entry["title"])
+        entry["passages"].append(text)
+        used_tokens += cost
+    return list(selected.values())
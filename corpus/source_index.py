@@ -0,0 +1,301 @@
+"""
+Source index of the press release corpus: the ways an article is cited.
+
+Press releases cite their sources by publication date ("Embuild Vlaanderen,
+20 feb 2025"), by title, or by a key phrase such as the name of a report
+("Bouwbalans"). The index maps each of those to the article's exact URL and
+publication date, so source mentions can be linked locally instead of having
+the model copy URLs.
+
+Key phrases are the labels in front of a colon in an article's title,
+subheading or meta description ("Werkbaar werk: bouw scoort beter ...") and
+quoted names in those fields.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from .bm25_index import _file_fingerprint
+from .fact_table import DATE, iter_quantities, keywords
+
+INDEX_VERSION = 1
+
+PHRASE_FIELDS = ("title", "subheading", "meta_description")
+
+# Labels that introduce an article rather than name its subject
+GENERIC_PHRASES = frozenset({
+    "reactie", "persreactie", "persbericht", "opinie", "interview", "update", "nieuws", "column",
+})
+
+_LABEL_PATTERN = re.compile(r"^\s*([^:]{3,40}?)\s*:")
+_QUOTED_PATTERN = re.compile(r"[‘'“\"]([^‘’'“”\"\n]{3,60})[’'”\"]")
+
+
+def url_key(url: Optional[str]) -> Optional[str]:
+    """
+    Normalized form of a URL: host without "www." and the path without
+    trailing slash; scheme, query and fragment are ignored.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase text with collapsed whitespace and no surrounding punctuation."""
+    return " ".join(text.lower().split()).strip(" .,;:!?'\"‘’“”")
+
+
+def parse_date(text: Optional[str]) -> Optional[int]:
+    """First date of a text as yyyymmdd ("20 feb 2025" is 20250220), or None."""
+    for quantity in iter_quantities(text):
+        if quantity["unit"] == DATE:
+            return int(quantity["value"])
+    return None
+
+
+def key_phrases(article: Dict[str, Any]) -> List[str]:
+    """Labels and quoted names of an article's title, subheading and meta description."""
+    phrases = []
+    for field in PHRASE_FIELDS:
+        text = article.get(field) or ""
+        candidates = _QUOTED_PATTERN.findall(text)
+        label = _LABEL_PATTERN.match(text)
+        if label:
+            candidates.append(label.group(1))
+        for candidate in candidates:
+            phrase = normalize_phrase(candidate)
+            if len(phrase) >= 4 and phrase not in GENERIC_PHRASES and phrase not in phrases:
+                phrases.append(phrase)
+    return phrases
+
+
+def extract_source(article: Dict[str, Any]) -> Dict[str, Any]:
+    """The citation data of an article."""
+    if not article or not article.get("url"):
+        return {"url": None, "publication_date": None, "date": None, "title": None,
+                "phrases": [], "keywords": []}
+    return {
+        "url": article.get("url"),
+        "publication_date": article.get("publication_date"),
+        "date": parse_date(article.get("publication_date")),
+        "title": article.get("title"),
+        "phrases": key_phrases(article),
+        "keywords": keywords(" ".join(article.get(field) or "" for field in ("title", "subheading"))),
+    }
+
+
+class SourceIndex:
+    """
+    Articles indexed by URL, publication date, title and key phrase.
+    """
+
+    def __init__(self):
+        self.sources: List[Dict[str, Any]] = []
+        self.source_hash: Optional[str] = None
+        self.generation: Optional[str] = None
+        self.journal_seq = 0
+        self._urls: Dict[str, int] = {}
+        self._dates: Dict[int, List[int]] = {}
+        self._names: Dict[str, List[int]] = {}
+        self._name_pattern = None
+        self.hosts = set()
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.sources)
+
+    def _reindex(self) -> None:
+        self._urls, self._dates, self._names, self.hosts = {}, {}, {}, set()
+        for doc_id, source in enumerate(self.sources):
+            key = url_key(source["url"])
+            if key is None:
+                continue
+            # A URL that occurs twice resolves to its last version, as in the compiled corpus
+            self._urls[key] = doc_id
+            self.hosts.add(key.split("/", 1)[0])
+            if source["date"]:
+                self._dates.setdefault(source["date"], []).append(doc_id)
+            names = source["phrases"] + ([normalize_phrase(source["title"])] if source["title"] else [])
+            for name in set(names):
+                if name:
+                    self._names.setdefault(name, []).append(doc_id)
+        self._name_pattern = None
+
+    @classmethod
+    def build(cls, articles: Iterable[Dict[str, Any]]) -> "SourceIndex":
+        """
+        Index every article, consuming them one at a time.
+
+        Args:
+            articles: Article dicts (a list, a compiled corpus or any iterable);
+                document ids are positions in the input
+        """
+        index = cls()
+        index.sources = [extract_source(article) for article in articles]
+        index._reindex()
+        return index
+
+    def apply_changes(self, articles, changes: Dict[int, Any]) -> None:
+        """
+        Re-index the articles changed in a compiled corpus.
+
+        Args:
+            articles: The compiled corpus in its current version
+            changes: Doc ids changed since the index was synced (see
+                CompiledCorpus.changes_since)
+        """
+        while self.num_docs < len(articles):
+            self.sources.append(extract_source({}))
+        for doc_id in changes:
+            self.sources[doc_id] = extract_source(articles[doc_id])
+        self._reindex()
+
+    def source(self, doc_id: int) -> Dict[str, Any]:
+        """URL, publication date and title of an article."""
+        source = self.sources[doc_id]
+        return {"doc_id": doc_id, "url": source["url"], "publication_date": source["publication_date"],
+                "title": source["title"]}
+
+    def find_url(self, url: Optional[str]) -> Optional[int]:
+        """Article with this URL (ignoring scheme, "www." and trailing slash), or None."""
+        key = url_key(url)
+        return self._urls.get(key) if key else None
+
+    def find_slug(self, url: Optional[str], min_length: int = 12) -> Optional[int]:
+        """
+        The only article whose URL slug starts with the slug of a URL (a
+        shortened or truncated corpus URL), or None.
+        """
+        key = url_key(url)
+        slug = key.rsplit("/", 1)[-1] if key else ""
+        if len(slug) < min_length:
+            return None
+        matches = {doc_id for other, doc_id in self._urls.items() if other.rsplit("/", 1)[-1].startswith(slug)}
+        return matches.pop() if len(matches) == 1 else None
+
+    def is_corpus_host(self, url: Optional[str]) -> bool:
+        """Whether a URL points to a site the corpus articles come from."""
+        key = url_key(url)
+        return bool(key) and key.split("/", 1)[0] in self.hosts
+
+    def find_date(self, date: Optional[int]) -> List[int]:
+        """Articles published on a date (yyyymmdd)."""
+        return list(self._dates.get(date, ())) if date else []
+
+    def find_name(self, name: str) -> List[int]:
+        """Articles with this title or key phrase."""
+        return list(self._names.get(normalize_phrase(name), ()))
+
+    @property
+    def name_pattern(self) -> Optional["re.Pattern"]:
+        """Regular expression matching any title or key phrase, longest first, as whole words."""
+        if self._name_pattern is None and self._names:
+            names = sorted(self._names, key=len, reverse=True)
+            alternation = "|".join(r"\s+".join(re.escape(word) for word in name.split()) for name in names)
+            self._name_pattern = re.compile(r"(?<!\w)(?:" + alternation + r")(?!\w)", re.IGNORECASE)
+        return self._name_pattern
+
+    def best_match(self, doc_ids: List[int], context: Optional[str]) -> Optional[int]:
+        """
+        The candidate whose title and subheading share the most keywords with
+        the context, or None if no single candidate is best.
+        """
+        doc_ids = sorted(set(doc_ids))
+        if len(doc_ids) <= 1:
+            return doc_ids[0] if doc_ids else None
+        words = set(keywords(context))
+        overlaps = sorted(
+            ((len(words.intersection(self.sources[doc_id]["keywords"])), doc_id) for doc_id in doc_ids),
+            reverse=True
+        )
+        if overlaps[0][0] == 0 or overlaps[0][0] == overlaps[1][0]:
+            return None
+        return overlaps[0][1]
+
+    def save(self, path: Path) -> None:
+        """Persist the index as JSON (the lookups are rebuilt on load)."""
+        payload = {
+            "version": INDEX_VERSION,
+            "source_hash": self.source_hash,
+            "generation": self.generation,
+            "journal_seq": self.journal_seq,
+            "sources": self.sources,
+        }
+        tmp_path = Path(str(path) + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SourceIndex"]:
+        """Load a persisted index, returning None if it is missing or incompatible."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if payload.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        index.source_hash = payload.get("source_hash")
+        index.generation = payload.get("generation")
+        index.journal_seq = payload.get("journal_seq", 0)
+        index.sources = payload["sources"]
+        index._reindex()
+        return index
+
+    @staticmethod
+    def index_path_for(json_path: Path) -> Path:
+        """Location of the persisted index next to the corpus JSON."""
+        json_path = Path(json_path)
+        return json_path.with_name(json_path.stem + ".sources.json")
+
+    @classmethod
+    def load_or_build(cls, json_path: Path, articles, debug: bool = False) -> "SourceIndex":
+        """
+        Load the index saved next to the corpus, updating it when the corpus changed.
+
+        If articles is a compiled corpus whose change journal covers the
+        changes since the index was saved, only the changed articles are
+        re-indexed; otherwise the index is rebuilt.
+
+        Args:
+            json_path: Path to the corpus JSON file
+            articles: Articles of that file (a list or a compiled corpus)
+            debug: Whether to print index maintenance messages
+        """
+        index_path = cls.index_path_for(json_path)
+        source_hash = _file_fingerprint(json_path)
+        index = cls.load(index_path)
+        if index is not None and index.source_hash == source_hash and index.num_docs == len(articles):
+            if debug:
+                print(f"Loaded source index from {index_path}")
+            return index
+
+        generation = getattr(articles, "generation", None)
+        changes = None
+        if index is not None and generation is not None and index.generation == generation:
+            changes = articles.changes_since(index.journal_seq)
+        if changes is not None:
+            index.apply_changes(articles, changes)
+            message = f"Updated source index: {len(changes)} articles re-indexed"
+        else:
+            index = cls.build(articles)
+            message = f"Built source index of {index.num_docs} articles"
+        index.source_hash = source_hash
+        index.generation = generation
+        index.journal_seq = getattr(articles, "journal_seq", 0)
+        try:
+            index.save(index_path)
+            if debug:
+                print(f"{message}: {index_path}")
+        except OSError as e:
+            print(f"Could not save source index to {index_path}: {e}")
+        return index
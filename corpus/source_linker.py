@@ -0,0 +1,199 @@
+"""
+Deterministic source links for the final press release.
+
+Source mentions in the text are resolved against the source index and
+linked to the exact corpus URL:
+
+    citations   a publication date cited as "Embuild Vlaanderen, 20 feb 2025"
+                or in parentheses; every citation is linked
+    names       an article title or key phrase; the first mention of each
+                article that is not linked yet is linked
+    links       existing links to a corpus site are pointed at the exact URL
+                of their article (found by URL, by a truncated URL slug or
+                by the date or name in the link text), or unwrapped
+
+A date or name shared by several articles is resolved by the keywords its
+sentence shares with their titles; if that does not single one out, the
+mention is left unlinked and reported. Links to other sites are kept.
+
+HTML output gets <a> elements, any other text Markdown links. Text inside
+the page head, scripts, styles and existing links is not touched.
+"""
+import html
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fact_table import _DATE_PATTERN
+from .source_index import SourceIndex, parse_date
+
+# Characters around a mention used to pick between candidate articles
+CONTEXT_CHARS = 200
+
+_HTML_PATTERN = re.compile(r"<(?:a|p|div|html|body|br|h[1-6]|span|strong|em|li|blockquote)\b", re.IGNORECASE)
+
+_TOKEN_PATTERN = re.compile(
+    r"(?P<skip><(?P<skip_tag>head|title|style|script)\b.*?</(?P=skip_tag)\s*>)"
+    r"|(?P<anchor><a\b[^>]*?\bhref\s*=\s*[\"'](?P<href>[^\"']*)[\"'][^>]*>(?P<anchor_text>.*?)</a\s*>)"
+    r"|(?P<md>\[(?P<md_text>[^\]\n]+)\]\((?P<md_href>[^)\s]+)\))"
+    r"|(?P<tag><[^>]+>)",
+    re.IGNORECASE | re.DOTALL
+)
+
+# "Embuild Vlaanderen, 20 feb 2025" (the date is matched separately)
+_CITED_BY_PATTERN = re.compile(r"Embuild\s+Vlaanderen\s*,?\s*(?:(?:van|op)\s+)?$", re.IGNORECASE)
+
+_TAG_TEXT_PATTERN = re.compile(r"<[^>]+>")
+
+
+def _citation_span(segment: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """
+    The span to link for a date at segment[start:end] if it cites a source:
+    the attribution and the date, or the contents of the parentheses around it.
+    """
+    cited_by = _CITED_BY_PATTERN.search(segment, max(0, start - 40), start)
+    if cited_by:
+        return cited_by.start(), end
+    opening = segment.rfind("(", max(0, start - 60), start)
+    if opening != -1 and ")" not in segment[opening:start]:
+        closing = segment.find(")", end, end + 60)
+        if closing != -1 and "(" not in segment[end:closing]:
+            inner_start = opening + 1
+            while inner_start < start and segment[inner_start].isspace():
+                inner_start += 1
+            return inner_start, closing
+    return None
+
+
+class _Linker:
+    """State of one linking pass: the output format and the articles linked so far."""
+
+    def __init__(self, index: SourceIndex, as_html: bool):
+        self.index = index
+        self.as_html = as_html
+        self.linked_docs = set()
+        self.report: Dict[str, List[Dict[str, Any]]] = {
+            "linked": [], "corrected": [], "unwrapped": [], "unresolved": [],
+        }
+
+    def link(self, text: str, doc_id: int) -> str:
+        url = self.index.sources[doc_id]["url"]
+        self.linked_docs.add(doc_id)
+        if self.as_html:
+            return f'<a href="{html.escape(url, quote=True)}">{text}</a>'
+        return f"[{text}]({url})"
+
+    def resolve(self, text: str, context: str) -> Optional[int]:
+        """The article a piece of text names: by its date, else by a title or key phrase."""
+        plain = html.unescape(_TAG_TEXT_PATTERN.sub("", text))
+        date = parse_date(plain)
+        if date:
+            return self.index.best_match(self.index.find_date(date), context)
+        pattern = self.index.name_pattern
+        match = pattern.search(plain) if pattern else None
+        if match:
+            return self.index.best_match(self.index.find_name(match.group(0)), context)
+        return None
+
+    def existing_link(self, token: str, href: str, text: str, context: str) -> str:
+        href = html.unescape(href)
+        if not self.index.is_corpus_host(href):
+            return token
+        doc_id = self.index.find_url(href)
+        if doc_id is None:
+            doc_id = self.index.find_slug(href)
+            if doc_id is None:
+                doc_id = self.resolve(text, context)
+            if doc_id is None:
+                self.report["unwrapped"].append({"text": text, "url": href})
+                return text
+            self.report["corrected"].append({"text": text, "url": href, **self.index.source(doc_id)})
+            return self.link(text, doc_id)
+        url = self.index.sources[doc_id]["url"]
+        self.linked_docs.add(doc_id)
+        if href == url:
+            return token
+        self.report["corrected"].append({"text": text, "url": href, **self.index.source(doc_id)})
+        return self.link(text, doc_id)
+
+    def mentions(self, segment: str, context_start: int, full_text: str) -> str:
+        """Link the citations and names in a run of text that contains no tags or links."""
+        spans = []
+        for match in _DATE_PATTERN.finditer(segment):
+            span = _citation_span(segment, match.start(), match.end())
+            if span is None or any(start < span[1] and span[0] < end for start, end, _, _ in spans):
+                # Several dates in one pair of parentheses: the first one is linked
+                continue
+            context = self._context(full_text, context_start + span[0])
+            candidates = self.index.find_date(parse_date(match.group(0)))
+            doc_id = self.index.best_match(candidates, context)
+            if doc_id is None:
+                self.report["unresolved"].append({"text": segment[span[0]:span[1]], "candidates": len(candidates)})
+                continue
+            spans.append((span[0], span[1], doc_id, "citation"))
+        pattern = self.index.name_pattern
+        if pattern is not None:
+            for match in pattern.finditer(segment):
+                if any(start < match.end() and match.start() < end for start, end, _, _ in spans):
+                    continue
+                candidates = self.index.find_name(match.group(0))
+                doc_id = self.index.best_match(candidates, self._context(full_text, context_start + match.start()))
+                if doc_id is None or doc_id in self.linked_docs or any(span[2] == doc_id for span in spans):
+                    continue
+                spans.append((match.start(), match.end(), doc_id, "name"))
+        if not spans:
+            return segment
+        parts, position = [], 0
+        for start, end, doc_id, kind in sorted(spans):
+            parts.append(segment[position:start])
+            parts.append(self.link(segment[start:end], doc_id))
+            self.report["linked"].append({"text": segment[start:end], "kind": kind, **self.index.source(doc_id)})
+            position = end
+        parts.append(segment[position:])
+        return "".join(parts)
+
+    @staticmethod
+    def _context(text: str, position: int) -> str:
+        return text[max(0, position - CONTEXT_CHARS):position + CONTEXT_CHARS]
+
+
+def link_sources(text: str, index: SourceIndex) -> Tuple[str, Dict[str, Any]]:
+    """
+    Link the source mentions of a press release to their corpus articles.
+
+    Args:
+        text: Final output (HTML, Markdown or plain text)
+        index: Source index of the corpus
+
+    Returns:
+        tuple: (linked text, report with the linked, corrected, unwrapped and
+            unresolved mentions, their counts and elapsed_ms)
+    """
+    start_time = time.perf_counter()
+    linker = _Linker(index, as_html=bool(_HTML_PATTERN.search(text or "")))
+    parts: List[str] = []
+    if text:
+        # Articles linked anywhere in the text are not linked again by name
+        for match in _TOKEN_PATTERN.finditer(text):
+            doc_id = index.find_url(match.group("href") or match.group("md_href"))
+            if doc_id is not None:
+                linker.linked_docs.add(doc_id)
+        position = 0
+        for match in _TOKEN_PATTERN.finditer(text):
+            parts.append(linker.mentions(text[position:match.start()], position, text))
+            if match.group("anchor"):
+                context = linker._context(text, match.start())
+                parts.append(linker.existing_link(match.group(0), match.group("href"),
+                                                  match.group("anchor_text"), context))
+            elif match.group("md"):
+                context = linker._context(text, match.start())
+                parts.append(linker.existing_link(match.group(0), match.group("md_href"),
+                                                  match.group("md_text"), context))
+            else:
+                parts.append(match.group(0))
+            position = match.end()
+        parts.append(linker.mentions(text[position:], position, text))
+    report = dict(linker.report)
+    report["counts"] = {key: len(value) for key, value in linker.report.items()}
+    report["elapsed_ms"] = (time.perf_counter() - start_time) * 1000
+    return "".join(parts), report
@@ -0,0 +1,158 @@
+"""
+Streaming reader for the corpus JSON.
+
+emv_pers.json is a top-level array of article objects. iter_articles parses
+it incrementally, one article at a time, so ingesting a corpus of any size
+only ever holds one read chunk and one article in memory.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+
+
+class _ArrayReader:
+    """Sliding text window over a file, with the position of the next unread character."""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_size: int = 1) -> bool:
+        """Read until at least min_size characters are unread; False at end of file."""
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        while len(self.buffer) < min_size and not self.eof:
+            chunk = self.f.read(max(self.chunk_size, min_size - len(self.buffer)))
+            if not chunk:
+                self.eof = True
+            self.buffer += chunk
+        return len(self.buffer) >= min_size
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character without consuming it ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+
+def iter_articles(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the articles of a corpus JSON file one by one.
+
+    Args:
+        path: Corpus JSON file, a top-level array of article objects. The
+            older {"articles": [...]} layout is also accepted, but is loaded
+            in one piece.
+        chunk_size: Characters read from the file at a time
+
+    Yields:
+        dict: One article per array element, in file order
+
+    Raises:
+        ValueError: If the file is not valid JSON of one of those shapes
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _ArrayReader(f, chunk_size)
+        first = reader.next_char()
+        if first == "{":
+            f.seek(0)
+            data = json.load(f)
+            yield from data.get("articles", [])
+            return
+        if first != "[":
+            raise ValueError(f"{path} does not contain a JSON array")
+        reader.pos += 1
+
+        expect_value = True
+        while True:
+            char = reader.next_char()
+            if char == "]":
+                return
+            if char == "":
+                raise ValueError(f"{path} ends inside the article array")
+            if not expect_value:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in {path}, found {char!r}")
+                reader.pos += 1
+                expect_value = True
+                continue
+
+            # Decode the next element, reading more of the file while it is incomplete
+            while True:
+                try:
+                    article, end = decoder.raw_decode(reader.buffer, reader.pos)
+                    break
+                except json.JSONDecodeError as e:
+                    if reader.eof:
+                        raise ValueError(f"Invalid article in {path}: {e}") from e
+                    reader.fill(2 * (len(reader.buffer) - reader.pos) + chunk_size)
+            reader.pos = end
+            expect_value = False
+            yield article
+
+
+def rewrite_articles(path: Path, upserts: Iterable[Dict[str, Any]] = (), removals: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Add, replace and remove articles of a corpus JSON file by URL, streaming it.
+
+    An article whose URL matches one in upserts is replaced in place (later
+    duplicates of that URL are dropped); the remaining upserts are appended.
+    Articles whose URL is in removals are dropped. The file is rewritten as
+    a top-level array through a temporary file.
+
+    Returns:
+        dict: Counts of added, updated and removed articles
+    """
+    path = Path(path)
+    pending = {article["url"]: article for article in upserts}
+    removals = set(removals)
+    newline = "\r\n" if b"\r\n" in path.read_bytes()[:4096] else "\n"
+    stats = {"added": 0, "updated": 0, "removed": 0}
+    replaced = set()
+
+    def encode(article):
+        return json.dumps(article, ensure_ascii=False, indent=4).replace("\n", newline)
+
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write("[" + newline)
+        first = True
+
+        def write(article):
+            nonlocal first
+            if not first:
+                f.write("," + newline)
+            f.write(encode(article))
+            first = False
+
+        for article in iter_articles(path):
+            url = article.get("url")
+            if url in removals:
+                stats["removed"] += 1
+                continue
+            if url in replaced:
+                continue
+            if url in pending:
+                article = pending.pop(url)
+                replaced.add(url)
+                stats["updated"] += 1
+            write(article)
+        for article in pending.values():
+            write(article)
+            stats["added"] += 1
+        f.write(newline + "]")
+    tmp_path.replace(path)
+    return stats
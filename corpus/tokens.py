@@ -0,0 +1,32 @@
+"""
+Token estimation helpers for prompt budgeting.
+"""
+import re
+
+# Gemini tokenizes Dutch prose at roughly four characters per token; this is
+# only used for budgeting, so an estimate is sufficient.
+CHARS_PER_TOKEN = 4
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def estimate_tokens(text) -> int:
+    """
+    Estimate the number of LLM tokens in a piece of text.
+    
+    Args:
+        text: Text to measure (None counts as empty)
+        
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def tokenize(text) -> list:
+    """Lowercase and split text into word tokens for lexical matching."""
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
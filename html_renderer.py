@@ -0,0 +1,368 @@
+"""
+Local HTML rendering of the final press release.
+
+Converting the final text into HTML is mechanical, so it does not need a
+model round-trip. The quality assessment output is reduced to the final
+release, parsed into its structure (headline, subheading, paragraphs,
+quotes, lists, section headings and links) and rendered through a page
+template. The result is deterministic and takes milliseconds.
+
+The LLM HTML formatter remains available, either selected per run or as a
+fallback when no final release can be found in the text.
+"""
+import html
+import re
+import time
+from pathlib import Path
+from string import Template
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Renderer choices: the local renderer, the LLM formatter, or the local
+# renderer falling back to the LLM formatter
+RENDERERS = ("local", "llm", "auto")
+
+# Part of the stage key of HTMLRenderStage: bump it whenever a change to this
+# module alters the rendered HTML, so stored pages are rendered again
+RENDERER_VERSION = 1
+
+# Line the quality assessment is asked to put before the final release
+FINAL_RELEASE_MARKER = "FINAL PRESS RELEASE:"
+
+# Headings that introduce the final version when the marker is missing
+_FINAL_HEADING_PATTERN = re.compile(
+    r"^[#*\s]*(?:(?:selected|final|optimal|combined|best)\s+(?:\w+\s+)?(?:version|press release)"
+    r"|(?:definitieve|finale|optimale|gecombineerde|beste)\s+(?:\w+\s+)?(?:versie|persbericht))\b[^\n]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+_FENCE_PATTERN = re.compile(r"^\s*```")
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_BOLD_LINE_PATTERN = re.compile(r"^\*\*([^*]{1,100})\*\*:?$")
+_LIST_PATTERN = re.compile(r"^(?:([-*•])|(\d+)[.)])\s+(.*)$")
+_END_PATTERN = re.compile(r"^(?:#{3}|-30-)$")
+_RULE_PATTERN = re.compile(r"^(?:\*{3,}|-{3,}|_{3,})$")
+_QUOTE_CHARS = "\"“”„‘’'«"
+
+# Inline links: HTML anchors, Markdown links and bare URLs
+_LINK_PATTERN = re.compile(
+    r"<a\s[^>]*?href=['\"](?P<a_href>[^'\"]+)['\"][^>]*>(?P<a_text>.*?)</a\s*>"
+    r"|\[(?P<md_text>[^\]\n]+)\]\((?P<md_href>[^)\s]+)\)"
+    r"|(?P<url>https?://[^\s<>()\"]+[^\s<>()\".,;:!?])",
+    re.IGNORECASE | re.DOTALL
+)
+_BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_ITALIC_PATTERN = re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<![\w_])_(?!\s)(.+?)(?<!\s)_(?![\w_])")
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_SAFE_HREF_PATTERN = re.compile(r"^(?:https?://|mailto:)", re.IGNORECASE)
+
+DEFAULT_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="$lang">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title</title>
+<meta name="description" content="$description">
+<meta property="og:title" content="$title">
+<meta property="og:description" content="$description">
+<meta property="og:type" content="article">
+<style>
+  :root { --text: #1d1d1b; --muted: #5a5a57; --accent: #e30613; --rule: #e4e4e0; }
+  * { box-sizing: border-box; }
+  body { margin: 0; color: var(--text); background: #fff;
+         font: 1.0625rem/1.65 Georgia, "Times New Roman", serif; }
+  main { max-width: 46rem; margin: 0 auto; padding: 2.5rem 1.25rem 4rem; }
+  header { border-bottom: 1px solid var(--rule); margin-bottom: 2rem; padding-bottom: 1.25rem; }
+  .label { color: var(--accent); font: 600 0.8125rem/1 Arial, Helvetica, sans-serif;
+           letter-spacing: 0.08em; text-transform: uppercase; }
+  h1, h2, h3 { font-family: Arial, Helvetica, sans-serif; line-height: 1.25; }
+  h1 { font-size: clamp(1.75rem, 4vw, 2.5rem); margin: 0.75rem 0 0.5rem; }
+  .subheading { color: var(--muted); font-size: 1.25rem; margin: 0; }
+  h2 { font-size: 1.3rem; margin: 2.25rem 0 0.75rem; }
+  h3 { font-size: 1.1rem; margin: 1.75rem 0 0.5rem; }
+  blockquote { border-left: 4px solid var(--accent); margin: 1.75rem 0; padding: 0.25rem 0 0.25rem 1.25rem;
+               font-style: italic; }
+  a { color: var(--accent); text-underline-offset: 0.15em; }
+  a:focus, a:hover { text-decoration-thickness: 2px; }
+  .end { color: var(--muted); text-align: center; margin-top: 2.5rem; }
+  @media (max-width: 480px) { body { font-size: 1rem; } main { padding-top: 1.5rem; } }
+  @media print { a { color: inherit; } main { max-width: none; } }
+</style>
+</head>
+<body>
+<main>
+<article>
+<header>
+<p class="label">$label</p>
+<h1>$headline</h1>
+$subheading
+</header>
+$body
+</article>
+</main>
+</body>
+</html>
+""")
+
+
+def extract_final_release(text: str) -> Tuple[str, bool]:
+    """
+    The final press release within the quality assessment output.
+
+    Returns:
+        tuple: (text, found) where found tells whether the final release
+        was located (after FINAL_RELEASE_MARKER, or else after the last
+        "final version" heading); otherwise text is the whole input
+    """
+    text = text or ""
+    marker = text.rfind(FINAL_RELEASE_MARKER)
+    if marker >= 0:
+        return text[marker + len(FINAL_RELEASE_MARKER):].strip(), True
+    headings = list(_FINAL_HEADING_PATTERN.finditer(text))
+    if headings:
+        release = text[headings[-1].end():].strip()
+        if release:
+            return release, True
+    return text.strip(), False
+
+
+def _strip_emphasis(text: str) -> str:
+    return _ITALIC_PATTERN.sub(lambda m: m.group(1) or m.group(2), _BOLD_PATTERN.sub(lambda m: m.group(1) or m.group(2), text))
+
+
+def parse_release(text: str) -> Dict[str, Any]:
+    """
+    Structure of a press release written in Markdown or plain text.
+
+    Returns:
+        dict: headline, subheading (or None) and blocks, a list of dicts with
+        a type ("paragraph", "quote", "heading", "list", "rule", "end") and their text
+        ("text", "level" for headings, "items" and "ordered" for lists)
+    """
+    blocks: List[Dict[str, Any]] = []
+    paragraph: List[str] = []
+    quote: List[str] = []
+    # Whether the previous line was a list item (lists end at any other line)
+    in_list = False
+
+    def flush():
+        if paragraph:
+            joined = " ".join(paragraph)
+            kind = "quote" if joined[0] in _QUOTE_CHARS else "paragraph"
+            blocks.append({"type": kind, "text": joined})
+            paragraph.clear()
+        if quote:
+            blocks.append({"type": "quote", "text": " ".join(quote)})
+            quote.clear()
+
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        item = _LIST_PATTERN.match(stripped)
+        if item:
+            flush()
+            ordered = item.group(2) is not None
+            if in_list and blocks[-1]["ordered"] == ordered:
+                blocks[-1]["items"].append(item.group(3))
+            else:
+                blocks.append({"type": "list", "ordered": ordered, "items": [item.group(3)]})
+            in_list = True
+            continue
+        in_list = False
+        if not stripped or _FENCE_PATTERN.match(stripped):
+            flush()
+            continue
+        heading = _HEADING_PATTERN.match(stripped)
+        bold_line = _BOLD_LINE_PATTERN.match(stripped)
+        if heading:
+            flush()
+            blocks.append({"type": "heading", "level": len(heading.group(1)), "text": heading.group(2)})
+        elif bold_line and not stripped.rstrip("*:").endswith("."):
+            flush()
+            blocks.append({"type": "heading", "level": 3, "text": bold_line.group(1)})
+        elif _END_PATTERN.match(stripped):
+            flush()
+            blocks.append({"type": "end", "text": stripped})
+        elif _RULE_PATTERN.match(stripped):
+            flush()
+            blocks.append({"type": "rule"})
+        elif stripped.startswith(">"):
+            if paragraph:
+                flush()
+            quote.append(stripped.lstrip(">").strip())
+        else:
+            if quote:
+                flush()
+            paragraph.append(stripped)
+    flush()
+
+    headline = subheading = None
+    if blocks and (blocks[0]["type"] == "heading" or
+                   (blocks[0]["type"] == "paragraph" and len(blocks[0]["text"]) <= 150)):
+        headline = _strip_emphasis(blocks.pop(0)["text"])
+        if blocks and blocks[0]["type"] == "heading" and blocks[0]["level"] >= 2:
+            subheading = _strip_emphasis(blocks.pop(0)["text"])
+        elif blocks and blocks[0]["type"] == "paragraph" and len(blocks[0]["text"]) <= 200 \
+                and _ITALIC_PATTERN.fullmatch(blocks[0]["text"]):
+            subheading = _strip_emphasis(blocks.pop(0)["text"])
+    return {"headline": headline, "subheading": subheading, "blocks": blocks}
+
+
+def _emphasis(escaped: str) -> str:
+    escaped = _BOLD_PATTERN.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", escaped)
+    return _ITALIC_PATTERN.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", escaped)
+
+
+def render_inline(text: str) -> str:
+    """Escape a line of text, keeping its links and Markdown emphasis."""
+    parts = []
+    position = 0
+    for match in _LINK_PATTERN.finditer(text):
+        parts.append(_emphasis(html.escape(text[position:match.start()], quote=False)))
+        if match.group("url"):
+            href = label = match.group("url")
+        elif match.group("a_href"):
+            href, label = html.unescape(match.group("a_href")), _TAG_PATTERN.sub("", match.group("a_text"))
+        else:
+            href, label = match.group("md_href"), match.group("md_text")
+        label_html = _emphasis(html.escape(html.unescape(label).strip(), quote=False))
+        if _SAFE_HREF_PATTERN.match(href):
+            parts.append(f'<a href="{html.escape(href)}">{label_html}</a>')
+        else:
+            parts.append(label_html)
+        position = match.end()
+    parts.append(_emphasis(html.escape(text[position:], quote=False)))
+    return "".join(parts)
+
+
+def _render_block(block: Dict[str, Any]) -> str:
+    kind = block["type"]
+    if kind == "heading":
+        level = min(max(block["level"], 2), 3)
+        return f"<h{level}>{render_inline(block['text'])}</h{level}>"
+    if kind == "quote":
+        return f"<blockquote><p>{render_inline(block['text'])}</p></blockquote>"
+    if kind == "list":
+        tag = "ol" if block["ordered"] else "ul"
+        items = "".join(f"<li>{render_inline(item)}</li>" for item in block["items"])
+        return f"<{tag}>{items}</{tag}>"
+    if kind == "rule":
+        return "<hr>"
+    if kind == "end":
+        return f'<p class="end">{html.escape(block["text"], quote=False)}</p>'
+    return f"<p>{render_inline(block['text'])}</p>"
+
+
+def _plain(text: str) -> str:
+    return re.sub(r"\s+", " ", _strip_emphasis(_TAG_PATTERN.sub("", _LINK_PATTERN.sub(
+        lambda m: m.group("a_text") or m.group("md_text") or m.group("url") or "", text)))).strip()
+
+
+def render_html(release: Dict[str, Any], template: Optional[Template] = None,
+                label: str = "Persbericht", lang: str = "nl") -> str:
+    """
+    Render a parsed release (see parse_release) as a complete HTML page.
+
+    Args:
+        release: Parsed release
+        template: string.Template with the placeholders $lang, $title,
+            $description, $label, $headline, $subheading and $body
+            (defaults to DEFAULT_TEMPLATE)
+        label: Kicker shown above the headline
+        lang: Language of the document
+    """
+    headline = release.get("headline") or label
+    first_paragraph = next((block["text"] for block in release["blocks"] if block["type"] == "paragraph"), "")
+    description = _plain(first_paragraph)
+    if len(description) > 160:
+        description = description[:157].rsplit(" ", 1)[0] + "..."
+    subheading = release.get("subheading")
+    return (template or DEFAULT_TEMPLATE).safe_substitute(
+        lang=html.escape(lang),
+        title=html.escape(_plain(headline)),
+        description=html.escape(description),
+        label=html.escape(label),
+        headline=render_inline(headline),
+        subheading=f'<p class="subheading">{render_inline(subheading)}</p>' if subheading else "",
+        body="\n".join(_render_block(block) for block in release["blocks"])
+    )
+
+
+def load_template(path: Path) -> Optional[Template]:
+    """Page template from a file, or None if it does not exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return Template(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def render_release(text: str, template: Optional[Template] = None, require_final: bool = False) -> Optional[str]:
+    """
+    Render the final press release of a quality assessment output as HTML.
+
+    Args:
+        text: Quality assessment output (or the release itself)
+        template: Page template (defaults to DEFAULT_TEMPLATE)
+        require_final: Return None instead of rendering the whole text when
+            no final release can be located in it
+
+    Returns:
+        str: The HTML page, or None if there is nothing to render
+    """
+    release_text, found = extract_final_release(text)
+    if require_final and not found:
+        return None
+    release = parse_release(release_text)
+    if not any(block["type"] in ("paragraph", "quote") for block in release["blocks"]):
+        return None
+    return render_html(release, template)
+
+
+class _LocalRenderer:
+    """Stands in for the HTML formatter agent of a locally rendered stage."""
+
+    role = "Local HTML Renderer"
+
+
+class HTMLRenderStage:
+    """
+    Workflow stage that renders the quality assessment output locally.
+
+    It takes the place of the HTML formatting task in the task graph: it has
+    the attributes the DAG executor and stage store read (description,
+    expected_output, context, agent) and an execute_sync that returns the HTML.
+    """
+
+    agent = _LocalRenderer()
+
+    def __init__(self, quality_assessment: Any, template: Optional[Template] = None,
+                 fallback: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            quality_assessment: Quality assessment task (the stage's only upstream)
+            template: Page template (defaults to DEFAULT_TEMPLATE)
+            fallback: Called with the context when no final release can be
+                rendered; typically runs the LLM HTML formatter. Without a
+                fallback the whole text is rendered.
+        """
+        self.context = [quality_assessment]
+        self.template = template
+        self.fallback = fallback
+        self.used_fallback = False
+        self.description = (
+            f"Render the final press release locally as HTML (renderer version {RENDERER_VERSION}"
+            f"{', LLM fallback' if fallback is not None else ''}).\n"
+            + (template.template if template is not None else DEFAULT_TEMPLATE.template)
+        )
+        self.expected_output = "Complete HTML page of the final press release."
+
+    def execute_sync(self, agent: Any = None, context: str = "") -> str:
+        start = time.perf_counter()
+        output = render_release(context, self.template, require_final=self.fallback is not None)
+        if output is None and self.fallback is not None:
+            print("No final press release found for local rendering; using the HTML formatter agent")
+            self.used_fallback = True
+            return self.fallback(context)
+        if output is None:
+            output = render_html({"headline": None, "subheading": None,
+                                  "blocks": [{"type": "paragraph", "text": context.strip()}]}, self.template)
+        print(f"Rendered the press release locally in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return output
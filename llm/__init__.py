@@ -0,0 +1,18 @@
+"""
+Package initialization for llm module.
+"""
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter, configure_rate_limiter, shared_rate_limiter
+from .transport import GeminiTransport, TransportError
+from .client_pool import LLMClientPool, shared_client_pool
+
+__all__ = [
+    'ResponseCache',
+    'RateLimiter',
+    'configure_rate_limiter',
+    'shared_rate_limiter',
+    'GeminiTransport',
+    'TransportError',
+    'LLMClientPool',
+    'shared_client_pool'
+]
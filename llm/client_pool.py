@@ -0,0 +1,78 @@
+"""
+Process-wide pool of chat model clients shared by all agents.
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+def _copy_model(model: Any, update: Dict[str, Any]) -> Any:
+    """Shallow-copy a LangChain model with some fields replaced (pydantic v2 or v1)."""
+    if hasattr(model, "model_copy"):
+        return model.model_copy(update=update)
+    return model.copy(update=update)
+
+
+class LLMClientPool:
+    """
+    Keeps one ChatGoogleGenerativeAI per (model, API key) and hands out
+    shallow copies of it with per-agent generation parameters, cache,
+    callbacks and rate limiter. The copies share the underlying API client
+    and its connections, so creating an agent no longer creates a client.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self.clients_created = 0
+        self.models_handed_out = 0
+
+    def _base_client(self, api_key: str, model: str) -> Any:
+        key = (model, api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # Imported here so that importing the pool does not load LangChain
+                from langchain_google_genai import ChatGoogleGenerativeAI
+
+                client = ChatGoogleGenerativeAI(google_api_key=api_key, model=model)
+                self._clients[key] = client
+                self.clients_created += 1
+            self.models_handed_out += 1
+            return client
+
+    def get(self, api_key: str, params: Dict[str, Any], **options: Any) -> Any:
+        """
+        Return a chat model for one agent.
+
+        Args:
+            api_key: Google AI API key
+            params: Generation parameters (model, temperature, top_p, top_k, max_output_tokens)
+            **options: Other per-agent model fields, e.g. cache, callbacks, rate_limiter
+
+        Returns:
+            A ChatGoogleGenerativeAI sharing its API client with the pool
+        """
+        base = self._base_client(api_key, params["model"])
+        update = {name: value for name, value in params.items() if name != "model"}
+        update.update(options)
+        return _copy_model(base, update)
+
+    def stats(self) -> Dict[str, int]:
+        return {"clients": self.clients_created, "models": self.models_handed_out}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+
+_shared_pool: Optional[LLMClientPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_client_pool() -> LLMClientPool:
+    """Return the process-wide client pool, creating it on first use."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = LLMClientPool()
+        return _shared_pool
@@ -0,0 +1,66 @@
+"""
+LangChain cache adapter that stores chat model generations in a ResponseCache.
+"""
+import json
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from .response_cache import ResponseCache
+
+# Outcome of the last cache lookup on each thread, read by the trace and rate limit callbacks
+_last_lookup = threading.local()
+
+
+def consume_cache_hit() -> bool:
+    """Return whether the last lookup on this thread was a hit, and reset it."""
+    hit = getattr(_last_lookup, "hit", False)
+    _last_lookup.hit = False
+    return hit
+
+
+def last_lookup_was_hit() -> bool:
+    """Return whether the last lookup on this thread was a hit, without resetting it."""
+    return getattr(_last_lookup, "hit", False)
+
+
+class LangChainResponseCache(BaseCache):
+    """
+    Per-LLM cache adapter. Each instance is bound to the generation
+    parameters of one model configuration, so keys are derived from those
+    parameters plus the serialized message list LangChain passes as the prompt.
+    """
+
+    def __init__(self, cache: ResponseCache, params: Dict[str, Any]):
+        """
+        Args:
+            cache: Shared on-disk response cache
+            params: model, temperature, top_p, top_k and max_output_tokens of the LLM
+        """
+        self.cache = cache
+        self.params = params
+
+    def _key(self, prompt: str) -> str:
+        return ResponseCache.make_key(
+            self.params["model"],
+            self.params["temperature"],
+            self.params.get("top_p"),
+            self.params.get("top_k"),
+            self.params.get("max_output_tokens"),
+            prompt
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        value = self.cache.get(self._key(prompt))
+        _last_lookup.hit = value is not None
+        if value is None:
+            return None
+        return [loads(generation) for generation in json.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        self.cache.set(self._key(prompt), json.dumps([dumps(generation) for generation in return_val]))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear()
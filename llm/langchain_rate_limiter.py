@@ -0,0 +1,47 @@
+"""
+LangChain adapters that route chat model calls through the shared RateLimiter.
+"""
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from .langchain_cache import last_lookup_was_hit
+from .rate_limiter import RateLimiter
+from .trace_callback import _usage_from_result
+
+
+class LangChainRateLimiter(BaseRateLimiter):
+    """
+    Request-slot adapter for BaseChatModel(rate_limiter=...). LangChain calls
+    it after the cache lookup, so cached responses do not use quota.
+    """
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        self.limiter.acquire()
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return self.acquire(blocking=blocking)
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """
+    Charges the tokens a call actually used to the shared limiter. LangChain
+    does not pass the prompt to the rate limiter, so tokens are accounted
+    after the call; the next calls wait while the token bucket is in debt.
+    """
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        if last_lookup_was_hit():
+            return
+        usage = _usage_from_result(response)
+        if usage:
+            self.limiter.consume(usage["prompt"] + usage["completion"])
@@ -0,0 +1,130 @@
+"""
+Process-wide token-bucket rate limiter for requests/minute and tokens/minute.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Two token buckets, one for requests and one for LLM tokens, each refilled
+    continuously at its per-minute rate and holding at most one minute of quota.
+
+    Callers reserve a request slot (and an estimate of the tokens the call
+    will use) with acquire() before sending, then settle the estimate with
+    the real usage once the response is in. The token bucket may go into
+    debt; further calls then wait until it has refilled.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Args:
+            requests_per_minute: Request quota (None for unlimited)
+            tokens_per_minute: Prompt + completion token quota (None for unlimited)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until a request reserving `tokens` fits in both buckets (0 if it fits now)."""
+        wait = 0.0
+        if self.requests_per_minute and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            # A reservation larger than the whole bucket only needs a full bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                wait = max(wait, (needed - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until one request and `tokens` tokens are available, then take them.
+
+        Args:
+            tokens: Estimated tokens the request will use
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._requests -= 1
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    self.waited += waited
+                    return waited
+            time.sleep(wait)
+            waited += wait
+
+    def settle(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """Correct a reservation made by acquire() with the tokens the call actually used."""
+        self.consume(actual_tokens - reserved_tokens)
+
+    def consume(self, tokens: int) -> None:
+        """Take tokens without waiting (negative values give tokens back)."""
+        if not self.tokens_per_minute or not tokens:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.tokens_per_minute, self._tokens - tokens)
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def configure_rate_limiter(
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None
+) -> Optional[RateLimiter]:
+    """
+    Set the quota of the process-wide limiter shared by the legacy path and
+    all agents. Reconfiguring keeps the existing instance so components that
+    already hold it see the new quota.
+
+    Returns:
+        RateLimiter: The shared limiter, or None if neither quota is set
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if not requests_per_minute and not tokens_per_minute:
+            return _shared_limiter
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        else:
+            with _shared_limiter._lock:
+                _shared_limiter._refill()
+                # A quota that was unlimited so far starts with a full bucket
+                if not _shared_limiter.requests_per_minute:
+                    _shared_limiter._requests = float(requests_per_minute or 0)
+                if not _shared_limiter.tokens_per_minute:
+                    _shared_limiter._tokens = float(tokens_per_minute or 0)
+                _shared_limiter.requests_per_minute = requests_per_minute
+                _shared_limiter.tokens_per_minute = tokens_per_minute
+        return _shared_limiter
+
+
+def shared_rate_limiter() -> Optional[RateLimiter]:
+    """Return the process-wide limiter, if one has been configured."""
+    return _shared_limiter
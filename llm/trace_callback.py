@@ -0,0 +1,106 @@
+"""
+LangChain callback handler that records LLM calls in a RunTrace.
+"""
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from corpus.tokens import estimate_tokens
+from pipeline.tracing import current_trace
+from .langchain_cache import consume_cache_hit
+
+
+def _usage_from_result(response: Any) -> Optional[Dict[str, int]]:
+    """Extract prompt/completion token counts reported by the API, if any."""
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {"prompt": usage.get("input_tokens", 0), "completion": usage.get("output_tokens", 0)}
+    llm_output = getattr(response, "llm_output", None) or {}
+    usage = llm_output.get("usage_metadata") or llm_output.get("token_usage")
+    if usage:
+        return {
+            "prompt": usage.get("prompt_token_count", usage.get("prompt_tokens", 0)),
+            "completion": usage.get("candidates_token_count", usage.get("completion_tokens", 0)),
+        }
+    return None
+
+
+def _response_text(response: Any) -> str:
+    return "".join(
+        getattr(generation, "text", "") or ""
+        for generations in getattr(response, "generations", None) or []
+        for generation in generations
+    )
+
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """Records start/end, token usage, retries and cache hits of every LLM call."""
+
+    def __init__(self, trace: Any, agent_role: str, model: Optional[str] = None):
+        """
+        Args:
+            trace: RunTrace receiving the call records, or None to record into
+                the trace active on the calling thread (for LLMs shared between runs)
+            agent_role: Fallback owner of the calls when no stage is running
+            model: Model name recorded with each call
+        """
+        self.trace = trace
+        self.agent_role = agent_role
+        self.model = model
+        self._calls: Dict[UUID, Dict[str, Any]] = {}
+
+    def _trace(self) -> Any:
+        return self.trace if self.trace is not None else current_trace()
+
+    def _start(self, run_id: UUID, prompt_text: str) -> None:
+        self._calls[run_id] = {"start": time.time(), "prompt_estimate": estimate_tokens(prompt_text), "retries": 0}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "".join(str(m.content) for batch in messages for m in batch))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "".join(prompts))
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id in self._calls:
+            self._calls[run_id]["retries"] += 1
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        call = self._calls.pop(run_id, None) or {"start": time.time(), "prompt_estimate": 0, "retries": 0}
+        trace = self._trace()
+        if trace is None:
+            consume_cache_hit()
+            return
+        usage = _usage_from_result(response)
+        trace.record_llm_call(
+            agent_role=self.agent_role,
+            start=call["start"],
+            end=time.time(),
+            prompt_tokens=usage["prompt"] if usage else call["prompt_estimate"],
+            completion_tokens=usage["completion"] if usage else estimate_tokens(_response_text(response)),
+            model=self.model,
+            retries=call["retries"],
+            cache_hit=consume_cache_hit(),
+            estimated_tokens=usage is None
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        call = self._calls.pop(run_id, None) or {"start": time.time(), "prompt_estimate": 0, "retries": 0}
+        trace = self._trace()
+        if trace is None:
+            return
+        trace.record_llm_call(
+            agent_role=self.agent_role,
+            start=call["start"],
+            end=time.time(),
+            prompt_tokens=call["prompt_estimate"],
+            completion_tokens=0,
+            model=self.model,
+            retries=call["retries"],
+            estimated_tokens=True,
+            error=f"{type(error).__name__}: {error}"
+        )
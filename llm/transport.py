@@ -0,0 +1,174 @@
+"""
+Pooled HTTP transport for the Gemini REST API with retries and rate limiting.
+"""
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .rate_limiter import RateLimiter
+
+# Statuses worth retrying: quota exhaustion and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TransportError(RuntimeError):
+    """A request failed for good (non-retryable status or retries exhausted)."""
+
+    def __init__(self, message: str, status: Optional[int] = None, body: Optional[str] = None, retries: int = 0):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+        self.retries = retries
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class GeminiTransport:
+    """
+    Keep-alive session for Gemini REST calls, shared across threads.
+
+    Each call reserves quota from the rate limiter, and is retried with
+    exponential backoff and full jitter on 429/5xx responses and connection
+    errors, waiting at least as long as the server's Retry-After asks.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 180.0,
+        pool_size: int = 10
+    ):
+        """
+        Args:
+            base_url: API root, e.g. https://generativelanguage.googleapis.com
+            api_key: Gemini API key
+            rate_limiter: Limiter shared with the other LLM clients of the process
+            max_retries: Retries after the first attempt
+            backoff_base: Upper bound of the first backoff delay in seconds
+            backoff_max: Upper bound of any computed backoff delay in seconds
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for the response
+            pool_size: Keep-alive connections kept per host
+        """
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled requests session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({"Content-Type": "application/json", "x-goog-api-key": self.api_key})
+                    self._session = session
+        return self._session
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt` (0-based)."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def generate_content(self, model: str, payload: Dict[str, Any], estimated_tokens: int = 0) -> Tuple[Dict[str, Any], int]:
+        """
+        Call models/<model>:generateContent.
+
+        Args:
+            model: Model name, e.g. "gemini-pro"
+            payload: Request body
+            estimated_tokens: Expected prompt + completion tokens, reserved from the limiter
+
+        Returns:
+            tuple: (response JSON, number of retries it took)
+
+        Raises:
+            TransportError: If the request fails with a non-retryable status or retries run out
+        """
+        import requests
+
+        url = f"{self.base_url}/v1/models/{model}:generateContent"
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimated_tokens)
+            retry_after = None
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                failure = TransportError(f"Request failed: {e}", retries=attempt)
+            else:
+                if response.status_code == 200:
+                    result = response.json()
+                    if self.rate_limiter is not None:
+                        usage = result.get("usageMetadata") or {}
+                        if usage.get("totalTokenCount"):
+                            self.rate_limiter.settle(estimated_tokens, usage["totalTokenCount"])
+                    return result, attempt
+                failure = TransportError(
+                    f"API request failed with status code {response.status_code}",
+                    status=response.status_code,
+                    body=response.text,
+                    retries=attempt
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    raise failure
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if self.rate_limiter is not None:
+                # A failed attempt still used its request slot, but no tokens
+                self.rate_limiter.consume(-estimated_tokens)
+            if attempt == self.max_retries:
+                raise failure
+            delay = self.backoff_delay(attempt, retry_after)
+            print(f"{failure}; retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
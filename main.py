@@ -2,41 +2,24 @@
 Main script to run the press release enhancement system.
 """
 import argparse
+import json
 import os
+from importlib import metadata
+from pathlib import Path
 from press_release_system import PressReleaseEnhancementSystem
+from batch_runner import run_batch
+from corpus import CompiledCorpus, DuplicateIndex, rewrite_articles
 
-def main():
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Run Press Release Enhancement System')
-    parser.add_argument('--base_path', type=str, 
-                        default="/content/drive/MyDrive/Colab Notebooks/publish_flow",
-                        help='Base path for the project directory')
-    parser.add_argument('--debug', action='store_true',
-                        help='Enable debug logging')
-    parser.add_argument('--api_key', type=str,
-                        help='Optional API key (otherwise reads from environment)')
-    args = parser.parse_args()
-    
-    # Set API key if provided
-    if args.api_key:
-        os.environ['AI_STUDIO_API'] = args.api_key
-        print("Using API key from command line arguments")
+def run_pipeline(pr_system):
+    """
+    Run the CrewAI workflow for one system, falling back to legacy mode on errors.
     
-    # Print CrewAI version for debugging
-    try:
-        import crewai
-        print(f"CrewAI version: {crewai.__version__}")
-    except (ImportError, AttributeError):
-        print("Unable to determine CrewAI version")
-    
-    print(f"Starting Press Release Enhancement System with base path: {args.base_path}")
-    
-    # Create system with debug mode
-    pr_system = PressReleaseEnhancementSystem(base_path=args.base_path, debug=args.debug)
-    
-    print("System initialized. Running with CrewAI multi-agent workflow...")
-    
-    # Execute the CrewAI workflow
+    Args:
+        pr_system: Initialized PressReleaseEnhancementSystem
+        
+    Returns:
+        str: The generated press release, or None if generation failed
+    """
     try:
         result = pr_system.run_crew()
         if not result:
@@ -63,5 +46,151 @@ def main():
             print(f"ERROR in legacy execution: {legacy_error}")
             return None
 
+def build_parser(description: str = 'Run Press Release Enhancement System') -> argparse.ArgumentParser:
+    """Create the argument parser with the options shared by all entry points."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--base_path', type=str, 
+                        default="/content/drive/MyDrive/Colab Notebooks/publish_flow",
+                        help='Base path for the project directory')
+    parser.add_argument('--debug', action='store_true',
+                        help='Enable debug logging')
+    parser.add_argument('--api_key', type=str,
+                        help='Optional API key (otherwise reads from environment)')
+    parser.add_argument('--top_k', type=int, default=8,
+                        help='Number of corpus articles to retrieve for the prompt')
+    parser.add_argument('--retrieval', choices=['bm25', 'passages'], default='bm25',
+                        help='Retrieve whole articles by keyword (bm25) or passages with the dense index (passages, needs NumPy)')
+    parser.add_argument('--top_passages', type=int, default=20,
+                        help='Number of passages to retrieve for the prompt with --retrieval passages')
+    parser.add_argument('--no-dedup', dest='no_dedup', action='store_true',
+                        help='Send near-duplicate articles and repeated paragraphs to the LLM as they are')
+    parser.add_argument('--max-topics', dest='max_topics', type=int, default=2,
+                        help='Maximum number of special instruction files applied to the prompt (0 for all matching)')
+    parser.add_argument('--context_budget', type=int, default=30000,
+                        help='Approximate token budget for retrieved articles (0 for no cap)')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='Disable the on-disk LLM response cache')
+    parser.add_argument('--cache-dir', dest='cache_dir', type=str,
+                        help='Directory for the LLM response cache (default: <base_path>/data/cache)')
+    parser.add_argument('--cache-sampled', dest='cache_sampled', nargs='+', default=[],
+                        metavar='STAGE',
+                        help='Agent names (or "legacy" / "all") allowed to reuse cached responses at temperature > 0')
+    parser.add_argument('--batch', action='store_true',
+                        help='Generate a press release for every prompt file in user_input/')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of prompts processed concurrently in batch mode')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run the workflow as a DAG with parallel fact-check/edit branches per draft')
+    parser.add_argument('--stage_workers', type=int, default=4,
+                        help='Maximum number of workflow stages running concurrently with --parallel')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reuse stored outputs of stages whose inputs are unchanged (data/drafts)')
+    parser.add_argument('--single-crew', dest='single_crew', action='store_true',
+                        help='Run all stages through one sequential CrewAI crew (no checkpoints or claim verifier)')
+    parser.add_argument('--html-renderer', dest='html_renderer', choices=['local', 'llm', 'auto'], default='auto',
+                        help='Render the final HTML locally, with the HTML formatter agent, or locally '
+                             'with the agent as fallback (auto)')
+    parser.add_argument('--no-source-links', dest='no_source_links', action='store_true',
+                        help='Do not link source mentions in the final output to the exact corpus URLs')
+    parser.add_argument('--from-stage', dest='from_stage', type=str,
+                        help='Force this stage and all later stages to rerun (e.g. html_formatting)')
+    parser.add_argument('--resume', type=str, metavar='RUN_ID',
+                        help='Resume a failed run from its first incomplete stage')
+    parser.add_argument('--rpm', type=float,
+                        help='Requests per minute shared by all LLM calls of the process (default: unlimited)')
+    parser.add_argument('--tpm', type=float,
+                        help='Tokens per minute shared by all LLM calls of the process (default: unlimited)')
+    parser.add_argument('--max_retries', type=int, default=5,
+                        help='Retries of direct API requests on 429/5xx responses and connection errors')
+    parser.add_argument('--compile-corpus', dest='compile_corpus', action='store_true',
+                        help='Recompile data/emv_pers.json into the memory-mapped corpus store and exit')
+    parser.add_argument('--add-articles', dest='add_articles', type=str, metavar='FILE',
+                        help='Add or update the articles of this JSON file (an array or one article) by URL and exit')
+    parser.add_argument('--remove-articles', dest='remove_articles', nargs='+', metavar='URL',
+                        help='Remove the articles with these URLs from the corpus and exit')
+    return parser
+
+def create_system(args: argparse.Namespace) -> PressReleaseEnhancementSystem:
+    """Create the system from parsed command line arguments."""
+    # Set API key if provided
+    if args.api_key:
+        os.environ['AI_STUDIO_API'] = args.api_key
+        print("Using API key from command line arguments")
+    
+    # Print CrewAI version for debugging (from the package metadata, so
+    # crewai itself is only imported when the crew workflow runs)
+    try:
+        print(f"CrewAI version: {metadata.version('crewai')}")
+    except metadata.PackageNotFoundError:
+        print("Unable to determine CrewAI version")
+    
+    print(f"Starting Press Release Enhancement System with base path: {args.base_path}")
+    
+    # Create system with debug mode
+    return PressReleaseEnhancementSystem(
+        base_path=args.base_path,
+        debug=args.debug,
+        top_k=args.top_k,
+        context_token_budget=args.context_budget or None,
+        retrieval=args.retrieval,
+        top_passages=args.top_passages,
+        collapse_duplicates=not args.no_dedup,
+        max_topics=args.max_topics or None,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        cache_sampled_stages=args.cache_sampled,
+        parallel=args.parallel,
+        stage_workers=args.stage_workers,
+        single_crew=args.single_crew,
+        incremental=args.incremental,
+        from_stage=args.from_stage,
+        html_renderer=args.html_renderer,
+        link_sources=not args.no_source_links,
+        resume_run_id=args.resume,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.max_retries
+    )
+
+def compile_corpus(source: Path) -> CompiledCorpus:
+    """Compile the corpus JSON into its store (repaired text, used fields only), cluster near-duplicates and report the sizes."""
+    store = CompiledCorpus.compile(source)
+    size = f"{store.path.stat().st_size} bytes" if store.path else "not saved"
+    print(f"Compiled {len(store)} articles: {source} ({source.stat().st_size} bytes) -> {store.path} ({size})")
+    DuplicateIndex.load_or_build(source, store, debug=True)
+    return store
+
+def update_corpus(source: Path, add_file: str = None, remove_urls=None) -> CompiledCorpus:
+    """Add, update and remove articles by URL, then patch the compiled store with the delta."""
+    upserts = []
+    if add_file:
+        with open(add_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        upserts = data if isinstance(data, list) else [data]
+        missing = [article for article in upserts if not article.get("url")]
+        if missing:
+            raise SystemExit(f"{len(missing)} articles in {add_file} have no url")
+    stats = rewrite_articles(source, upserts, remove_urls or [])
+    print(f"Updated {source}: {stats['added']} added, {stats['updated']} updated, {stats['removed']} removed")
+    return CompiledCorpus.load_or_compile(source, debug=True)
+
+def main():
+    # Parse command line arguments
+    args = build_parser().parse_args()
+    if args.compile_corpus:
+        return compile_corpus(Path(args.base_path) / "data/emv_pers.json")
+    if args.add_articles or args.remove_articles:
+        return update_corpus(Path(args.base_path) / "data/emv_pers.json", args.add_articles, args.remove_articles)
+    pr_system = create_system(args)
+    
+    if args.batch:
+        print("System initialized. Running batch mode...")
+        return run_batch(pr_system, run_pipeline, workers=args.workers)
+    
+    print("System initialized. Running with CrewAI multi-agent workflow...")
+    
+    # Execute the CrewAI workflow
+    return run_pipeline(pr_system)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
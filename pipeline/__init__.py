@@ -0,0 +1,16 @@
+"""
+Package initialization for pipeline module.
+"""
+from .dag_executor import DagExecutor, execute_task
+from .stage_store import StageStore
+from .checkpoint import RunCheckpoint, new_run_id
+from .tracing import RunTrace
+
+__all__ = [
+    'DagExecutor',
+    'execute_task',
+    'StageStore',
+    'RunCheckpoint',
+    'new_run_id',
+    'RunTrace'
+]
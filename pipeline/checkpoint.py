@@ -0,0 +1,136 @@
+"""
+Crash-safe per-run checkpoints of workflow stage outputs.
+"""
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    """Write a file via a temporary file and rename, so readers never see partial content."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def new_run_id() -> str:
+    """Create a sortable, unique run id."""
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+
+
+class RunCheckpoint:
+    """
+    Persists each stage output of one run as soon as it finishes, together
+    with a manifest describing the run, so a failed run can be resumed from
+    its first incomplete stage.
+
+    Layout::
+
+        <runs_dir>/<run_id>/manifest.json
+        <runs_dir>/<run_id>/stages/<stage>.txt
+    """
+
+    def __init__(self, runs_dir: Path, run_id: str, manifest: Dict[str, Any]):
+        self.runs_dir = Path(runs_dir)
+        self.run_id = run_id
+        self.manifest = manifest
+        # Parallel stages finish concurrently; serialize manifest updates
+        self._lock = threading.Lock()
+
+    @property
+    def run_dir(self) -> Path:
+        return self.runs_dir / self.run_id
+
+    @property
+    def stages_dir(self) -> Path:
+        return self.run_dir / "stages"
+
+    @classmethod
+    def create(cls, runs_dir: Path, stages: List[str], metadata: Optional[Dict[str, Any]] = None) -> "RunCheckpoint":
+        """
+        Start a new run.
+
+        Args:
+            runs_dir: Directory holding all runs (typically data/runs)
+            stages: Stage names of the workflow, in topological order
+            metadata: Extra run settings needed to resume (user prompt, mode, ...)
+
+        Returns:
+            RunCheckpoint: The checkpoint of the new run
+        """
+        manifest = {
+            "run_id": new_run_id(),
+            "created": time.time(),
+            "status": "running",
+            "stages": list(stages),
+            "completed": [],
+            "error": None,
+            "metadata": metadata or {},
+        }
+        checkpoint = cls(runs_dir, manifest["run_id"], manifest)
+        os.makedirs(checkpoint.stages_dir, exist_ok=True)
+        checkpoint._write_manifest()
+        return checkpoint
+
+    @classmethod
+    def load(cls, runs_dir: Path, run_id: str) -> "RunCheckpoint":
+        """
+        Open an existing run.
+
+        Raises:
+            FileNotFoundError: If the run does not exist
+        """
+        manifest_path = Path(runs_dir) / run_id / "manifest.json"
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No checkpointed run '{run_id}' in {runs_dir}")
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return cls(runs_dir, run_id, manifest)
+
+    def _write_manifest(self) -> None:
+        self.manifest["updated"] = time.time()
+        _atomic_write(self.run_dir / "manifest.json", json.dumps(self.manifest, indent=2, ensure_ascii=False))
+
+    def completed_outputs(self) -> Dict[str, str]:
+        """Return the saved outputs of all completed stages."""
+        outputs = {}
+        for stage in self.manifest["completed"]:
+            path = self.stages_dir / f"{stage}.txt"
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    outputs[stage] = f.read()
+        return outputs
+
+    def first_incomplete_stage(self) -> Optional[str]:
+        """Name of the first stage without a saved output, or None if the run is complete."""
+        for stage in self.manifest["stages"]:
+            if stage not in self.manifest["completed"]:
+                return stage
+        return None
+
+    def save_stage(self, stage: str, output: str) -> None:
+        """Persist a finished stage's output and record it in the manifest."""
+        _atomic_write(self.stages_dir / f"{stage}.txt", output)
+        with self._lock:
+            if stage not in self.manifest["completed"]:
+                self.manifest["completed"].append(stage)
+            self._write_manifest()
+
+    def mark_finished(self) -> None:
+        with self._lock:
+            self.manifest["status"] = "finished"
+            self.manifest["error"] = None
+            self._write_manifest()
+
+    def mark_failed(self, error: BaseException) -> None:
+        with self._lock:
+            self.manifest["status"] = "failed"
+            self.manifest["error"] = f"{type(error).__name__}: {error}"
+            self._write_manifest()
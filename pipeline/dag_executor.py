@@ -0,0 +1,296 @@
+"""
+DAG executor that runs independent workflow stages in parallel.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .checkpoint import RunCheckpoint
+from .stage_store import StageStore, output_hash
+from .tracing import RunTrace
+
+# Separator between upstream outputs, matching CrewAI's context aggregation
+CONTEXT_SEPARATOR = "\n\n----------\n\n"
+
+
+def execute_task(task: Any, context: str) -> str:
+    """
+    Execute a single CrewAI task with an explicit context string.
+
+    Args:
+        task: CrewAI Task with an assigned agent
+        context: Aggregated output of the upstream tasks
+
+    Returns:
+        str: Raw text output of the task
+    """
+    if hasattr(task, "execute_sync"):
+        output = task.execute_sync(agent=task.agent, context=context)
+    else:
+        output = task.execute(context=context)
+    raw = getattr(output, "raw", None)
+    return raw if raw is not None else str(output)
+
+
+class DagExecutor:
+    """
+    Runs a set of named CrewAI tasks as a dependency graph.
+
+    Dependencies are derived from each task's ``context`` list; a stage starts
+    as soon as all of its upstream stages have finished, so independent
+    branches run concurrently.
+
+    When a StageStore is given, a stage whose inputs hash to a stored output
+    is skipped and the stored output is reused, like an incremental build.
+    When a RunCheckpoint is given, every finished stage is persisted to it and
+    stages it already holds are not run again.
+    """
+
+    def __init__(
+        self,
+        stages: Dict[str, Any],
+        max_workers: int = 4,
+        debug: bool = False,
+        store: Optional[StageStore] = None,
+        from_stage: Optional[str] = None,
+        checkpoint: Optional[RunCheckpoint] = None,
+        trace: Optional[RunTrace] = None,
+        agents: Optional[Any] = None,
+        context_hooks: Optional[Dict[str, Callable[[str], str]]] = None
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            stages: Mapping of stage name to CrewAI Task, in a valid topological order
+            max_workers: Maximum number of stages running at the same time
+            debug: Whether to print scheduling details
+            store: Optional stage output store for incremental reruns
+            from_stage: Force this stage and everything downstream of it to rerun
+            checkpoint: Optional checkpoint of this run, used to persist and resume stages
+            trace: Optional run trace receiving a span per executed stage
+            agents: Optional lazy agent provider (e.g. AgentRegistry) with resolve(stage)
+                and fingerprint(stage). Tasks without an agent get theirs from it just
+                before they execute, so reused stages never create one.
+            context_hooks: Optional mapping of stage name to a function that
+                rewrites the stage's upstream context just before it executes
+                (e.g. to add deterministic lookups on the upstream output)
+        """
+        self.stages = stages
+        self.max_workers = max(1, max_workers)
+        self.debug = debug
+        self.store = store
+        self.checkpoint = checkpoint
+        self.trace = trace
+        self.agents = agents
+        self.context_hooks = context_hooks or {}
+        self.dependencies = self._derive_dependencies(stages)
+        self.forced = self._downstream_of(from_stage) if from_stage else set()
+        self.outputs: Dict[str, str] = {}
+        self.output_hashes: Dict[str, str] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.reused: Set[str] = set()
+        self.resumed: Set[str] = set()
+        self.wall_time = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _derive_dependencies(stages: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Map each stage to the names of the stages in its task's context list."""
+        names_by_task = {id(task): name for name, task in stages.items()}
+        dependencies = {}
+        for name, task in stages.items():
+            upstream = []
+            for context_task in getattr(task, "context", None) or []:
+                upstream_name = names_by_task.get(id(context_task))
+                if upstream_name is None:
+                    raise ValueError(f"Stage '{name}' depends on a task that is not part of the graph")
+                upstream.append(upstream_name)
+            dependencies[name] = upstream
+        DagExecutor._check_acyclic(dependencies)
+        return dependencies
+
+    @staticmethod
+    def _check_acyclic(dependencies: Dict[str, List[str]]) -> None:
+        """Raise ValueError if the dependency graph contains a cycle."""
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'")
+            visiting.add(name)
+            for upstream in dependencies[name]:
+                visit(upstream)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in dependencies:
+            visit(name)
+
+    def _downstream_of(self, stage: str) -> Set[str]:
+        """Return a stage and all stages that (transitively) depend on it."""
+        if stage not in self.stages:
+            raise ValueError(f"Unknown stage '{stage}'. Valid stages: {', '.join(self.stages)}")
+        affected = {stage}
+        for name in self.stages:
+            if any(upstream in affected for upstream in self.dependencies[name]):
+                affected.add(name)
+        return affected
+
+    def _context_for(self, name: str) -> str:
+        """Join the outputs of a stage's upstream stages."""
+        return CONTEXT_SEPARATOR.join(self.outputs[upstream] for upstream in self.dependencies[name])
+
+    def _run_stage(self, name: str) -> str:
+        """Execute one stage, within a trace span when tracing is enabled."""
+        if self.trace is None:
+            return self._execute_stage(name, {})
+        role = getattr(getattr(self.stages[name], "agent", None), "role", None)
+        if role is None and self.agents is not None:
+            role = self.agents.fingerprint(name)["role"]
+        with self.trace.task_span(name, role) as span:
+            return self._execute_stage(name, span)
+
+    def _execute_stage(self, name: str, span: Dict[str, Any]) -> str:
+        """Execute one stage (or reuse its stored output) and record its timing."""
+        start = time.time()
+        context = self._context_for(name)
+        hooked = name in self.context_hooks
+        if hooked:
+            # Hooks add data from outside the graph, so the rewritten context
+            # is part of the stage inputs
+            context = self.context_hooks[name](context)
+        key = None
+        if self.store is not None:
+            key = self.store.stage_key(
+                self.stages[name],
+                [self.output_hashes[upstream] for upstream in self.dependencies[name]],
+                agent_config=self.agents.fingerprint(name) if self.agents is not None else None,
+                context_hash=output_hash(context) if hooked else None
+            )
+            if name not in self.forced:
+                stored = self.store.load(key)
+                if stored is not None:
+                    print(f"Stage '{name}' is up to date, reusing stored output.")
+                    span["reused"] = True
+                    if self.checkpoint is not None:
+                        self.checkpoint.save_stage(name, stored)
+                    with self._lock:
+                        self.reused.add(name)
+                        self.timings[name] = (start, time.time())
+                    return stored
+
+        if self.debug:
+            print(f"[dag] Starting stage '{name}'")
+        task = self.stages[name]
+        if getattr(task, "agent", None) is None and self.agents is not None:
+            task.agent = self.agents.resolve(name)
+        output = execute_task(task, context)
+        end = time.time()
+        if key is not None:
+            self.store.save(name, key, output)
+        if self.checkpoint is not None:
+            self.checkpoint.save_stage(name, output)
+        with self._lock:
+            self.timings[name] = (start, end)
+        if self.debug:
+            print(f"[dag] Finished stage '{name}' in {end - start:.2f}s")
+        return output
+
+    def run(self) -> Dict[str, str]:
+        """
+        Execute all stages, respecting dependencies.
+
+        Returns:
+            Dict mapping stage name to its text output
+        """
+        pending = {name: set(upstream) for name, upstream in self.dependencies.items()}
+        start = time.time()
+
+        # Stages completed by an earlier attempt of this run are not executed again
+        if self.checkpoint is not None:
+            for name, output in self.checkpoint.completed_outputs().items():
+                if name in pending and name not in self.forced:
+                    self.outputs[name] = output
+                    self.output_hashes[name] = output_hash(output)
+                    self.resumed.add(name)
+                    del pending[name]
+            for deps in pending.values():
+                deps.difference_update(self.resumed)
+            if self.resumed:
+                print(f"Resuming run {self.checkpoint.run_id}: {len(self.resumed)} stage(s) already completed")
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        running = {}
+
+        def schedule_ready():
+            for name in [n for n, deps in pending.items() if not deps]:
+                del pending[name]
+                running[pool.submit(self._run_stage, name)] = name
+
+        try:
+            schedule_ready()
+            while running:
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    self.outputs[name] = future.result()
+                    self.output_hashes[name] = output_hash(self.outputs[name])
+                    for deps in pending.values():
+                        deps.discard(name)
+                schedule_ready()
+        except BaseException:
+            # Fail fast: queued stages are cancelled, nothing downstream is
+            # scheduled and stages still running are not waited for
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+        self.wall_time = time.time() - start
+        return self.outputs
+
+    def final_stage(self) -> str:
+        """Name of the last stage in the graph (the one producing the final output)."""
+        return list(self.stages)[-1]
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Compute the longest chain of dependent stages by measured duration.
+
+        Returns:
+            Tuple of (stage names along the critical path, summed duration in seconds)
+        """
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.stages:
+            start, end = self.timings.get(name, (0.0, 0.0))
+            upstream = [best[u] for u in self.dependencies[name] if u in best]
+            length, path = max(upstream, key=lambda item: item[0]) if upstream else (0.0, [])
+            best[name] = (length + (end - start), path + [name])
+        if not best:
+            return [], 0.0
+        length, path = max(best.values(), key=lambda item: item[0])
+        return path, length
+
+    def print_report(self) -> None:
+        """Print per-stage timings, the critical path and the total wall time."""
+        print("\nStage timings:")
+        for name in self.stages:
+            if name in self.resumed:
+                print(f"  {name:<24} {'-':>9}  [resumed from checkpoint]")
+                continue
+            if name not in self.timings:
+                continue
+            start, end = self.timings[name]
+            upstream = ", ".join(self.dependencies[name]) or "-"
+            status = "  [reused]" if name in self.reused else ""
+            print(f"  {name:<24} {end - start:>8.2f}s  (after: {upstream}){status}")
+        path, length = self.critical_path()
+        stage_total = sum(end - start for start, end in self.timings.values())
+        print(f"Critical path: {' -> '.join(path)} ({length:.2f}s)")
+        print(f"Total wall time: {self.wall_time:.2f}s (sum of stage times: {stage_total:.2f}s)")
+        if self.store is not None:
+            executed = len(self.timings) - len(self.reused)
+            print(f"Executed {executed} stage(s), reused {len(self.reused)} stored output(s)")
@@ -0,0 +1,111 @@
+"""
+Content-addressed store for workflow stage outputs.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# LLM attributes that affect what a stage produces
+LLM_CONFIG_FIELDS = ("model", "model_name", "temperature", "top_p", "top_k", "max_output_tokens")
+
+
+def output_hash(text: str) -> str:
+    """Hash of a stage output, used as input to downstream stage keys."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def agent_fingerprint(agent: Any) -> Dict[str, Any]:
+    """
+    Describe the parts of an agent's configuration that influence its output.
+
+    Args:
+        agent: CrewAI agent
+
+    Returns:
+        dict: Role, goal, backstory and LLM generation parameters
+    """
+    llm = getattr(agent, "llm", None)
+    llm_config = {}
+    for field in LLM_CONFIG_FIELDS:
+        value = getattr(llm, field, None)
+        if value is not None:
+            llm_config[field] = value if isinstance(value, (int, float, str, bool)) else str(value)
+    return {
+        "role": getattr(agent, "role", None),
+        "goal": getattr(agent, "goal", None),
+        "backstory": getattr(agent, "backstory", None),
+        "llm": llm_config,
+    }
+
+
+class StageStore:
+    """
+    Stores stage outputs under a hash of everything the stage consumed:
+    the task description and expected output, the agent configuration and
+    the hashes of the upstream outputs. A stage whose key is already present
+    does not need to run again.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Directory holding the stored outputs (typically data/drafts)
+        """
+        self.root = Path(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def stage_key(
+        task: Any,
+        upstream_hashes: List[str],
+        agent_config: Optional[Dict[str, Any]] = None,
+        context_hash: Optional[str] = None
+    ) -> str:
+        """
+        Compute the input hash of a stage.
+
+        Args:
+            task: CrewAI task of the stage
+            upstream_hashes: Output hashes of the upstream stages, in context order
+            agent_config: Declared configuration of the stage's agent, used instead of
+                inspecting task.agent when agents are created lazily
+            context_hash: Hash of the context the stage actually receives, for stages
+                whose context is rewritten from data outside the graph (e.g. the
+                claim verifier's lookups in the fact table)
+
+        Returns:
+            str: Hex digest identifying the stage inputs
+        """
+        inputs = {
+            "description": getattr(task, "description", ""),
+            "expected_output": getattr(task, "expected_output", ""),
+            "agent": agent_config if agent_config is not None else agent_fingerprint(getattr(task, "agent", None)),
+            "upstream": upstream_hashes,
+        }
+        if context_hash is not None:
+            inputs["context"] = context_hash
+        payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def load(self, key: str) -> Optional[str]:
+        """Return the stored output for a stage key, or None."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["output"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def save(self, stage: str, key: str, output: str) -> None:
+        """Store a stage output under its key (written atomically)."""
+        path = self._path(key)
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "key": key, "created": time.time(), "output": output}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
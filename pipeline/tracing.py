@@ -0,0 +1,224 @@
+"""
+Per-run instrumentation: task spans and LLM call records with a JSON trace.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_current = threading.local()
+
+
+def current_stage() -> Optional[str]:
+    """Name of the stage running on this thread, if any."""
+    return getattr(_current, "stage", None)
+
+
+def current_agent_role() -> Optional[str]:
+    """Role of the agent running the current stage on this thread, if any."""
+    return getattr(_current, "agent_role", None)
+
+
+def current_trace() -> Optional["RunTrace"]:
+    """Trace of the run executing on this thread, if any."""
+    return getattr(_current, "trace", None)
+
+
+class RunTrace:
+    """
+    Collects timing and token usage for one run.
+
+    Tasks are recorded as spans; LLM calls are recorded individually and
+    attributed to the stage running on the calling thread.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, mode: str = "crew"):
+        """
+        Args:
+            run_id: Id of the run this trace belongs to (may be set later)
+            mode: Which generation path produced the trace ("crew" or "legacy")
+        """
+        self.run_id = run_id
+        self.mode = mode
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.tasks: List[Dict[str, Any]] = []
+        self.llm_calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """
+        Make this the current trace of the calling thread, so LLM clients that
+        are shared between runs record their calls in the right run.
+        """
+        previous = current_trace()
+        _current.trace = self
+        try:
+            yield self
+        finally:
+            _current.trace = previous
+
+    @contextmanager
+    def task_span(self, stage: str, agent_role: Optional[str] = None):
+        """
+        Record a task execution. LLM calls made inside the span are attributed to it.
+
+        Yields:
+            dict: The span record; callers may add fields such as "reused"
+        """
+        span = {"stage": stage, "agent_role": agent_role, "start": time.time(), "end": None, "status": "ok"}
+        previous = (current_stage(), current_agent_role(), current_trace())
+        _current.stage, _current.agent_role, _current.trace = stage, agent_role, self
+        try:
+            yield span
+        except BaseException as e:
+            span["status"] = "failed"
+            span["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.stage, _current.agent_role, _current.trace = previous
+            span["end"] = time.time()
+            with self._lock:
+                self.tasks.append(span)
+
+    def record_llm_call(
+        self,
+        agent_role: Optional[str],
+        start: float,
+        end: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+        model: Optional[str] = None,
+        retries: int = 0,
+        cache_hit: bool = False,
+        estimated_tokens: bool = False,
+        stage: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Record one LLM call.
+
+        Args:
+            agent_role: Agent (or path) that owns the call (defaults to the current stage's agent)
+            start: Call start timestamp
+            end: Call end timestamp
+            prompt_tokens: Prompt token count
+            completion_tokens: Completion token count
+            model: Model name
+            retries: Number of retried attempts before the call succeeded
+            cache_hit: Whether the response was served from the response cache
+            estimated_tokens: Whether token counts are estimates rather than API usage data
+            stage: Stage the call belongs to (defaults to the stage running on this thread)
+            error: Error message if the call failed
+        """
+        record = {
+            "stage": stage or current_stage(),
+            "agent_role": current_agent_role() or agent_role,
+            "model": model,
+            "start": start,
+            "end": end,
+            "duration": end - start,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_tokens": estimated_tokens,
+            "retries": retries,
+            "cache_hit": cache_hit,
+            "error": error,
+        }
+        with self._lock:
+            self.llm_calls.append(record)
+
+    def finish(self) -> None:
+        self.finished = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.finished or time.time()
+        return {
+            "run_id": self.run_id,
+            "mode": self.mode,
+            "start": self.started,
+            "end": finished,
+            "wall_time": finished - self.started,
+            "totals": self.totals(),
+            "tasks": sorted(self.tasks, key=lambda span: span["start"]),
+            "llm_calls": sorted(self.llm_calls, key=lambda call: call["start"]),
+        }
+
+    def totals(self) -> Dict[str, Any]:
+        """Aggregate token, retry and cache counters over all LLM calls."""
+        calls = self.llm_calls
+        return {
+            "llm_calls": len(calls),
+            "prompt_tokens": sum(c["prompt_tokens"] for c in calls),
+            "completion_tokens": sum(c["completion_tokens"] for c in calls),
+            "retries": sum(c["retries"] for c in calls),
+            "cache_hits": sum(1 for c in calls if c["cache_hit"]),
+            "llm_time": sum(c["duration"] for c in calls),
+        }
+
+    def write(self, runs_dir: Path) -> Path:
+        """
+        Write the trace to <runs_dir>/<run_id>/trace.json.
+
+        Returns:
+            Path: Location of the written trace
+        """
+        run_dir = Path(runs_dir) / self.run_id
+        os.makedirs(run_dir, exist_ok=True)
+        path = run_dir / "trace.json"
+        tmp_path = path.with_name("trace.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def print_summary(self) -> None:
+        """Print a per-stage table of wall time, LLM calls and tokens."""
+        rows = {}
+        for span in self.tasks:
+            row = rows.setdefault(span["stage"], {
+                "role": span["agent_role"] or "-", "time": 0.0, "calls": 0,
+                "prompt": 0, "completion": 0, "retries": 0, "hits": 0, "note": ""
+            })
+            row["time"] += span["end"] - span["start"]
+            if span.get("reused"):
+                row["note"] = "reused"
+            elif span["status"] != "ok":
+                row["note"] = span["status"]
+        span_stages = set(rows)
+        for call in self.llm_calls:
+            stage = call["stage"] or call["agent_role"] or "-"
+            row = rows.setdefault(stage, {
+                "role": call["agent_role"] or "-", "time": 0.0, "calls": 0,
+                "prompt": 0, "completion": 0, "retries": 0, "hits": 0, "note": ""
+            })
+            # Calls outside a task span (crew kickoff, legacy path) contribute their own time
+            if stage not in span_stages:
+                row["time"] += call["duration"]
+            row["calls"] += 1
+            row["prompt"] += call["prompt_tokens"]
+            row["completion"] += call["completion_tokens"]
+            row["retries"] += call["retries"]
+            row["hits"] += 1 if call["cache_hit"] else 0
+
+        print("\n" + "=" * 100)
+        print(f"RUN SUMMARY ({self.mode}, run {self.run_id})")
+        print("=" * 100)
+        print(f"{'Stage':<22} {'Agent role':<30} {'Time':>8} {'Calls':>6} {'Prompt tok':>11} "
+              f"{'Compl tok':>10} {'Retries':>8} {'Hits':>5}")
+        print("-" * 100)
+        for stage, row in rows.items():
+            note = f"  [{row['note']}]" if row["note"] else ""
+            print(f"{stage:<22} {row['role'][:30]:<30} {row['time']:>7.2f}s {row['calls']:>6} {row['prompt']:>11} "
+                  f"{row['completion']:>10} {row['retries']:>8} {row['hits']:>5}{note}")
+        print("-" * 100)
+        totals = self.totals()
+        finished = self.finished or time.time()
+        print(f"Wall time: {finished - self.started:.2f}s, LLM time: {totals['llm_time']:.2f}s, "
+              f"{totals['llm_calls']} calls, {totals['prompt_tokens']} prompt + "
+              f"{totals['completion_tokens']} completion tokens, "
+              f"{totals['retries']} retries, {totals['cache_hits']} cache hits")
@@ -1,46 +1,79 @@
 import os
-import re
+import copy
 import json
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from pathlib import Path
 
-# Import original dependencies
-# Import original dependencies - use the pattern from the working example
-try:
-    from google import genai
-    from google.genai import types
-    GOOGLE_API_AVAILABLE = True
-except ImportError:
-    print("Google GenerativeAI library not found - will use fallback methods")
-    GOOGLE_API_AVAILABLE = False
-
 # Import API key helper function
 from api_key_helper import get_api_key
 
-# Import CrewAI dependencies
-from crewai import Agent, Task, Crew, Process
-
-# Import agent classes
-from agents import (
-    ContentStrategist,
-    PressReleaseWriter,
-    FactChecker,
-    Editor,
-    Copywriter,
-    QualityAssurance,
-    HTMLFormatter
+# Import corpus retrieval
+from corpus import (
+    BM25Index, CompiledCorpus, DuplicateIndex, FactTable, PassageIndex, SourceIndex, link_sources,
+    numpy_available, select_articles, select_passages, estimate_tokens
 )
 
-# Import task classes
-from tasks import (
-    StrategyTask,
-    WritingTask,
-    FactCheckingTask,
-    EditingTask,
-    CopywritingTask,
-    QualityAssessmentTask,
-    HTMLFormattingTask
-)
+# Import LLM response cache, HTTP transport and shared rate limiter
+from llm import ResponseCache, GeminiTransport, TransportError, configure_rate_limiter, shared_client_pool
+
+# Import the cached system prompt assembly
+from prompt_assembler import PromptAssembler
+
+# Import the local HTML renderer
+from html_renderer import FINAL_RELEASE_MARKER, RENDERERS, HTMLRenderStage, load_template
+
+# Import the parallel stage executor
+from pipeline import DagExecutor, StageStore, RunCheckpoint, RunTrace, execute_task, new_run_id
+
+# CrewAI, the agents and the tasks are imported where they are used, so the
+# legacy path and tooling that only needs this module start quickly
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+    from agents import AgentRegistry
+
+_genai_modules = None
+
+def _load_genai():
+    """
+    Import the Google GenAI client library on first use.
+    
+    Returns:
+        tuple: (genai, types) modules, or (None, None) if the library is not installed
+    """
+    global _genai_modules
+    if _genai_modules is None:
+        try:
+            from google import genai
+            from google.genai import types
+            _genai_modules = (genai, types)
+        except ImportError:
+            print("Google GenerativeAI library not found - will use fallback methods")
+            _genai_modules = (None, None)
+    return _genai_modules
+
+# Stage names of the linear workflow built by create_tasks, in order
+STAGE_NAMES = [
+    "strategy",
+    "writing",
+    "fact_checking",
+    "editing",
+    "copywriting",
+    "quality_assessment",
+    "html_formatting"
+]
+
+# Agent that runs each stage (numbered branch stages use their base stage)
+STAGE_AGENTS = {
+    "strategy": "content_strategist",
+    "writing": "writer",
+    "fact_checking": "fact_checker",
+    "editing": "editor",
+    "copywriting": "copywriter",
+    "quality_assessment": "quality_assurance",
+    "html_formatting": "html_formatter"
+}
 
 class PressReleaseEnhancementSystem:
     """
@@ -48,17 +81,98 @@ class PressReleaseEnhancementSystem:
     multi-agent approach with Google Generative AI models.
     """
     
-    def __init__(self, base_path: str = "/content/drive/MyDrive/Colab Notebooks/publish_flow", debug: bool = False):
+    def __init__(
+        self,
+        base_path: str = "/content/drive/MyDrive/Colab Notebooks/publish_flow",
+        debug: bool = False,
+        top_k: int = 8,
+        context_token_budget: Optional[int] = 30000,
+        retrieval: str = "bm25",
+        top_passages: int = 20,
+        collapse_duplicates: bool = True,
+        max_topics: Optional[int] = 2,
+        html_renderer: str = "auto",
+        link_sources: bool = True,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        cache_sampled_stages: Optional[List[str]] = None,
+        parallel: bool = False,
+        stage_workers: int = 4,
+        single_crew: bool = False,
+        incremental: bool = False,
+        from_stage: Optional[str] = None,
+        resume_run_id: Optional[str] = None,
+        api_base_url: Optional[str] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5
+    ):
         """
         Initialize the Press Release Enhancement System.
         
         Args:
             base_path: Path to the directory containing data, prompts, and output files
             debug: Whether to enable debug mode with more verbose logging
+            top_k: Number of corpus articles retrieved for each prompt
+            context_token_budget: Approximate token cap for the retrieved articles (None for no cap)
+            retrieval: "bm25" to retrieve whole articles by keyword, or "passages" to retrieve
+                passages with the dense passage index (needs NumPy)
+            top_passages: Number of passages retrieved for each prompt with retrieval="passages"
+            collapse_duplicates: Whether near-duplicate articles are sent once (with the
+                URLs of the others) and repeated paragraphs are left out of the context
+            max_topics: Maximum number of special instruction files added to the system
+                prompt for the topics detected in the user prompt (None for all matching)
+            html_renderer: "local" to render the final release as HTML without an LLM,
+                "llm" for the HTML formatter agent, or "auto" for the local renderer
+                with the agent as fallback when no final release can be found
+            link_sources: Whether source mentions in the final output are linked to
+                the exact corpus URLs (and wrong corpus links corrected) after generation
+            use_cache: Whether to cache LLM responses on disk
+            cache_dir: Directory for the response cache (defaults to data/cache)
+            cache_sampled_stages: Agent names (or "legacy", or "all") whose temperature > 0
+                responses may be served from the cache
+            parallel: Whether to run the workflow as a DAG with parallel draft branches
+            stage_workers: Maximum number of stages running concurrently in parallel mode
+            single_crew: Whether to run the workflow as one sequential CrewAI crew instead
+                of stage by stage (without checkpoints, claim verification or memoization)
+            incremental: Whether to reuse stored stage outputs whose inputs are unchanged,
+                including those of sampled (temperature > 0) stages
+            from_stage: Force this stage and all later stages to rerun in incremental mode
+            resume_run_id: Id of a failed run to resume from its first incomplete stage
+            api_base_url: Base URL of the Gemini REST API used by direct HTTP requests
+                (defaults to GEMINI_API_BASE_URL or the public endpoint)
+            requests_per_minute: Request quota shared by the legacy path and all agents (None for unlimited)
+            tokens_per_minute: Token quota shared by the legacy path and all agents (None for unlimited)
+            max_retries: Retries of direct HTTP requests on 429/5xx responses and connection errors
         """
         # Set up paths
         self.base_path = Path(base_path)
         self.debug = debug
+        self.top_k = top_k
+        self.context_token_budget = context_token_budget
+        self.retrieval = retrieval
+        self.top_passages = top_passages
+        self.collapse_duplicates = collapse_duplicates
+        self.max_topics = max_topics
+        if html_renderer not in RENDERERS:
+            raise ValueError(f"Unknown HTML renderer '{html_renderer}'. Valid renderers: {', '.join(RENDERERS)}")
+        self.html_renderer = html_renderer
+        self.link_sources = link_sources
+        self.parallel = parallel
+        self.stage_workers = stage_workers
+        if single_crew and (parallel or incremental or resume_run_id):
+            raise ValueError("single_crew cannot be combined with parallel, incremental or resume_run_id")
+        self.single_crew = single_crew
+        self.incremental = incremental
+        self.from_stage = from_stage
+        self.resume_run_id = resume_run_id
+        self.run_id = None
+        self.trace = None
+        self.api_base_url = (
+            api_base_url
+            or os.environ.get("GEMINI_API_BASE_URL")
+            or "https://generativelanguage.googleapis.com"
+        ).rstrip("/")
         
         if self.debug:
             print(f"Initializing Press Release Enhancement System with base path: {self.base_path}")
@@ -69,13 +183,21 @@ class PressReleaseEnhancementSystem:
             "system_prompt": self.base_path / "prompts/system_prompt.txt",
             "hyperlink_instructions": self.base_path / "prompts/hyperlink_requirements.txt",
             "special_instructions_dir": self.base_path / "prompts/special_instructions",
+            "html_template": self.base_path / "prompts/html_template.html",
             "output": self.base_path / "data/output.txt",
-            "drafts": self.base_path / "data/drafts"  # Directory to store draft versions
+            "drafts": self.base_path / "data/drafts",  # Directory to store draft versions
+            "runs": self.base_path / "data/runs"  # Per-run checkpoints
         }
         
         # Create drafts directory if it doesn't exist
         os.makedirs(self.paths["drafts"], exist_ok=True)
         
+        # Set up the LLM response cache
+        self.response_cache = None
+        if use_cache:
+            self.response_cache = ResponseCache(cache_dir or self.base_path / "data/cache")
+        self.cache_sampled_stages = set(cache_sampled_stages or [])
+        
         # Set up Google AI client based on working example
         self.api_key = get_api_key('GEMINI_API_KEY')  # Try GEMINI_API_KEY
         if not self.api_key:
@@ -87,23 +209,68 @@ class PressReleaseEnhancementSystem:
         if self.debug:
             print("API key loaded successfully.")
             
-        # Initialize client using the working pattern
-        if GOOGLE_API_AVAILABLE:
-            try:
-                self.client = genai.Client(api_key=self.api_key)
-                print("Successfully initialized Google GenAI client.")
-                self.model = "gemini-2.0-flash"  # Default model for text generation
-            except Exception as e:
-                print(f"Error initializing Google GenAI client: {e}")
-                self.client = None
-        else:
-            self.client = None
-            print("Google GenAI library not available. Some features will be limited.")
+        # One process-wide limiter and one pooled session, shared by batch copies
+        self.rate_limiter = configure_rate_limiter(requests_per_minute, tokens_per_minute)
+        self.transport = GeminiTransport(
+            self.api_base_url,
+            self.api_key,
+            rate_limiter=self.rate_limiter,
+            max_retries=max_retries
+        )
+        
+        # The GenAI client is only needed by the legacy path; see the client property
+        self.model = "gemini-2.0-flash"  # Default model for text generation
+        self._client = None
+        self._client_initialized = False
+        
+        # The registry creates each agent on first use. Copies made with
+        # with_user_prompt (batch jobs, server jobs) use the registry of the
+        # calling worker thread: concurrent runs never share an agent, and
+        # later jobs on the same thread reuse its warm agents. All LLMs share
+        # pooled API clients.
+        self.client_pool = shared_client_pool()
+        self.agent_registry = self._create_agent_registry()
+        self._thread_registries = threading.local()
         
         # Load essential data
-        self.json_content = self._load_file(self.paths["json"])
         self.user_prompt = self._load_file(self.paths["user_prompt"])
-        self.base_system_prompt = self._load_file(self.paths["system_prompt"])
+        
+        # Prompt files are read once; system prompts are cached per topic set
+        # and rebuilt when a prompt file changes (shared by with_user_prompt copies)
+        self.prompt_assembler = PromptAssembler(
+            self.paths["system_prompt"],
+            self.paths["hyperlink_instructions"],
+            self.paths["special_instructions_dir"],
+            max_topics=max_topics,
+            debug=self.debug
+        )
+        
+        # Optional page template of the local HTML renderer
+        self.html_template = load_template(self.paths["html_template"])
+        
+        # Open the compiled corpus (recompiled when emv_pers.json changes) and
+        # load (or build) its retrieval index. Articles are decoded from the
+        # memory-mapped store only when they are read.
+        self.corpus = CompiledCorpus.load_or_compile(self.paths["json"], debug=self.debug)
+        self.articles = self.corpus if self.corpus is not None else []
+        self._json_content = None
+        self.retrieval_index = None
+        self.duplicates = None
+        self.fact_table = None
+        self.source_index = None
+        self._fact_checking_task_creators = {}
+        if self.retrieval == "passages" and not numpy_available():
+            print("NumPy not available; falling back to BM25 article retrieval")
+            self.retrieval = "bm25"
+        if self.articles:
+            if self.retrieval == "passages":
+                self.retrieval_index = PassageIndex.load_or_build(self.paths["json"], self.articles, debug=self.debug)
+            else:
+                self.retrieval_index = BM25Index.load_or_build(self.paths["json"], self.articles, debug=self.debug)
+            if self.collapse_duplicates:
+                self.duplicates = DuplicateIndex.load_or_build(self.paths["json"], self.articles, debug=self.debug)
+            self.fact_table = FactTable.load_or_build(self.paths["json"], self.articles, debug=self.debug)
+            self.source_index = SourceIndex.load_or_build(self.paths["json"], self.articles, debug=self.debug)
         
         # Initialize data structures for the workflow
         self.strategy_document = None
@@ -117,6 +284,67 @@ class PressReleaseEnhancementSystem:
         # Add special instructions based on topic
         self._add_topic_specific_instructions()
         
+    @property
+    def client(self):
+        """Google GenAI client, created on first access (None if unavailable)."""
+        if not self._client_initialized:
+            self._client_initialized = True
+            genai, _ = _load_genai()
+            if genai is None:
+                print("Google GenAI library not available. Some features will be limited.")
+            else:
+                try:
+                    self._client = genai.Client(api_key=self.api_key)
+                    print("Successfully initialized Google GenAI client.")
+                except Exception as e:
+                    print(f"Error initializing Google GenAI client: {e}")
+                    self._client = None
+        return self._client
+    
+    @client.setter
+    def client(self, value) -> None:
+        self._client = value
+        self._client_initialized = True
+    
+    def with_user_prompt(self, user_prompt: str, output_path: Optional[Path] = None) -> "PressReleaseEnhancementSystem":
+        """
+        Create a lightweight copy of this system for another user prompt.
+        
+        The copy shares the API client, LLM client pool, corpus, retrieval index
+        and response cache with this instance, so batch runs only load them once.
+        It uses the agent registry of the calling thread: agents keep
+        per-execution state, so copies running concurrently on other threads
+        never share one, while the next copy on the same thread reuses them.
+        
+        Args:
+            user_prompt: Text of the user prompt to generate a press release for
+            output_path: Where the copy saves its output (defaults to this system's output path)
+            
+        Returns:
+            PressReleaseEnhancementSystem: A system ready to run for the new prompt
+        """
+        clone = copy.copy(self)
+        clone.paths = dict(self.paths)
+        if output_path is not None:
+            clone.paths["output"] = Path(output_path)
+        clone.user_prompt = user_prompt
+        clone.resume_run_id = None
+        clone.run_id = None
+        clone.trace = None
+        clone.agent_registry = self._thread_agent_registry()
+        
+        # Reset per-run workflow state
+        clone.strategy_document = None
+        clone.press_release_drafts = []
+        clone.fact_check_reports = []
+        clone.edited_versions = []
+        clone.copyedited_versions = []
+        clone.final_version = None
+        clone.html_version = None
+        
+        clone._add_topic_specific_instructions()
+        return clone
+    
     def _load_file(self, file_path: Path) -> Optional[str]:
         """Load content from a file with error handling."""
         try:
@@ -126,95 +354,233 @@ class PressReleaseEnhancementSystem:
             print(f"File not found: {file_path}")
             return None
     
-    def _detect_topic_from_prompt(self, prompt_text: str) -> Optional[str]:
+    @property
+    def json_content(self) -> Optional[str]:
+        """The whole cleaned corpus as JSON, serialized on first access (None if there is no corpus)."""
+        if self._json_content is None and self.corpus is not None:
+            if self.duplicates is not None:
+                live = [doc_id for doc_id in range(len(self.corpus)) if not self.corpus.is_removed(doc_id)]
+                articles = self.duplicates.collapse(self.corpus, live)
+                self._json_content = json.dumps(articles, ensure_ascii=False, indent=4)
+            else:
+                self._json_content = self.corpus.to_json()
+        return self._json_content
+    
+    def _relevant_json_content(self) -> Optional[str]:
         """
-        Detects the main topic from the prompt text to load appropriate special instructions.
-        Returns the filename (without extension) of the special instruction file to use.
+        Return the corpus articles (or, with passage retrieval, the passages)
+        most relevant to the user prompt as JSON.
+        Falls back to the full corpus when no index or prompt is available.
         """
-        # Simple keyword-based topic detection
-        if re.search(r'verkooprecht|registratierecht|belasting|fiscaal', prompt_text, re.IGNORECASE):
-            return "tax_analysis"
-        elif re.search(r'woonbeleid|betaalbaarheid|wonen|huisvesting', prompt_text, re.IGNORECASE):
-            return "housing_policy"
-        elif re.search(r'bouw|constructie|renovatie|verbouwing', prompt_text, re.IGNORECASE):
-            return "construction"
+        if not self.retrieval_index or not self.user_prompt:
+            return self.json_content
+        
+        if self.retrieval == "passages":
+            select, top_k = select_passages, self.top_passages
         else:
-            return None  # No special instructions needed
+            select, top_k = select_articles, self.top_k
+        selected = select(
+            self.articles,
+            self.retrieval_index,
+            self.user_prompt,
+            top_k=top_k,
+            token_budget=self.context_token_budget,
+            duplicates=self.duplicates
+        )
+        content = json.dumps(selected, ensure_ascii=False, indent=4)
+        if self.debug:
+            if self.retrieval == "passages":
+                passages = sum(len(article["passages"]) for article in selected)
+                print(f"Retrieved {passages} passages from {len(selected)} of {len(self.articles)} articles for the prompt")
+            else:
+                print(f"Retrieved {len(selected)} of {len(self.articles)} articles for the prompt")
+            if self.duplicates is not None:
+                uncollapsed = select(
+                    self.articles,
+                    self.retrieval_index,
+                    self.user_prompt,
+                    top_k=top_k,
+                    token_budget=self.context_token_budget
+                )
+                before = estimate_tokens(json.dumps(uncollapsed, ensure_ascii=False, indent=4))
+                print(f"Near-duplicate collapse: {before} -> {estimate_tokens(content)} context tokens")
+        return content
     
     def _add_topic_specific_instructions(self) -> None:
-        """Add topic-specific instructions to the system prompt."""
-        system_prompt = self.base_system_prompt
-        
-        # Add hyperlink instructions if available
-        hyperlink_path = self.paths["hyperlink_instructions"]
-        if hyperlink_path.exists():
-            hyperlink_instructions = self._load_file(hyperlink_path)
-            if hyperlink_instructions:
-                system_prompt += "\n\n" + hyperlink_instructions
-        
-        # Detect topic and add special instructions
-        if self.user_prompt:
-            topic = self._detect_topic_from_prompt(self.user_prompt)
-            if topic:
-                special_instruction_path = self.paths["special_instructions_dir"] / f"{topic}.txt"
-                if special_instruction_path.exists():
-                    special_instructions = self._load_file(special_instruction_path)
-                    if special_instructions:
-                        system_prompt += "\n\n" + special_instructions
-                        print(f"Applied special instructions for: {topic}")
-        
-        self.system_prompt = system_prompt
-    
-    def create_agents(self) -> Dict[str, Agent]:
-        """Create and return all the specialized agents for the crew."""
-        if self.debug:
-            print("Creating specialized agents...")
-        
-        # Create agent instances
-        content_strategist = ContentStrategist(self.api_key).create_agent()
-        writer = PressReleaseWriter(self.api_key).create_agent()
-        fact_checker = FactChecker(self.api_key).create_agent()
-        editor = Editor(self.api_key).create_agent()
-        copywriter = Copywriter(self.api_key).create_agent()
-        quality_assurance = QualityAssurance(self.api_key).create_agent()
-        html_formatter = HTMLFormatter(self.api_key).create_agent()
-        
-        agents = {
-            "content_strategist": content_strategist,
-            "writer": writer,
-            "fact_checker": fact_checker,
-            "editor": editor,
-            "copywriter": copywriter,
-            "quality_assurance": quality_assurance,
-            "html_formatter": html_formatter
+        """
+        Set the system prompt: the base prompt, the hyperlink instructions and
+        the special instructions of the topics detected in the user prompt.
+        """
+        self.system_prompt, topics = self.prompt_assembler.assemble(self.user_prompt)
+        if topics:
+            print(f"Applied special instructions for: {', '.join(topics)}")
+            if self.debug:
+                scores = self.prompt_assembler.registry.score(self.user_prompt)
+                print("Topic keyword matches: " + ", ".join(f"{topic} {scores[topic]}" for topic in topics))
+    
+    def _cache_sampled(self, stage: str) -> bool:
+        """Whether cached responses may be reused for a stage with temperature > 0."""
+        return "all" in self.cache_sampled_stages or stage in self.cache_sampled_stages
+    
+    def _agent_options(self, agent_name: str) -> Dict[str, Any]:
+        """
+        Response cache, rate limiter and client pool keyword arguments for an agent wrapper.
+        Agents record LLM calls in the trace active on the calling thread.
+        """
+        return {
+            "response_cache": self.response_cache,
+            "cache_sampled": self._cache_sampled(agent_name),
+            "rate_limiter": self.rate_limiter,
+            "client_pool": self.client_pool
         }
-        
+    
+    def _legacy_cache_key(self, model: str, config: Dict[str, Any], messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Return the response cache key for a legacy generation, or None if the
+        response must not be served from the cache.
+        """
+        if self.response_cache is None:
+            return None
+        if config["temperature"] > 0 and not self._cache_sampled("legacy"):
+            return None
+        return ResponseCache.make_key(
+            model,
+            config["temperature"],
+            config.get("top_p"),
+            config.get("top_k"),
+            config.get("max_output_tokens"),
+            messages
+        )
+    
+    def create_agents(self) -> Dict[str, "Agent"]:
+        """
+        Return all the specialized agents for the crew, creating those that
+        do not exist yet. Later calls, also from copies of this system, reuse them.
+        """
+        agents = self.agent_registry.all()
         if self.debug:
             print(f"Created {len(agents)} agents: {', '.join(agents.keys())}")
-        
         return agents
     
-    def create_tasks(self, agents: Dict[str, Agent]) -> List[Task]:
-        """Create and return all tasks for the crew workflow."""
-        if self.debug:
-            print("Creating workflow tasks...")
+    def create_thread_agents(self) -> Dict[str, "Agent"]:
+        """
+        Create all agents of the calling thread's registry, which the copies
+        made with with_user_prompt on this thread use (e.g. to warm up a worker).
+        """
+        return self._thread_agent_registry().all()
+    
+    def _thread_agent_registry(self) -> "AgentRegistry":
+        """Agent registry of the calling thread, created on its first job."""
+        registry = getattr(self._thread_registries, "registry", None)
+        if registry is None:
+            registry = self._create_agent_registry()
+            self._thread_registries.registry = registry
+        return registry
+    
+    def _create_agent_registry(self) -> "AgentRegistry":
+        """Create the registry of agent wrappers; no agent or LLM is built yet."""
+        from agents import (
+            AgentRegistry,
+            ContentStrategist,
+            PressReleaseWriter,
+            FactChecker,
+            Editor,
+            Copywriter,
+            QualityAssurance,
+            HTMLFormatter
+        )
         
-        # Assemble context data for tasks
-        context_data = {
-            "json_data": self.json_content,
+        wrappers = {
+            "content_strategist": ContentStrategist(self.api_key, **self._agent_options("content_strategist")),
+            "writer": PressReleaseWriter(self.api_key, **self._agent_options("writer")),
+            "fact_checker": FactChecker(self.api_key, **self._agent_options("fact_checker")),
+            "editor": Editor(self.api_key, **self._agent_options("editor")),
+            "copywriter": Copywriter(self.api_key, **self._agent_options("copywriter")),
+            "quality_assurance": QualityAssurance(self.api_key, **self._agent_options("quality_assurance")),
+            "html_formatter": HTMLFormatter(self.api_key, **self._agent_options("html_formatter"))
+        }
+        return AgentRegistry(wrappers, STAGE_AGENTS)
+    
+    def _report_context_savings(self, task_creators: List[Any]) -> Dict[str, int]:
+        """
+        Summarize how many prompt tokens context shaping saved for this run.
+
+        Args:
+            task_creators: BaseTask instances whose context was rendered
+
+        Returns:
+            Dict with baseline, shaped and saved token totals
+        """
+        baseline = sum(t.baseline_tokens for t in task_creators)
+        shaped = sum(t.context_tokens for t in task_creators)
+        self.context_token_report = {
+            "baseline_tokens": baseline,
+            "context_tokens": shaped,
+            "tokens_saved": baseline - shaped
+        }
+
+        print(f"Context shaping: {shaped} prompt tokens instead of {baseline} "
+              f"(saved ~{baseline - shaped} tokens this run)")
+        if self.debug:
+            for t in task_creators:
+                print(f"  {t.__class__.__name__}: {t.context_tokens} tokens "
+                      f"(fields: {', '.join(t.context_fields) or 'none'})")
+        return self.context_token_report
+
+    def _task_context_data(self) -> Dict[str, Any]:
+        """Assemble the context data shared by all tasks."""
+        return {
+            "json_data": self._relevant_json_content(),
             "user_prompt": self.user_prompt,
             "system_prompt": self.system_prompt
         }
+    
+    def create_tasks(self, agents: Optional[Dict[str, "Agent"]] = None, fact_lookup: bool = False) -> List["Task"]:
+        """
+        Create and return all tasks for the crew workflow.
+        Without agents, the tasks are left unassigned for lazy assignment.
+        With fact_lookup, the fact-check task receives only the claims the
+        claim verifier could not settle (added by the DAG executor, see _context_hooks).
+        Unless html_renderer is "llm", the last task is an HTMLRenderStage.
+        """
+        from tasks import (
+            StrategyTask,
+            WritingTask,
+            FactCheckingTask,
+            EditingTask,
+            CopywritingTask,
+            QualityAssessmentTask,
+            HTMLFormattingTask
+        )
+        
+        if self.debug:
+            print("Creating workflow tasks...")
+        if agents is None:
+            agents = dict.fromkeys(STAGE_AGENTS.values())
+        
+        # Assemble context data for tasks
+        context_data = self._task_context_data()
         
         # Create task instances
         strategy_task_creator = StrategyTask(context_data)
         writing_task_creator = WritingTask(context_data)
-        fact_checking_task_creator = FactCheckingTask(context_data)
+        fact_checking_task_creator = FactCheckingTask(context_data, fact_table=self.fact_table if fact_lookup else None)
+        self._fact_checking_task_creators = {"fact_checking": fact_checking_task_creator}
         editing_task_creator = EditingTask(context_data)
         copywriting_task_creator = CopywritingTask(context_data)
-        quality_assessment_task_creator = QualityAssessmentTask(context_data)
+        quality_assessment_task_creator = QualityAssessmentTask(context_data, final_marker=self._final_marker())
         html_formatting_task_creator = HTMLFormattingTask(context_data)
-        
+
+        self._report_context_savings([
+            strategy_task_creator,
+            writing_task_creator,
+            fact_checking_task_creator,
+            editing_task_creator,
+            copywriting_task_creator,
+            quality_assessment_task_creator,
+            html_formatting_task_creator
+        ])
+
         # Create the actual task objects in sequence
         develop_strategy = strategy_task_creator.create_task(agents["content_strategist"])
         
@@ -243,10 +609,7 @@ class PressReleaseEnhancementSystem:
             context_tasks=[enhance_language]
         )
         
-        create_html = html_formatting_task_creator.create_task(
-            agents["html_formatter"], 
-            context_tasks=[quality_assessment]
-        )
+        create_html = self._html_stage(html_formatting_task_creator, quality_assessment, agents["html_formatter"])
         
         tasks = [
             develop_strategy,
@@ -267,50 +630,315 @@ class PressReleaseEnhancementSystem:
         
         return tasks
     
+    def create_task_graph(self, agents: Optional[Dict[str, "Agent"]] = None, fact_lookup: bool = False) -> Dict[str, "Task"]:
+        """
+        Create the workflow as a task graph in which each draft gets its own
+        fact-check and edit branch; the branches join again at copywriting.
+        Without agents, the tasks are left unassigned for lazy assignment.
+        With fact_lookup, the fact-check tasks receive only the claims the
+        claim verifier could not settle (see _context_hooks).
+        
+        Returns:
+            Dict mapping stage name to task, in topological order
+        """
+        from tasks import (
+            StrategyTask,
+            WritingTask,
+            FactCheckingTask,
+            EditingTask,
+            CopywritingTask,
+            QualityAssessmentTask,
+            HTMLFormattingTask
+        )
+        
+        if self.debug:
+            print("Creating workflow task graph...")
+        if agents is None:
+            agents = dict.fromkeys(STAGE_AGENTS.values())
+        
+        context_data = self._task_context_data()
+        draft_labels = ["1", "2"]
+        
+        strategy_task_creator = StrategyTask(context_data)
+        writing_task_creator = WritingTask(context_data)
+        fact_table = self.fact_table if fact_lookup else None
+        fact_checking_task_creators = [
+            FactCheckingTask(context_data, draft_label=label, fact_table=fact_table) for label in draft_labels
+        ]
+        self._fact_checking_task_creators = {
+            f"fact_checking_{label}": creator for label, creator in zip(draft_labels, fact_checking_task_creators)
+        }
+        editing_task_creators = [EditingTask(context_data, draft_label=label) for label in draft_labels]
+        copywriting_task_creator = CopywritingTask(context_data)
+        quality_assessment_task_creator = QualityAssessmentTask(context_data, final_marker=self._final_marker())
+        html_formatting_task_creator = HTMLFormattingTask(context_data)
+        
+        self._report_context_savings(
+            [strategy_task_creator, writing_task_creator]
+            + fact_checking_task_creators
+            + editing_task_creators
+            + [copywriting_task_creator, quality_assessment_task_creator, html_formatting_task_creator]
+        )
+        
+        graph = {}
+        graph["strategy"] = strategy_task_creator.create_task(agents["content_strategist"])
+        graph["writing"] = writing_task_creator.create_task(
+            agents["writer"],
+            context_tasks=[graph["strategy"]]
+        )
+        
+        # Fan out: one fact-check -> edit branch per draft
+        edit_branches = []
+        for label, fact_checker, editor in zip(draft_labels, fact_checking_task_creators, editing_task_creators):
+            fact_check = fact_checker.create_task(agents["fact_checker"], context_tasks=[graph["writing"]])
+            graph[f"fact_checking_{label}"] = fact_check
+            edit = editor.create_task(agents["editor"], context_tasks=[graph["writing"], fact_check])
+            graph[f"editing_{label}"] = edit
+            edit_branches.append(edit)
+        
+        # Join the branches
+        graph["copywriting"] = copywriting_task_creator.create_task(
+            agents["copywriter"],
+            context_tasks=edit_branches
+        )
+        graph["quality_assessment"] = quality_assessment_task_creator.create_task(
+            agents["quality_assurance"],
+            context_tasks=[graph["copywriting"]]
+        )
+        graph["html_formatting"] = self._html_stage(
+            html_formatting_task_creator,
+            graph["quality_assessment"],
+            agents["html_formatter"]
+        )
+        
+        if self.debug:
+            print(f"Created task graph with {len(graph)} stages: {', '.join(graph)}")
+        
+        return graph
+    
+    def _final_marker(self) -> Optional[str]:
+        """Marker the quality assessment puts before the final release when it is rendered locally."""
+        return FINAL_RELEASE_MARKER if self.html_renderer != "llm" else None
+    
+    def _html_stage(self, html_formatting_task_creator, quality_assessment: "Task", agent: Optional["Agent"]) -> Any:
+        """
+        The last stage of the workflow: the HTML formatter task, or an
+        HTMLRenderStage that renders the release locally. In "auto" mode the
+        formatter task runs only when no final release can be found.
+        """
+        if self.html_renderer == "llm":
+            return html_formatting_task_creator.create_task(agent, context_tasks=[quality_assessment])
+        fallback = None
+        if self.html_renderer == "auto":
+            def fallback(context: str) -> str:
+                task = html_formatting_task_creator.create_task(
+                    agent or self.agent_registry.resolve("html_formatting"),
+                    context_tasks=[quality_assessment]
+                )
+                return execute_task(task, context)
+        return HTMLRenderStage(quality_assessment, template=self.html_template, fallback=fallback)
+    
+    def _run_task_graph(self) -> str:
+        """
+        Run the workflow stage by stage through the DAG executor and return
+        the final output. Used unless single_crew is set.
+        Agents are created only for the stages that actually execute.
+        """
+        checkpoint = None
+        if self.resume_run_id:
+            checkpoint = RunCheckpoint.load(self.paths["runs"], self.resume_run_id)
+            self._restore_run_settings(checkpoint.manifest["metadata"])
+            print(f"Resuming run {checkpoint.run_id} from stage '{checkpoint.first_incomplete_stage()}'")
+        
+        print("Setting up workflow task graph...")
+        fact_lookup = self.fact_table is not None
+        if self.parallel:
+            graph = self.create_task_graph(fact_lookup=fact_lookup)
+            workers = self.stage_workers
+        else:
+            graph = dict(zip(STAGE_NAMES, self.create_tasks(fact_lookup=fact_lookup)))
+            workers = 1
+        
+        if checkpoint is None:
+            checkpoint = RunCheckpoint.create(
+                self.paths["runs"],
+                list(graph),
+                metadata={"user_prompt": self.user_prompt, "parallel": self.parallel,
+                          "html_renderer": self.html_renderer}
+            )
+        elif checkpoint.manifest["stages"] != list(graph):
+            raise ValueError(f"Run {checkpoint.run_id} was created for a different workflow and cannot be resumed")
+        self.run_id = checkpoint.run_id
+        print(f"Run id: {self.run_id}")
+        
+        store = StageStore(self.paths["drafts"]) if self.incremental else None
+        executor = DagExecutor(
+            graph,
+            max_workers=workers,
+            debug=self.debug,
+            store=store,
+            from_stage=self.from_stage,
+            checkpoint=checkpoint,
+            trace=self.trace,
+            agents=self.agent_registry,
+            context_hooks=self._context_hooks(checkpoint.run_dir) if fact_lookup else None
+        )
+        print(f"Starting the press release enhancement workflow with up to {workers} parallel stage(s)...")
+        try:
+            outputs = executor.run()
+            checkpoint.mark_finished()
+            print("Workflow completed successfully.")
+        except Exception as e:
+            checkpoint.mark_failed(e)
+            print(f"Completed stages of run {self.run_id} are saved. "
+                  f"Resume with: python main.py --resume {self.run_id}")
+            raise
+        finally:
+            executor.print_report()
+        return outputs[executor.final_stage()]
+    
+    def _context_hooks(self, run_dir: Path) -> Dict[str, Any]:
+        """
+        Context hooks of the last created workflow: each fact-check stage runs
+        the claim verifier on the drafts and receives only the unresolved
+        claims. The verifier's report is saved as <stage>.claims.json in the run directory.
+        """
+        def verify(name, creator, drafts):
+            context = creator.prepare_context(drafts)
+            report = creator.last_report
+            try:
+                run_dir.mkdir(parents=True, exist_ok=True)
+                with open(run_dir / f"{name}.claims.json", "w", encoding="utf-8") as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                print(f"Could not save claim report of stage '{name}': {e}")
+            counts = report["counts"]
+            print(f"Claim verifier ({name}): {counts['verified']} verified, {counts['mismatched']} mismatched, "
+                  f"{counts['unsourced']} unsourced in {report['elapsed_ms']:.1f}ms")
+            if self.debug:
+                print(f"  Fact checker receives {estimate_tokens(context)} tokens of unresolved claims instead of "
+                      f"{estimate_tokens(drafts)} tokens of drafts plus the source articles")
+            return context
+        
+        return {
+            name: (lambda drafts, name=name, creator=creator: verify(name, creator, drafts))
+            for name, creator in self._fact_checking_task_creators.items()
+        }
+    
+    def _restore_run_settings(self, metadata: Dict[str, Any]) -> None:
+        """Restore the prompt and workflow mode a checkpointed run was started with."""
+        if metadata.get("user_prompt"):
+            self.user_prompt = metadata["user_prompt"]
+            self._add_topic_specific_instructions()
+        self.parallel = metadata.get("parallel", self.parallel)
+        self.html_renderer = metadata.get("html_renderer", self.html_renderer)
+    
+    def _run_sequential_crew(self, agents: Dict[str, "Agent"]) -> str:
+        """Run the workflow as a sequential CrewAI crew and return the final output."""
+        from crewai import Crew, Process
+        
+        print("Setting up workflow tasks...")
+        try:
+            tasks = self.create_tasks(agents)
+            print(f"Successfully created {len(tasks)} tasks")
+        except Exception as task_error:
+            print(f"Error creating tasks: {task_error}")
+            raise
+        
+        # A local HTML stage is not a CrewAI task; it renders the crew's result
+        render_stage = tasks.pop() if isinstance(tasks[-1], HTMLRenderStage) else None
+        
+        print("Assembling the crew...")
+        try:
+            crew = Crew(
+                agents=list(agents.values()),
+                tasks=tasks,
+                verbose=True,
+                process=Process.sequential
+            )
+            print("Successfully assembled crew.")
+        except Exception as crew_error:
+            print(f"Error assembling crew: {crew_error}")
+            raise
+        
+        print("Starting the press release enhancement workflow...")
+        try:
+            result = crew.kickoff()
+            print("Crew workflow completed successfully.")
+        except Exception as kickoff_error:
+            print(f"Error during crew kickoff: {kickoff_error}")
+            raise
+        
+        if render_stage is not None:
+            result = render_stage.execute_sync(context=str(result))
+        return result
+    
+    def _record_legacy_call(
+        self,
+        model: str,
+        start: float,
+        prompt_text: str,
+        output_text: str,
+        usage: Optional[Dict[str, int]] = None,
+        cache_hit: bool = False,
+        retries: int = 0,
+        error: Optional[str] = None
+    ) -> None:
+        """Record a legacy-path LLM call in the current trace."""
+        if self.trace is None:
+            return
+        self.trace.record_llm_call(
+            agent_role="legacy",
+            start=start,
+            end=time.time(),
+            prompt_tokens=usage["prompt"] if usage else estimate_tokens(prompt_text),
+            completion_tokens=usage["completion"] if usage else estimate_tokens(output_text),
+            model=model,
+            retries=retries,
+            cache_hit=cache_hit,
+            estimated_tokens=usage is None,
+            error=error
+        )
+    
+    def _finish_trace(self, run_id: str) -> None:
+        """Write the current trace to data/runs/<run_id>/trace.json and print its summary."""
+        if self.trace is None:
+            return
+        self.trace.run_id = run_id
+        self.trace.finish()
+        try:
+            path = self.trace.write(self.paths["runs"])
+            print(f"Trace saved to {path}")
+        except OSError as e:
+            print(f"Could not write trace: {e}")
+        self.trace.print_summary()
+    
     def run_crew(self) -> str:
         """Run the full CrewAI workflow and return the final output."""
+        self.run_id = None
+        self.trace = RunTrace(mode="crew")
         try:
             # Verify that required data is available
-            if not all([self.json_content, self.user_prompt, self.system_prompt]):
+            if not all([self.articles, self.user_prompt, self.system_prompt]):
                 print("Missing required data. Cannot proceed.")
                 return None
             
-            print("Creating agents for the press release crew...")
-            try:
-                agents = self.create_agents()
-                print(f"Successfully created {len(agents)} agents: {list(agents.keys())}")
-            except Exception as agent_error:
-                print(f"Error creating agents: {agent_error}")
-                raise
-            
-            print("Setting up workflow tasks...")
-            try:
-                tasks = self.create_tasks(agents)
-                print(f"Successfully created {len(tasks)} tasks")
-            except Exception as task_error:
-                print(f"Error creating tasks: {task_error}")
-                raise
+            with self.trace.activate():
+                if not self.single_crew:
+                    result = self._run_task_graph()
+                    print(f"Agents created so far: {', '.join(self.agent_registry.built) or 'none'}")
+                else:
+                    print("Creating agents for the press release crew...")
+                    try:
+                        agents = self.create_agents()
+                        print(f"Successfully created {len(agents)} agents: {list(agents.keys())}")
+                    except Exception as agent_error:
+                        print(f"Error creating agents: {agent_error}")
+                        raise
+                    result = self._run_sequential_crew(agents)
             
-            print("Assembling the crew...")
-            try:
-                crew = Crew(
-                    agents=list(agents.values()),
-                    tasks=tasks,
-                    verbose=True,
-                    process=Process.sequential
-                )
-                print("Successfully assembled crew.")
-            except Exception as crew_error:
-                print(f"Error assembling crew: {crew_error}")
-                raise
-            
-            print("Starting the press release enhancement workflow...")
-            try:
-                result = crew.kickoff()
-                print("Crew workflow completed successfully.")
-            except Exception as kickoff_error:
-                print(f"Error during crew kickoff: {kickoff_error}")
-                raise
+            # Link the source mentions to their corpus articles
+            result = self._link_sources(str(result))
             
             # Extract the final HTML version
             self.final_version = result
@@ -320,6 +948,8 @@ class PressReleaseEnhancementSystem:
                 f.write(result)
             
             print(f"Output saved to {self.paths['output']}")
+            if self.response_cache is not None:
+                self.response_cache.print_stats()
             
             # Print a preview of the result
             print("\nPress Release Preview (first 500 characters):")
@@ -333,16 +963,27 @@ class PressReleaseEnhancementSystem:
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            self._finish_trace(self.run_id or new_run_id())
     
     def generate_legacy(self) -> str:
         """
         Generate a press release using the original single-model approach.
         Updated to follow the working example pattern.
         """
+        self.trace = RunTrace(mode="legacy")
+        try:
+            return self._generate_legacy_with_client()
+        finally:
+            self._finish_trace(new_run_id())
+    
+    def _generate_legacy_with_client(self) -> str:
+        """Legacy generation through the Google GenAI client, falling back to direct HTTP requests."""
         print("Generating press release using legacy method...")
         
         # Check if the client was initialized properly
-        if not GOOGLE_API_AVAILABLE or not self.client:
+        _, types = _load_genai()
+        if types is None or not self.client:
             print("Google GenAI client not available. Using direct HTTP request instead.")
             return self._generate_with_direct_request()
         
@@ -353,6 +994,21 @@ class PressReleaseEnhancementSystem:
             # Combine JSON content and user prompt
             combined_prompt = f"{self.json_content}\n\n{self.user_prompt}"
             
+            # Serve repeated requests from the response cache when allowed
+            cache_key = self._legacy_cache_key(
+                model,
+                {"temperature": 0.7, "top_p": 0.95, "top_k": 64, "max_output_tokens": 8192},
+                [{"role": "system", "text": self.system_prompt}, {"role": "user", "text": combined_prompt}]
+            )
+            if cache_key:
+                lookup_start = time.time()
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    print("Using cached response for legacy generation.")
+                    self._record_legacy_call(model, lookup_start, combined_prompt, cached, cache_hit=True)
+                    self.response_cache.print_stats()
+                    return self._save_output(cached)
+            
             contents = [
                 types.Content(
                     role="user",
@@ -378,6 +1034,12 @@ class PressReleaseEnhancementSystem:
             
             print("Generating content with Google GenAI API...")
             output_text = ""
+            usage = None
+            estimated_tokens = estimate_tokens(combined_prompt) + estimate_tokens(self.system_prompt or "") \
+                + generate_content_config.max_output_tokens
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimated_tokens)
+            call_start = time.time()
             
             # Use streaming to get the response in chunks
             for chunk in self.client.models.generate_content_stream(
@@ -396,12 +1058,25 @@ class PressReleaseEnhancementSystem:
                             if hasattr(part, 'text') and part.text:
                                 output_text += part.text
                                 print(part.text, end="")
+                # The final chunk carries the token usage of the whole response
+                usage_metadata = getattr(chunk, 'usage_metadata', None)
+                if usage_metadata and getattr(usage_metadata, 'prompt_token_count', None):
+                    usage = {
+                        "prompt": usage_metadata.prompt_token_count or 0,
+                        "completion": usage_metadata.candidates_token_count or 0
+                    }
             
             print("\nContent generation complete.")
+            self._record_legacy_call(model, call_start, combined_prompt, output_text, usage=usage)
+            if self.rate_limiter is not None and usage:
+                self.rate_limiter.settle(estimated_tokens, usage["prompt"] + usage["completion"])
+            
+            if cache_key and output_text:
+                self.response_cache.set(cache_key, output_text)
+                self.response_cache.print_stats()
             
             # Save the output
-            self._save_output(output_text)
-            return output_text
+            return self._save_output(output_text)
             
         except Exception as e:
             print(f"Error generating content with Google GenAI API: {e}")
@@ -414,14 +1089,6 @@ class PressReleaseEnhancementSystem:
         Used as a fallback when the client library fails.
         """
         try:
-            import requests
-            
-            api_url = "https://generativelanguage.googleapis.com/v1/models/gemini-pro:generateContent"
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": self.api_key
-            }
-            
             # Combine JSON content and user prompt
             combined_prompt = f"{self.json_content}\n\n{self.user_prompt}"
             
@@ -449,36 +1116,96 @@ class PressReleaseEnhancementSystem:
                     "parts": [{"text": self.system_prompt}]
                 })
             
+            # Serve repeated requests from the response cache when allowed
+            generation_config = data["generationConfig"]
+            cache_key = self._legacy_cache_key(
+                "gemini-pro",
+                {
+                    "temperature": generation_config["temperature"],
+                    "top_p": generation_config["topP"],
+                    "top_k": generation_config["topK"],
+                    "max_output_tokens": generation_config["maxOutputTokens"]
+                },
+                data["contents"]
+            )
+            if cache_key:
+                lookup_start = time.time()
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    print("Using cached response for direct API request.")
+                    self._record_legacy_call("gemini-pro", lookup_start, combined_prompt, cached, cache_hit=True)
+                    return self._save_output(cached)
+            
             print("Making direct HTTP request to Google AI API...")
-            response = requests.post(api_url, headers=headers, json=data, timeout=180)
+            call_start = time.time()
+            # Reserve the prompt plus the largest possible completion from the shared quota
+            estimated_tokens = estimate_tokens(combined_prompt) + estimate_tokens(self.system_prompt or "") \
+                + generation_config["maxOutputTokens"]
+            try:
+                result, retries = self.transport.generate_content("gemini-pro", data, estimated_tokens=estimated_tokens)
+            except TransportError as e:
+                print(f"API request failed: {e}")
+                if e.body:
+                    print(f"Response: {e.body}")
+                self._record_legacy_call(
+                    "gemini-pro", call_start, combined_prompt, "",
+                    retries=e.retries,
+                    error=f"HTTP {e.status}" if e.status else str(e)
+                )
+                raise
             
-            if response.status_code == 200:
-                result = response.json()
-                try:
-                    output_text = result["candidates"][0]["content"]["parts"][0]["text"]
-                    print("Successfully generated content with direct API request.")
-                    
-                    # Save the output
-                    self._save_output(output_text)
-                    return output_text
-                except (KeyError, IndexError) as e:
-                    print(f"Error extracting text from response: {e}")
-                    print(f"Response structure: {result}")
-                    raise
-            else:
-                print(f"API request failed with status code {response.status_code}")
-                print(f"Response: {response.text}")
-                raise Exception(f"API request failed with status code {response.status_code}")
+            try:
+                output_text = result["candidates"][0]["content"]["parts"][0]["text"]
+                print("Successfully generated content with direct API request.")
+                usage_metadata = result.get("usageMetadata")
+                usage = None
+                if usage_metadata:
+                    usage = {
+                        "prompt": usage_metadata.get("promptTokenCount", 0),
+                        "completion": usage_metadata.get("candidatesTokenCount", 0)
+                    }
+                self._record_legacy_call("gemini-pro", call_start, combined_prompt, output_text, usage=usage, retries=retries)
+                
+                if cache_key:
+                    self.response_cache.set(cache_key, output_text)
+                
+                # Save the output
+                return self._save_output(output_text)
+            except (KeyError, IndexError) as e:
+                print(f"Error extracting text from response: {e}")
+                print(f"Response structure: {result}")
+                raise
                 
         except Exception as e:
             print(f"Failed to generate content with direct HTTP request: {e}")
             raise
     
-    def _save_output(self, output_text: str) -> None:
-        """Save the generated output to a file and print a preview."""
+    def _link_sources(self, output_text: str) -> str:
+        """
+        Link the source mentions of the final output to their corpus articles
+        (see corpus/source_linker.py) and print what was linked.
+        """
+        if not self.link_sources or self.source_index is None or not output_text:
+            return output_text
+        output_text, report = link_sources(output_text, self.source_index)
+        counts = report["counts"]
+        print(f"Source links: {counts['linked']} mentions linked, {counts['corrected']} links corrected, "
+              f"{counts['unwrapped']} unknown links removed, {counts['unresolved']} ambiguous citations "
+              f"in {report['elapsed_ms']:.1f}ms")
+        if self.debug:
+            for item in report["linked"] + report["corrected"]:
+                print(f"  {item['text']!r} -> {item['url']}")
+            for item in report["unwrapped"]:
+                print(f"  removed link {item['url']} from {item['text']!r}")
+        return output_text
+    
+    def _save_output(self, output_text: str) -> str:
+        """Link the sources of the generated output, save it to a file, print a preview and return it."""
         if not output_text:
             print("WARNING: No output text was generated!")
-            return
+            return output_text
+        
+        output_text = self._link_sources(output_text)
             
         with open(self.paths["output"], "w", encoding="utf-8") as f:
             f.write(output_text)
@@ -488,4 +1215,5 @@ class PressReleaseEnhancementSystem:
         print("\nPress Release Preview (first 500 characters):")
         print("-" * 80)
         print(output_text[:500] + "..." if len(output_text) > 500 else output_text)
-        print("-" * 80)
\ No newline at end of file
+        print("-" * 80)
+        return output_text
\ No newline at end of file
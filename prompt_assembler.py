@@ -0,0 +1,208 @@
+"""
+Cached assembly of the system prompt.
+
+The system prompt is the base prompt, the hyperlink instructions and the
+special instructions of the topics detected in the user prompt. The prompt
+files are read once and the assembled prompt is cached per topic set, so
+batch and server jobs with the same topics share one string.
+
+Prompt files are tracked by modification time and size, and by content hash
+once their stamp changes (a save without edits invalidates nothing). Only
+the cached prompts that contain a changed file are rebuilt. Without a
+watcher, every assembly checks the stamps (no file is read unless it
+changed). With start_watching, a background thread polls the files instead
+and assemblies do no disk I/O at all.
+"""
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from topic_registry import Topic, TopicRegistry
+
+# Seconds between checks of the prompt files in watch mode
+WATCH_INTERVAL = 2.0
+
+
+class _PromptFile:
+    """Last seen state of a prompt file."""
+
+    __slots__ = ("stamp", "digest", "text")
+
+    def __init__(self, stamp: Tuple[int, int], digest: str, text: str):
+        self.stamp = stamp
+        self.digest = digest
+        self.text = text
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PromptAssembler:
+    """Builds and caches system prompts per topic set, tracking the prompt files."""
+
+    def __init__(
+        self,
+        system_prompt_path: Path,
+        hyperlink_path: Path,
+        special_instructions_dir: Path,
+        max_topics: Optional[int] = 2,
+        debug: bool = False
+    ):
+        """
+        Args:
+            system_prompt_path: Base system prompt
+            hyperlink_path: Hyperlink instructions, appended when the file exists
+            special_instructions_dir: Directory of topic instruction files (see topic_registry)
+            max_topics: Maximum number of topics whose instructions are added (None for all matching)
+            debug: Whether to print cache and reload messages
+        """
+        self.system_prompt_path = Path(system_prompt_path)
+        self.hyperlink_path = Path(hyperlink_path)
+        self.special_instructions_dir = Path(special_instructions_dir)
+        self.max_topics = max_topics
+        self.debug = debug
+        self.registry = TopicRegistry()
+        self.hits = 0
+        self.misses = 0
+        self._files: Dict[Path, _PromptFile] = {}
+        self._cache: Dict[Tuple[str, ...], Optional[str]] = {}
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loaded = False
+        self.refresh()
+        self._loaded = True
+        if self.system_prompt_path not in self._files:
+            print(f"File not found: {self.system_prompt_path}")
+
+    def _paths(self) -> Iterable[Path]:
+        paths = {self.system_prompt_path, self.hyperlink_path}
+        if self.special_instructions_dir.is_dir():
+            paths.update(self.special_instructions_dir.glob("*.txt"))
+        # Tracked files that disappeared still need to be noticed
+        return paths | set(self._files)
+
+    def _text(self, path: Path) -> Optional[str]:
+        prompt_file = self._files.get(path)
+        return prompt_file.text if prompt_file is not None else None
+
+    def _is_topic_file(self, path: Path) -> bool:
+        return path.parent == self.special_instructions_dir and path.suffix == ".txt"
+
+    def refresh(self) -> List[Path]:
+        """
+        Reload the prompt files whose content changed and rebuild the cached
+        prompts that contain them.
+
+        Returns:
+            The changed (added, edited or removed) files
+        """
+        with self._lock:
+            changed = []
+            for path in self._paths():
+                stamp = _stamp(path)
+                known = self._files.get(path)
+                if stamp is None:
+                    if known is not None:
+                        del self._files[path]
+                        changed.append(path)
+                    continue
+                if known is not None and known.stamp == stamp:
+                    continue
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                digest = hashlib.sha1(data).hexdigest()
+                if known is not None and known.digest == digest:
+                    known.stamp = stamp
+                    continue
+                # Newlines as text mode reads them
+                text = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+                self._files[path] = _PromptFile(stamp, digest, text)
+                changed.append(path)
+            if changed:
+                self._apply(changed)
+            return changed
+
+    def _apply(self, changed: List[Path]) -> None:
+        changed_topics = {path.stem for path in changed if self._is_topic_file(path)}
+        if changed_topics:
+            self.registry = TopicRegistry(
+                Topic.parse(path.stem, prompt_file.text)
+                for path, prompt_file in sorted(self._files.items()) if self._is_topic_file(path)
+            )
+        if self.system_prompt_path in changed or self.hyperlink_path in changed:
+            affected = list(self._cache)
+        else:
+            affected = [key for key in self._cache if changed_topics.intersection(key)]
+        for key in affected:
+            if all(name in self.registry.topics for name in key):
+                self._cache[key] = self._build(key)
+            else:
+                del self._cache[key]
+        if self.debug and self._loaded:
+            print(f"Prompt files changed: {', '.join(path.name for path in changed)}; "
+                  f"rebuilt {len(affected)} cached system prompt(s)")
+
+    def _build(self, topics: Tuple[str, ...]) -> Optional[str]:
+        parts = [self._text(self.system_prompt_path), self._text(self.hyperlink_path)]
+        parts.extend(self.registry.instructions(topics))
+        return "\n\n".join(part.strip() for part in parts if part and part.strip()) or None
+
+    def assemble(self, user_prompt: Optional[str]) -> Tuple[Optional[str], List[str]]:
+        """
+        System prompt for a user prompt.
+
+        Returns:
+            tuple: (system prompt, names of the topics whose instructions it contains)
+        """
+        if self._watcher is None:
+            self.refresh()
+        with self._lock:
+            topics = self.registry.detect(user_prompt, self.max_topics) if user_prompt else []
+            key = tuple(topics)
+            if key in self._cache:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._cache[key] = self._build(key)
+            return self._cache[key], topics
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None
+
+    def start_watching(self, interval: float = WATCH_INTERVAL) -> None:
+        """Poll the prompt files in a background thread instead of on every assembly."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error reloading prompt files: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="prompt-watcher", daemon=True)
+        self._watcher.start()
+        if self.debug:
+            print(f"Watching prompt files every {interval:g}s")
+
+    def stop_watching(self) -> None:
+        """Stop the watcher thread (assemblies check the files again)."""
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
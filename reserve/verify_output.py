@@ -1,84 +1,205 @@
-import re
+"""
+Verification of the hyperlinks in generated press releases.
+
+Each output is scanned once: a single tokenizer pass finds HTML anchors,
+Markdown links and paragraph boundaries (<p> elements, or blank lines in
+plain text and Markdown). Link targets are matched against a hashed index of
+the corpus URLs that is built once and shared by every file.
+
+Usage (from the repository root):
+    python reserve/verify_output.py                       # data/output.txt
+    python reserve/verify_output.py data/batch --workers 4 --reports data/batch/verification
+"""
+import argparse
 import json
 import os
-from bs4 import BeautifulSoup
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+# Stream the corpus article by article when the project's corpus package is
+# importable; otherwise fall back to loading the whole file
+try:
+    from corpus.stream import iter_articles
+except ImportError:
+    iter_articles = None
+
+# Extensions of the output files verified when a directory is given
+OUTPUT_EXTENSIONS = ('.txt', '.html', '.htm', '.md')
+
+# One alternation per token kind, so a single finditer pass tokenizes the output
+_TOKEN_PATTERN = re.compile(r"""
+    <a\s[^>]*?href=['"](?P<href>[^'"]+)['"][^>]*>
+  | (?P<a_close></a\s*>)
+  | (?P<p_open><p(?:\s[^>]*)?>)
+  | (?P<p_close></p\s*>)
+  | \[(?P<md_text>[^\]\n]*)\]\((?P<md_href>https?://[^\s)]+)\)
+  | (?P<blank>\n[ \t]*(?:\r?\n[ \t]*)+)
+""", re.IGNORECASE | re.VERBOSE)
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_NON_SPACE_PATTERN = re.compile(r'\S')
+_LINK_DATE_PATTERN = re.compile(r'\d{1,2}\s+[a-z]{3}\s+\d{4}', re.IGNORECASE)
 
-def check_hyperlinks_in_output(output_path, json_path):
+
+def url_key(url):
     """
-    Analyzes the output text to verify if it contains proper hyperlinks to JSON data sources.
-    
+    Normalized form of a URL for index lookups: host without "www." and the
+    path without trailing slash; scheme, query and fragment are ignored.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+class LinkIndex:
+    """Corpus articles keyed by normalized URL."""
+
+    def __init__(self, articles=()):
+        self.articles = {}
+        for article in articles:
+            url = article.get('url')
+            if url:
+                self.articles[url_key(url)] = {
+                    'url': url,
+                    'title': article.get('title'),
+                    'publication_date': article.get('publication_date'),
+                }
+
+    @classmethod
+    def from_json(cls, json_path):
+        """Build the index from the corpus JSON file."""
+        if iter_articles is not None:
+            return cls(iter_articles(json_path))
+        with open(json_path, 'r', encoding='utf-8') as f:
+            json_data = json.load(f)
+        return cls(json_data if isinstance(json_data, list) else json_data.get('articles', []))
+
+    def __len__(self):
+        return len(self.articles)
+
+    def match(self, href):
+        """The corpus article a link points to, or None."""
+        return self.articles.get(url_key(href))
+
+
+def scan_output(text):
+    """
+    Tokenize an output in one pass.
+
+    Returns:
+        tuple: (links, paragraphs) where links is a list of dicts (format,
+        href, text) and paragraphs a list of booleans telling whether each
+        paragraph contains a link. Paragraphs are the <p> elements when the
+        output has any, otherwise its blank-line separated blocks.
+    """
+    links = []
+    html_paragraphs = []
+    blocks = []
+    open_anchor = None
+    paragraph_open = False
+    paragraph_has_link = False
+    block_start = 0
+    block_has_link = False
+
+    for token in _TOKEN_PATTERN.finditer(text):
+        kind = token.lastgroup
+        if kind == 'href':
+            open_anchor = (token.group('href'), token.end())
+        elif kind == 'a_close':
+            if open_anchor is not None:
+                href, start = open_anchor
+                anchor_text = _TAG_PATTERN.sub('', text[start:token.start()]).strip()
+                links.append({'format': 'html', 'href': href, 'text': anchor_text})
+                paragraph_has_link = block_has_link = True
+                open_anchor = None
+        elif kind == 'md_href':
+            links.append({'format': 'markdown', 'href': token.group('md_href'), 'text': token.group('md_text')})
+            paragraph_has_link = block_has_link = True
+        elif kind == 'p_open':
+            if paragraph_open:
+                html_paragraphs.append(paragraph_has_link)
+            paragraph_open, paragraph_has_link = True, False
+        elif kind == 'p_close':
+            if paragraph_open:
+                html_paragraphs.append(paragraph_has_link)
+            paragraph_open, paragraph_has_link = False, False
+        elif kind == 'blank':
+            if _NON_SPACE_PATTERN.search(text, block_start, token.start()):
+                blocks.append(block_has_link)
+            block_start, block_has_link = token.end(), False
+
+    if paragraph_open:
+        html_paragraphs.append(paragraph_has_link)
+    if _NON_SPACE_PATTERN.search(text, block_start):
+        blocks.append(block_has_link)
+    return links, html_paragraphs or blocks
+
+
+def verify_text(text, link_index):
+    """
+    Hyperlink analysis of one output.
+
     Args:
-        output_path (str): Path to the output text/HTML file
-        json_path (str): Path to the JSON data file
-    
+        text: The output (HTML, Markdown or plain text)
+        link_index: LinkIndex of the corpus
+
     Returns:
-        dict: Analysis results with hyperlink counts and quality assessment
+        dict: Analysis results with hyperlink counts and the links found
     """
-    # Read the output
-    with open(output_path, 'r') as f:
-        output_text = f.read()
-    
-    # Load JSON data
-    with open(json_path, 'r') as f:
-        json_data = json.load(f)
-    
-    # Extract URLs from JSON
-    json_urls = []
-    json_titles = []
-    json_dates = []
-    
-    # This assumes json_data is a list of articles or has an articles field
-    # Adjust according to your actual JSON structure
-    articles = json_data if isinstance(json_data, list) else json_data.get('articles', [])
-    
-    for article in articles:
-        if 'url' in article:
-            json_urls.append(article['url'])
-        if 'title' in article:
-            json_titles.append(article['title'])
-        if 'publication_date' in article:
-            json_dates.append(article['publication_date'])
-    
-    # Find all hyperlinks in HTML format
-    html_link_pattern = r'<a\s+href=[\'"]([^\'"]+)[\'"][^>]*>(.*?)</a>'
-    html_links = re.findall(html_link_pattern, output_text, re.IGNORECASE | re.DOTALL)
-    
-    # Find all hyperlinks in Markdown format
-    md_link_pattern = r'\[(.*?)\]\((https?://[^\s)]+)\)'
-    md_links = re.findall(md_link_pattern, output_text)
-    
-    # Combine all found links
-    all_hrefs = [link[0] for link in html_links] + [link[1] for link in md_links]
-    
-    # Check if any of the found links match the JSON URLs
-    matching_urls = [url for url in all_hrefs if any(json_url in url for json_url in json_urls)]
-    
-    # Parse HTML for deeper analysis if there's HTML content
-    try:
-        soup = BeautifulSoup(output_text, 'html.parser')
-        paragraphs = soup.find_all('p')
-        paragraphs_text = [p.get_text() for p in paragraphs]
-        paragraphs_with_links = [p for p in paragraphs if p.find('a')]
-    except:
-        # If not HTML or parsing fails, use regex to estimate paragraphs
-        paragraphs_text = [p for p in re.split(r'<p>|</p>|\n\n', output_text) if p.strip()]
-        paragraphs_with_links = [p for p in paragraphs_text if '<a href' in p or re.search(md_link_pattern, p)]
-    
-    # Prepare results
-    results = {
-        'total_paragraphs': len(paragraphs_text),
-        'paragraphs_with_links': len(paragraphs_with_links),
-        'html_links_found': len(html_links),
-        'markdown_links_found': len(md_links),
-        'total_links_found': len(html_links) + len(md_links),
-        'matching_urls': len(matching_urls),
-        'percent_paragraphs_with_links': len(paragraphs_with_links) / max(1, len(paragraphs_text)) * 100,
-        'valid_embuild_urls': sum(1 for url in all_hrefs if 'embuildvlaanderen.be' in url),
-        'links_include_dates': sum(1 for link_text in [link[1] for link in html_links] + [link[0] for link in md_links] 
-                                 if re.search(r'\d{1,2}\s+[a-z]{3}\s+\d{4}', link_text, re.IGNORECASE))
+    links, paragraphs = scan_output(text)
+    for link in links:
+        article = link_index.match(link['href'])
+        link['article_url'] = article['url'] if article else None
+        link['includes_date'] = bool(_LINK_DATE_PATTERN.search(link['text']))
+
+    html_links = sum(1 for link in links if link['format'] == 'html')
+    paragraphs_with_links = sum(paragraphs)
+    return {
+        'total_paragraphs': len(paragraphs),
+        'paragraphs_with_links': paragraphs_with_links,
+        'html_links_found': html_links,
+        'markdown_links_found': len(links) - html_links,
+        'total_links_found': len(links),
+        'matching_urls': sum(1 for link in links if link['article_url']),
+        'percent_paragraphs_with_links': paragraphs_with_links / max(1, len(paragraphs)) * 100,
+        'valid_embuild_urls': sum(1 for link in links if 'embuildvlaanderen.be' in link['href']),
+        'links_include_dates': sum(1 for link in links if link['includes_date']),
+        'links': links,
     }
-    
-    # Print a summary
+
+
+def score(results):
+    """Number of hyperlink requirements (out of 4) an output meets."""
+    return sum((
+        results['total_links_found'] >= 3,
+        results['percent_paragraphs_with_links'] >= 50,
+        results['valid_embuild_urls'] >= results['total_links_found'] * 0.8,
+        results['links_include_dates'] >= results['total_links_found'] * 0.8,
+    ))
+
+
+def verify_file(output_path, link_index):
+    """verify_text for a file, with its path, score and verification time added."""
+    start = time.perf_counter()
+    with open(output_path, 'r', encoding='utf-8') as f:
+        results = verify_text(f.read(), link_index)
+    results['file'] = str(output_path)
+    results['score'] = score(results)
+    results['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    return results
+
+
+def print_report(results):
+    """Print the hyperlink analysis and recommendations of one output."""
+    links = results['links']
+    html_links = [link for link in links if link['format'] == 'html']
+    md_links = [link for link in links if link['format'] == 'markdown']
+
     print(f"Analyse van hyperlinks in de output:")
     print(f"- Totaal aantal alinea's: {results['total_paragraphs']}")
     print(f"- Alinea's met hyperlinks: {results['paragraphs_with_links']} ({results['percent_paragraphs_with_links']:.1f}%)")
@@ -88,94 +209,233 @@ def check_hyperlinks_in_output(output_path, json_path):
     print(f"- Links die overeenkomen met JSON URL's: {results['matching_urls']}")
     print(f"- Geldige Embuild Vlaanderen URL's: {results['valid_embuild_urls']}")
     print(f"- Links met datums: {results['links_include_dates']}")
-    
+
     # Sample of links found
     if html_links:
         print("\nVoorbeelden van gevonden HTML links:")
         for i, link in enumerate(html_links[:3]):
-            print(f"  {i+1}. <a href='{link[0]}'>{link[1]}</a>")
-    
+            print(f"  {i+1}. <a href='{link['href']}'>{link['text']}</a>")
+
     if md_links:
         print("\nVoorbeelden van gevonden Markdown links:")
         for i, link in enumerate(md_links[:3]):
-            print(f"  {i+1}. [{link[0]}]({link[1]})")
-    
+            print(f"  {i+1}. [{link['text']}]({link['href']})")
+
     # Assessment and recommendations
     print("\nBEOORDELING:")
-    
+
     if results['total_links_found'] < 3:
         print("❌ ONVOLDOENDE LINKS: De output bevat minder dan 3 hyperlinks.")
         print("   AANBEVELING: Pas de prompt aan om de noodzaak van meerdere hyperlinks te benadrukken.")
     else:
         print("✅ VOLDOENDE LINKS: De output bevat 3 of meer hyperlinks.")
-    
+
     if results['percent_paragraphs_with_links'] < 50:
         print("❌ LAGE LINK DEKKING: Minder dan de helft van de alinea's bevat hyperlinks.")
         print("   AANBEVELING: Vraag om links in meer alinea's.")
     else:
         print("✅ GOEDE LINK DEKKING: Ten minste de helft van de alinea's bevat hyperlinks.")
-    
+
     if results['valid_embuild_urls'] < results['total_links_found'] * 0.8:
         print("❌ ONGELDIGE URL'S: Veel links verwijzen niet naar het Embuild Vlaanderen domein.")
         print("   AANBEVELING: Benadruk het gebruik van de exacte URL's uit de JSON-data.")
     else:
         print("✅ GELDIGE URL'S: De meeste links verwijzen naar het Embuild Vlaanderen domein.")
-    
+
     if results['links_include_dates'] < results['total_links_found'] * 0.8:
         print("❌ ONTBREKENDE DATUMS: In veel linkteksten ontbreken publicatiedatums.")
         print("   AANBEVELING: Benadruk het opnemen van datums in de linktekst.")
     else:
         print("✅ GOEDE DATUM INCLUSIE: De meeste linkteksten bevatten publicatiedatums.")
-        
+
+
+def print_score(score_value):
+    """Print the overall assessment for a score from score()."""
+    print("\nALGEMENE BEOORDELING:")
+    if score_value == 4:
+        print("🌟 UITSTEKEND: Het persbericht voldoet aan alle vereisten voor hyperlinks.")
+    elif score_value == 3:
+        print("✅ GOED: Het persbericht voldoet aan de meeste vereisten voor hyperlinks.")
+    elif score_value == 2:
+        print("⚠️ VOLDOENDE: Het persbericht voldoet aan sommige vereisten, maar heeft verbetering nodig.")
+    else:
+        print("❌ ONVOLDOENDE: Het persbericht moet worden verbeterd op het gebied van hyperlinks.")
+
+
+def check_hyperlinks_in_output(output_path, json_path, link_index=None):
+    """
+    Analyzes the output text to verify if it contains proper hyperlinks to JSON data sources.
+
+    Args:
+        output_path (str): Path to the output text/HTML file
+        json_path (str): Path to the JSON data file
+        link_index (LinkIndex): Index of the corpus URLs, built from json_path if not given
+
+    Returns:
+        dict: Analysis results with hyperlink counts and quality assessment
+    """
+    if link_index is None:
+        link_index = LinkIndex.from_json(json_path)
+    results = verify_file(output_path, link_index)
+    print_report(results)
     return results
 
+
+# Link index of the worker process, set once by the pool initializer
+_worker_index = None
+
+
+def _init_worker(link_index):
+    global _worker_index
+    _worker_index = link_index
+
+
+def _verify_in_worker(output_path):
+    try:
+        return verify_file(output_path, _worker_index)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'file': str(output_path), 'error': str(e)}
+
+
+def find_outputs(paths):
+    """Output files among the given files and directories (directories are not searched recursively)."""
+    outputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            outputs.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(OUTPUT_EXTENSIONS) and os.path.isfile(os.path.join(path, name))
+            ))
+        else:
+            outputs.append(path)
+    return outputs
+
+
+def _aggregate(reports, link_index, elapsed):
+    verified = [report for report in reports if 'error' not in report]
+    totals = {
+        key: sum(report[key] for report in verified)
+        for key in ('total_paragraphs', 'paragraphs_with_links', 'html_links_found', 'markdown_links_found',
+                    'total_links_found', 'matching_urls', 'valid_embuild_urls', 'links_include_dates')
+    }
+    scores = {str(value): 0 for value in range(5)}
+    for report in verified:
+        scores[str(report['score'])] += 1
+    return {
+        'files': len(reports),
+        'errors': [{'file': report['file'], 'error': report['error']} for report in reports if 'error' in report],
+        'corpus_urls': len(link_index),
+        'totals': totals,
+        'percent_paragraphs_with_links': totals['paragraphs_with_links'] / max(1, totals['total_paragraphs']) * 100,
+        'scores': scores,
+        'below_requirements': [report['file'] for report in verified if report['score'] < 4],
+        'elapsed_seconds': elapsed,
+    }
+
+
+def verify_outputs(paths, json_path, report_dir=None, workers=None):
+    """
+    Verify many outputs in parallel worker processes.
+
+    The corpus URL index is built once and handed to each worker when it
+    starts. With a report directory, a <name>.verify.json report is written
+    per output next to a summary.json aggregate.
+
+    Args:
+        paths: Output files and/or directories containing outputs
+        json_path: Path to the corpus JSON file
+        report_dir: Directory for the JSON reports (none are written if None)
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        tuple: (reports, summary)
+    """
+    start = time.perf_counter()
+    link_index = LinkIndex.from_json(json_path)
+    outputs = find_outputs(paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(outputs)))
+    if workers == 1:
+        _init_worker(link_index)
+        reports = [_verify_in_worker(path) for path in outputs]
+    else:
+        chunksize = max(1, len(outputs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(link_index,)) as pool:
+            reports = list(pool.map(_verify_in_worker, outputs, chunksize=chunksize))
+    summary = _aggregate(reports, link_index, time.perf_counter() - start)
+
+    if report_dir is not None:
+        os.makedirs(report_dir, exist_ok=True)
+        for report in reports:
+            name = os.path.basename(report['file'])
+            with open(os.path.join(report_dir, f"{name}.verify.json"), 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(report_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return reports, summary
+
+
 def run_verification(base_path):
     """
     Runs the verification on the generated output.
-    
+
     Args:
         base_path (str): Base path for the project
     """
     output_path = f"{base_path}/data/output.txt"
     json_path = f"{base_path}/data/emv_pers.json"
-    
+
     if not os.path.exists(output_path):
         print(f"Fout: Output bestand niet gevonden op {output_path}")
         return
-    
+
     if not os.path.exists(json_path):
         print(f"Fout: JSON bestand niet gevonden op {json_path}")
         return
-    
+
     print(f"Verificatie starten voor output: {output_path}")
     print(f"Vergelijken met JSON data: {json_path}")
     print("=" * 80)
-    
+
     results = check_hyperlinks_in_output(output_path, json_path)
-    
+
     print("=" * 80)
-    
-    # Overall recommendation
-    print("\nALGEMENE BEOORDELING:")
-    score = 0
-    if results['total_links_found'] >= 3:
-        score += 1
-    if results['percent_paragraphs_with_links'] >= 50:
-        score += 1
-    if results['valid_embuild_urls'] >= results['total_links_found'] * 0.8:
-        score += 1
-    if results['links_include_dates'] >= results['total_links_found'] * 0.8:
-        score += 1
-    
-    if score == 4:
-        print("🌟 UITSTEKEND: Het persbericht voldoet aan alle vereisten voor hyperlinks.")
-    elif score == 3:
-        print("✅ GOED: Het persbericht voldoet aan de meeste vereisten voor hyperlinks.")
-    elif score == 2:
-        print("⚠️ VOLDOENDE: Het persbericht voldoet aan sommige vereisten, maar heeft verbetering nodig.")
-    else:
-        print("❌ ONVOLDOENDE: Het persbericht moet worden verbeterd op het gebied van hyperlinks.")
+
+    print_score(results['score'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify the hyperlinks in generated press releases')
+    parser.add_argument('paths', nargs='*', help='Output files or directories (default: data/output.txt)')
+    parser.add_argument('--base-path', dest='base_path',
+                        default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help='Project directory')
+    parser.add_argument('--json', dest='json_path', help='Corpus JSON file (default: <base-path>/data/emv_pers.json)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--reports', dest='report_dir', help='Directory for the per-file and summary JSON reports')
+    args = parser.parse_args()
+
+    if not args.paths:
+        run_verification(args.base_path)
+        return
+
+    json_path = args.json_path or f"{args.base_path}/data/emv_pers.json"
+    if not os.path.exists(json_path):
+        print(f"Fout: JSON bestand niet gevonden op {json_path}")
+        sys.exit(1)
+
+    reports, summary = verify_outputs(args.paths, json_path, args.report_dir, args.workers)
+    for report in reports:
+        if 'error' in report:
+            print(f"{report['file']}: FOUT {report['error']}")
+        else:
+            print(f"{report['file']}: score {report['score']}/4, {report['total_links_found']} links, "
+                  f"{report['matching_urls']} uit de JSON-data, "
+                  f"{report['percent_paragraphs_with_links']:.0f}% alinea's met links")
+    print(f"\n{summary['files']} bestanden geverifieerd in {summary['elapsed_seconds']:.2f}s; "
+          f"{len(summary['below_requirements'])} voldoen niet aan alle vereisten, {len(summary['errors'])} fouten")
+    if args.report_dir:
+        print(f"Rapporten opgeslagen in {args.report_dir}")
+
 
 if __name__ == "__main__":
-    base_path = "/content/drive/MyDrive/Colab Notebooks/publish_flow"
-    run_verification(base_path)
\ No newline at end of file
+    main()
@@ -0,0 +1,334 @@
+"""
+Server mode: keep one warm system resident and run press release jobs over a
+local HTTP API.
+
+The system (API key, corpus, retrieval index, prompts, response cache and
+LLM clients) is initialized once at startup; every job runs on a lightweight
+copy made with with_user_prompt. Each worker thread keeps its own agents warm
+across jobs. Jobs are queued and run with bounded concurrency.
+Edits to the prompt files are picked up by a watcher thread without a restart.
+
+Endpoints:
+    GET  /health            Server status and queue depth
+    POST /jobs              Submit {"prompt": "...", "options": {...}}; returns the job id
+    GET  /jobs              List jobs
+    GET  /jobs/<id>         Job status, completed stages and, once finished, the result
+    GET  /jobs/<id>/events  Progress as newline-delimited JSON until the job finishes
+
+Job options: "mode" ("crew" with legacy fallback, or "legacy"), "parallel",
+"single_crew", "incremental", "from_stage" and "html_renderer" ("local", "llm"
+or "auto").
+
+Run:
+    python server.py --base_path /path/to/project --port 8000 --workers 2
+"""
+import json
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from html_renderer import RENDERERS
+from main import build_parser, create_system, run_pipeline
+
+JOB_OPTIONS = {"mode", "parallel", "single_crew", "incremental", "from_stage", "html_renderer"}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobServer:
+    """Queues jobs and runs them on copies of one warm system."""
+
+    def __init__(self, pr_system, workers: int = 2, max_queue: int = 16, keep_finished: int = 200):
+        """
+        Args:
+            pr_system: Initialized PressReleaseEnhancementSystem shared by all jobs
+            workers: Number of jobs running concurrently
+            max_queue: Maximum number of queued (not yet running) jobs
+            keep_finished: Number of finished jobs kept in memory for status queries
+        """
+        self.pr_system = pr_system
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.keep_finished = keep_finished
+        self.output_dir = Path(pr_system.base_path) / "data/server"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._systems: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self.started = time.time()
+
+    def warm_up(self) -> None:
+        """Build the agents and the GenAI client up front so the first job does not pay for them."""
+        start = time.time()
+        # Jobs use the agents of their worker thread; the barrier makes every
+        # worker thread take one warm-up call and build its own
+        ready = threading.Barrier(self.workers)
+
+        def build_agents():
+            ready.wait(timeout=60)
+            return self.pr_system.create_thread_agents()
+
+        try:
+            futures = [self._executor.submit(build_agents) for _ in range(self.workers)]
+            agents = [future.result() for future in futures]
+            print(f"Warmed up {len(agents[0])} agents on each of {self.workers} worker(s)")
+        except Exception as e:
+            print(f"Could not create agents during warm-up: {e}")
+        if self.pr_system.client is None:
+            print("GenAI client unavailable; legacy jobs will use direct HTTP requests")
+        print(f"Warm-up took {time.time() - start:.2f}s")
+
+    def _count(self, status: str) -> int:
+        return sum(1 for job in self.jobs.values() if job["status"] == status)
+
+    def submit(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Queue a job.
+
+        Raises:
+            QueueFullError: If max_queue jobs are already waiting
+            ValueError: If the prompt is empty or an option is unknown
+        """
+        if not prompt or not prompt.strip():
+            raise ValueError("Job needs a non-empty 'prompt'")
+        options = dict(options or {})
+        unknown = set(options) - JOB_OPTIONS
+        if unknown:
+            raise ValueError(f"Unknown job option(s): {', '.join(sorted(unknown))}")
+        if options.get("html_renderer", "auto") not in RENDERERS:
+            raise ValueError(f"Unknown HTML renderer '{options['html_renderer']}'. Valid renderers: {', '.join(RENDERERS)}")
+
+        job_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "options": options,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "output": str(self.output_dir / f"{job_id}.txt"),
+            "run_id": None,
+            "error": None,
+            "result": None,
+            "stages": [],
+        }
+        with self._lock:
+            if self._count("queued") >= self.max_queue:
+                raise QueueFullError(f"Queue is full ({self.max_queue} jobs waiting)")
+            self.jobs[job_id] = job
+            self._prune()
+        self._executor.submit(self._run_job, job, prompt)
+        return self.snapshot(job_id)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond keep_finished."""
+        finished = [job_id for job_id, job in self.jobs.items() if job["finished"] is not None]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[job_id]
+
+    def _run_job(self, job: Dict[str, Any], prompt: str) -> None:
+        options = job["options"]
+        try:
+            system = self.pr_system.with_user_prompt(prompt, output_path=Path(job["output"]))
+            if "parallel" in options:
+                system.parallel = bool(options["parallel"])
+            if "single_crew" in options:
+                system.single_crew = bool(options["single_crew"])
+            if "incremental" in options:
+                system.incremental = bool(options["incremental"])
+            if options.get("from_stage"):
+                system.from_stage = options["from_stage"]
+            if "html_renderer" in options:
+                system.html_renderer = options["html_renderer"]
+            with self._lock:
+                self._systems[job["id"]] = system
+                job["status"] = "running"
+                job["started"] = time.time()
+
+            if options.get("mode") == "legacy":
+                result = system.generate_legacy()
+            else:
+                result = run_pipeline(system)
+
+            job["run_id"] = system.run_id
+            job["result"] = result
+            job["status"] = "succeeded" if result else "failed"
+            if not result:
+                job["error"] = "Pipeline returned no output"
+        except Exception as e:
+            traceback.print_exc()
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            stages = self.stages(job["id"])
+            with self._lock:
+                job["stages"] = stages
+                job["finished"] = time.time()
+                self._systems.pop(job["id"], None)
+            print(f"[{job['status'].upper()}] job {job['id']}")
+
+    def stages(self, job_id: str) -> List[Dict[str, Any]]:
+        """Stages the job has completed so far (from its run trace)."""
+        system = self._systems.get(job_id)
+        trace = getattr(system, "trace", None)
+        if trace is None:
+            return []
+        return [
+            {"stage": span["stage"], "status": span["status"], "reused": bool(span.get("reused")),
+             "duration": span["end"] - span["start"]}
+            for span in sorted(trace.tasks, key=lambda span: span["end"])
+        ]
+
+    def snapshot(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """Return a JSON-serializable view of a job, or None if it is unknown."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            view = {key: value for key, value in job.items() if include_result or key != "result"}
+            running = job_id in self._systems
+        if running:
+            view["stages"] = self.stages(job_id)
+        return view
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "status": "ok",
+                "uptime": time.time() - self.started,
+                "workers": self.workers,
+                "queued": self._count("queued"),
+                "running": self._count("running"),
+                "jobs": len(self.jobs),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def make_handler(job_server: JobServer, poll_interval: float = 0.5):
+    """Create the request handler class bound to a JobServer."""
+
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: Any) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _path_parts(self) -> List[str]:
+            return [part for part in self.path.split("?")[0].split("/") if part]
+
+        def do_GET(self):
+            parts = self._path_parts()
+            if parts == ["health"]:
+                return self._send_json(200, job_server.status())
+            if parts == ["jobs"]:
+                with job_server._lock:
+                    job_ids = list(job_server.jobs)
+                return self._send_json(200, [job_server.snapshot(job_id, include_result=False) for job_id in job_ids])
+            if len(parts) == 2 and parts[0] == "jobs":
+                job = job_server.snapshot(parts[1])
+                if job is None:
+                    return self._send_json(404, {"error": f"Unknown job '{parts[1]}'"})
+                return self._send_json(200, job)
+            if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+                return self._stream_events(parts[1])
+            self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self._path_parts() != ["jobs"]:
+                return self._send_json(404, {"error": "Not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                job = job_server.submit(body.get("prompt", ""), body.get("options"))
+            except QueueFullError as e:
+                return self._send_json(503, {"error": str(e)})
+            except (ValueError, AttributeError) as e:
+                return self._send_json(400, {"error": str(e)})
+            self._send_json(202, job)
+
+        def _stream_events(self, job_id: str) -> None:
+            """Write one JSON line per completed stage, then a final line with the job status."""
+            if job_server.snapshot(job_id, include_result=False) is None:
+                return self._send_json(404, {"error": f"Unknown job '{job_id}'"})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            sent = 0
+            status = None
+            try:
+                while True:
+                    job = job_server.snapshot(job_id, include_result=False)
+                    if job is None:
+                        break
+                    if job["status"] != status:
+                        status = job["status"]
+                        self._write_event({"event": "status", "status": status})
+                    for stage in job["stages"][sent:]:
+                        self._write_event(dict(stage, event="stage"))
+                    sent = len(job["stages"])
+                    if job["finished"] is not None:
+                        self._write_event({"event": "finished", "status": job["status"],
+                                           "error": job["error"], "output": job["output"]})
+                        break
+                    time.sleep(poll_interval)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+
+        def _write_event(self, event: Dict[str, Any]) -> None:
+            self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            if job_server.pr_system.debug:
+                super().log_message(format, *args)
+
+    return JobRequestHandler
+
+
+def main():
+    parser = build_parser('Serve the Press Release Enhancement System over a local HTTP API')
+    parser.add_argument('--host', type=str, default="127.0.0.1",
+                        help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='Port to listen on')
+    parser.add_argument('--max_queue', type=int, default=16,
+                        help='Maximum number of jobs waiting to run')
+    parser.add_argument('--watch_prompts', type=float, default=2.0, metavar='SECONDS',
+                        help='Poll the prompt files for edits at this interval (0 to check them on every job instead)')
+    args = parser.parse_args()
+
+    pr_system = create_system(args)
+    if args.watch_prompts > 0:
+        pr_system.prompt_assembler.start_watching(args.watch_prompts)
+    job_server = JobServer(pr_system, workers=args.workers, max_queue=args.max_queue)
+    job_server.warm_up()
+
+    httpd = ThreadingHTTPServer((args.host, args.port), make_handler(job_server))
+    print(f"Serving on http://{args.host}:{httpd.server_address[1]} with {job_server.workers} worker(s)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down...")
+    finally:
+        httpd.server_close()
+        job_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
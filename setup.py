@@ -15,7 +15,9 @@ def install_dependencies():
     dependencies = [
         "google-generativeai",
         "crewai",
-        "langchain-google-genai"
+        "langchain-google-genai",
+        "requests",
+        "numpy"
     ]
     
     # Install each dependency
@@ -55,7 +57,7 @@ def create_placeholder_files(base_path):
     placeholder_files = {
         "prompts/system_prompt.txt": "You are a professional PR writer tasked with writing high-quality press releases.",
         "user_input/prompt_1.txt": "Write a press release about the latest developments.",
-        "prompts/hyperlink_requirements.txt": "Include hyperlinks to reference documents where appropriate."
+        "prompts/hyperlink_requirements.txt": "Cite sources by publication date, e.g. (Embuild Vlaanderen, 20 feb 2025); links are added automatically."
     }
     
     # Create each placeholder file
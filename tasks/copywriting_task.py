@@ -8,13 +8,17 @@ from .task_base import BaseTask
 class CopywritingTask(BaseTask):
     """Task for enhancing language in press releases."""
     
+    context_fields = {
+        "system_prompt": 4000,
+    }
+    
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
         Create and return the copywriting enhancement task.
         
         Args:
             agent: Copywriter agent to perform this task
-            context_tasks: Must include the editing task
+            context_tasks: Must include the editing task, or one editing task per draft branch
             
         Returns:
             Task: A CrewAI task for enhancing press release language
@@ -23,6 +27,8 @@ class CopywritingTask(BaseTask):
             raise ValueError("Copywriting task requires editing task as context")
             
         edit_drafts = context_tasks[0]
+        # Additional editing tasks come from parallel draft branches
+        edit_branches = list(context_tasks)
         
         return Task(
             description=f"""
@@ -47,5 +53,5 @@ class CopywritingTask(BaseTask):
             """,
             agent=agent,
             expected_output="Enhanced versions of both press releases with improved language, engagement, and persuasiveness.",
-            context=[edit_drafts]
+            context=edit_branches
         )
\ No newline at end of file
@@ -8,6 +8,11 @@ from .task_base import BaseTask
 class EditingTask(BaseTask):
     """Task for editing press release drafts."""
     
+    context_fields = {
+        "user_prompt": 2000,
+        "system_prompt": 4000,
+    }
+    
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
         Create and return the editing task.
@@ -28,6 +33,7 @@ class EditingTask(BaseTask):
         return Task(
             description=f"""
             Review and improve the provided press release drafts, considering the fact-checking reports.
+            {self.draft_scope("edit")}
             
             Focus on:
             - Strengthening the headline and lead paragraph
@@ -3,11 +3,47 @@ Fact checking task for press release enhancement.
 """
 from typing import Dict, Any, Optional, List
 from crewai import Task, Agent
+from corpus.claim_verifier import render_unresolved, verify_claims
 from .task_base import BaseTask
 
 class FactCheckingTask(BaseTask):
     """Task for verifying facts in press release drafts."""
     
+    context_fields = {
+        "json_data": 16000,
+    }
+    
+    def __init__(self, context_data: Dict[str, Any], draft_label: Optional[str] = None, fact_table: Optional[Any] = None):
+        """
+        Initialize the task.
+        
+        Args:
+            context_data: Dict containing json_data, user_prompt, and system_prompt
+            draft_label: Optional draft this task is restricted to
+            fact_table: Optional corpus FactTable. The figures in the drafts are
+                then verified deterministically before the agent runs (see
+                prepare_context), and the agent only receives the claims the
+                verifier could not settle instead of the drafts and the corpus.
+        """
+        self.fact_table = fact_table
+        self.last_report: Optional[Dict[str, Any]] = None
+        if fact_table is not None:
+            self.context_fields = {}
+        super().__init__(context_data, draft_label)
+    
+    def prepare_context(self, drafts: str) -> str:
+        """
+        Replace the drafts with the claims the verifier could not settle.
+        
+        Args:
+            drafts: Output of the writing task
+            
+        Returns:
+            str: Mismatched and unsourced claims with their candidate sources
+        """
+        self.last_report = verify_claims(drafts, self.fact_table, self.draft_label)
+        return render_unresolved(self.last_report)
+    
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
         Create and return the fact checking task.
@@ -24,9 +60,33 @@ class FactCheckingTask(BaseTask):
             
         write_drafts = context_tasks[0]
         
+        if self.fact_table is not None:
+            return Task(
+                description=f"""
+            The figures in the press release drafts were checked against the source articles by a
+            deterministic claim verifier. Review the claims it could not settle, listed below.
+            {self.draft_scope("fact-check")}
+            
+            For each claim:
+            - MISMATCHED claims: compare the figure with the source sentence given and decide whether the
+              draft misstates it; if so, give the correct figure and its source URL
+            - UNSOURCED claims: judge from the related source sentences whether the figure is supported,
+              derived correctly (e.g. a rounded or computed value) or unsubstantiated
+            
+            Create a concise fact-checking report listing each claim, your verdict and the suggested
+            correction. Figures not listed were verified and need no action.
+            
+            Claims to review: {{write_drafts.output}}
+            """,
+                agent=agent,
+                expected_output="Fact-checking report on the unresolved claims with verdicts and suggested corrections.",
+                context=[write_drafts]
+            )
+        
         return Task(
             description=f"""
             Verify all facts, figures, and claims in the provided press release drafts against the original JSON data.
+            {self.draft_scope("fact-check")}
             
             For each press release draft:
             - Identify every factual statement, number, date, name, and claim
@@ -45,4 +105,4 @@ class FactCheckingTask(BaseTask):
             agent=agent,
             expected_output="Detailed fact-checking reports for each draft with identified issues and suggested corrections.",
             context=[write_drafts]
-        )
\ No newline at end of file
+        )
@@ -8,6 +8,8 @@ from .task_base import BaseTask
 class HTMLFormattingTask(BaseTask):
     """Task for formatting press releases as HTML."""
     
+    context_fields = {}
+    
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
         Create and return the HTML formatting task.
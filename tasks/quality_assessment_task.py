@@ -8,6 +8,23 @@ from .task_base import BaseTask
 class QualityAssessmentTask(BaseTask):
     """Task for assessing quality of press releases."""
     
+    context_fields = {
+        "user_prompt": 2000,
+        "json_data": 6000,
+    }
+    
+    def __init__(self, context_data: Dict[str, Any], final_marker: Optional[str] = None):
+        """
+        Initialize the task.
+        
+        Args:
+            context_data: Dict containing json_data, user_prompt, and system_prompt
+            final_marker: Optional line the final version must follow, so it can be
+                extracted without an LLM (e.g. for local HTML rendering)
+        """
+        self.final_marker = final_marker
+        super().__init__(context_data)
+    
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
         Create and return the quality assessment task.
@@ -24,6 +41,15 @@ class QualityAssessmentTask(BaseTask):
             
         enhance_language = context_tasks[0]
         
+        final_version = ""
+        if self.final_marker:
+            final_version = (
+                f"\n            End your answer with a line containing only {self.final_marker} followed by the complete "
+                "final press release in Markdown: the headline as '# ', the subheading as '## ', "
+                "paragraphs separated by blank lines, quotes as '> ' lines, links as [text](url) and sources "
+                "cited with their publication date, e.g. (Embuild Vlaanderen, 20 feb 2025)."
+            )
+        
         return Task(
             description=f"""
             Assess both enhanced press release versions and determine which best meets quality standards
@@ -41,7 +67,7 @@ class QualityAssessmentTask(BaseTask):
             
             Score each version on a scale of 1-10 for each criterion, providing specific comments.
             Then either select the best overall version OR create a combined optimal version
-            using the strongest elements from both.
+            using the strongest elements from both.{final_version}
             
             Context: {self.context_str}
             
@@ -1,32 +1,150 @@
 """
 Base task class for press release enhancement system.
 """
+import json
 from typing import Dict, List, Optional, Any
 from crewai import Task, Agent
 
+from corpus.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Section headings used when rendering context fields into a task description
+CONTEXT_LABELS = {
+    "user_prompt": "USER PROMPT",
+    "system_prompt": "WRITING GUIDELINES",
+    "json_data": "SOURCE ARTICLES (one JSON object per line)",
+}
+
+# Article fields that are useful to the LLM; everything else is dropped.
+# With passage retrieval, articles carry "passages" instead of "content".
+ARTICLE_FIELDS = ("url", "duplicate_urls", "publication_date", "title", "subheading", "content", "passages")
+
+TRUNCATION_MARKER = " [...]"
+
 class BaseTask:
     """Base class for all tasks in the press release system."""
-    
-    def __init__(self, context_data: Dict[str, Any]):
+
+    # Context fields this task consumes, mapped to their token budget.
+    # Subclasses override this; fields not listed are never sent to the LLM.
+    context_fields: Dict[str, int] = {
+        "json_data": 12000,
+        "user_prompt": 2000,
+        "system_prompt": 4000,
+    }
+
+    def __init__(self, context_data: Dict[str, Any], draft_label: Optional[str] = None):
         """
         Initialize the base task.
-        
+
         Args:
             context_data: Dict containing json_data, user_prompt, and system_prompt
+            draft_label: Optional draft this task is restricted to when the
+                workflow fans the drafts out into parallel branches
         """
         self.context_data = context_data
-        self.context_str = str(context_data)  # Simple string conversion
-    
+        self.draft_label = draft_label
+        self.context_str = self.render_context()
+
+        # Token accounting against the old str(context_data) behaviour
+        self.baseline_tokens = estimate_tokens(str(context_data))
+        self.context_tokens = estimate_tokens(self.context_str)
+
+    def draft_scope(self, action: str) -> str:
+        """
+        Instruction restricting a branch task to its own draft.
+
+        Args:
+            action: What the task does with the draft (e.g. "fact-check")
+
+        Returns:
+            str: Instruction line, or an empty string when not on a draft branch
+        """
+        if not self.draft_label:
+            return ""
+        return f"Only {action} press release draft {self.draft_label}; ignore the other draft."
+
+    @property
+    def tokens_saved(self) -> int:
+        """Prompt tokens saved by context shaping compared to the full repr."""
+        return max(0, self.baseline_tokens - self.context_tokens)
+
+    def render_context(self) -> str:
+        """
+        Render the context fields declared by this task, each within its budget.
+
+        Returns:
+            str: Compact, labelled context sections
+        """
+        sections = []
+        for field, budget in self.context_fields.items():
+            value = self.context_data.get(field)
+            if not value:
+                continue
+            if field == "json_data":
+                rendered = self._render_articles(value, budget)
+            else:
+                rendered = self._truncate(str(value).strip(), budget)
+            label = CONTEXT_LABELS.get(field, field.upper())
+            sections.append(f"{label}:\n{rendered}")
+        return "\n\n".join(sections)
+
+    @staticmethod
+    def _truncate(text: str, budget: int) -> str:
+        """Cut text to roughly the given number of tokens."""
+        max_chars = budget * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        return text[:max(0, max_chars - len(TRUNCATION_MARKER))] + TRUNCATION_MARKER
+
+    def _render_articles(self, json_data: Any, budget: int) -> str:
+        """
+        Render corpus articles as one compact JSON object per line.
+        Whole articles are added until the budget is spent; an article that
+        does not fit on its own has its content (or its last passages) cut.
+        """
+        if isinstance(json_data, str):
+            try:
+                articles = json.loads(json_data)
+            except json.JSONDecodeError:
+                return self._truncate(json_data, budget)
+        else:
+            articles = json_data
+        if isinstance(articles, dict):
+            articles = articles.get("articles", [])
+
+        lines = []
+        used = 0
+        for article in articles:
+            projected = {k: article[k] for k in ARTICLE_FIELDS if article.get(k)}
+            line = json.dumps(projected, ensure_ascii=False, separators=(",", ":"))
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                if lines:
+                    break
+                overflow = (cost - budget) * CHARS_PER_TOKEN + len(TRUNCATION_MARKER)
+                passages = list(projected.get("passages") or [])
+                if passages:
+                    while len(passages) > 1 and len(passages[-1]) < overflow:
+                        overflow -= len(passages.pop())
+                    passages[-1] = passages[-1][:-overflow] + TRUNCATION_MARKER
+                    projected["passages"] = passages
+                else:
+                    projected["content"] = projected.get("content", "")[:-overflow] + TRUNCATION_MARKER
+                line = json.dumps(projected, ensure_ascii=False, separators=(",", ":"))
+                cost = estimate_tokens(line)
+            lines.append(line)
+            used += cost
+        return "\n".join(lines)
+
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
-        Create and return a CrewAI task. 
+        Create and return a CrewAI task.
         Must be implemented by subclasses.
-        
+
         Args:
             agent: The CrewAI agent that will perform this task
             context_tasks: Optional list of tasks this task depends on
-            
+
         Returns:
             Task: A CrewAI task instance
         """
-        raise NotImplementedError("Subclasses must implement create_task()")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement create_task()")
@@ -8,6 +8,12 @@ from .task_base import BaseTask
 class WritingTask(BaseTask):
     """Task for writing draft press releases."""
     
+    context_fields = {
+        "user_prompt": 2000,
+        "system_prompt": 4000,
+        "json_data": 12000,
+    }
+    
     def create_task(self, agent: Agent, context_tasks: Optional[List[Task]] = None) -> Task:
         """
         Create and return the press release writing task.
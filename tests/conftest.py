@@ -0,0 +1,9 @@
+"""
+Test configuration: make the repository modules importable as top-level
+packages (corpus, pipeline, llm, ...), the way main.py runs them.
+"""
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
@@ -0,0 +1,51 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from agents.agent_registry import AgentRegistry
+from press_release_system import PressReleaseEnhancementSystem
+
+
+class FakeWrapper:
+    def __init__(self, name):
+        self.name = name
+        self.created = 0
+
+    def create_agent(self):
+        self.created += 1
+        return SimpleNamespace(role=self.name, serial=self.created)
+
+    def fingerprint(self):
+        return {"role": self.name}
+
+
+def _registry():
+    wrappers = {"writer": FakeWrapper("writer"), "fact_checker": FakeWrapper("fact_checker")}
+    return AgentRegistry(wrappers, {"writing": "writer", "fact_checking": "fact_checker"})
+
+
+def test_each_stage_gets_its_own_agent_once():
+    registry = _registry()
+    first = registry.resolve("fact_checking_1")
+    assert registry.resolve("fact_checking_1") is first
+    assert registry.resolve("fact_checking_2") is not first
+    assert registry.wrappers["fact_checker"].created == 2
+    assert registry.wrappers["writer"].created == 0
+    assert registry.fingerprint("fact_checking_2") == {"role": "fact_checker"}
+    with pytest.raises(ValueError, match="No agent assigned"):
+        registry.resolve("publishing")
+
+
+def test_job_copies_reuse_the_registry_of_their_worker_thread():
+    system = SimpleNamespace(_thread_registries=threading.local(), _create_agent_registry=_registry)
+    registry_of = PressReleaseEnhancementSystem._thread_agent_registry
+
+    first_job = registry_of(system)
+    assert registry_of(system) is first_job
+
+    other_thread = []
+    worker = threading.Thread(target=lambda: other_thread.append(registry_of(system)))
+    worker.start()
+    worker.join()
+    assert other_thread[0] is not first_job
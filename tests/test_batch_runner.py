@@ -0,0 +1,52 @@
+import json
+from types import SimpleNamespace
+
+from batch_runner import run_batch
+
+
+class FakeSystem:
+    """Stands in for a warm PressReleaseEnhancementSystem: jobs are copies with their own prompt."""
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+
+    def _load_file(self, path):
+        return path.read_text(encoding="utf-8").strip()
+
+    def with_user_prompt(self, user_prompt, output_path=None):
+        return SimpleNamespace(user_prompt=user_prompt, output_path=output_path)
+
+
+def _run_pipeline(job):
+    if "fout" in job.user_prompt:
+        raise RuntimeError("model unavailable")
+    if "leeg" in job.user_prompt:
+        return None
+    job.output_path.write_text(f"Persbericht over {job.user_prompt}", encoding="utf-8")
+    return job.output_path.read_text(encoding="utf-8")
+
+
+def test_run_batch_summary_and_failure_entries(tmp_path):
+    prompts = tmp_path / "user_input"
+    prompts.mkdir()
+    for name, prompt in (("a", "renovatie"), ("b", "fout"), ("c", "leeg"), ("d", "bouwgrond")):
+        (prompts / f"{name}.txt").write_text(prompt, encoding="utf-8")
+    (prompts / "notes.md").write_text("geen prompt", encoding="utf-8")
+
+    summary = run_batch(FakeSystem(tmp_path), _run_pipeline, workers=3)
+
+    assert (summary["prompts"], summary["succeeded"], summary["failed"]) == (4, 2, 2)
+    results = {entry["prompt"]: entry for entry in summary["results"]}
+    assert list(results) == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert results["b.txt"]["error"] == "RuntimeError: model unavailable"
+    assert results["c.txt"]["error"] == "Pipeline returned no output"
+    assert results["a.txt"]["success"] and results["a.txt"]["error"] is None
+    output_dir = tmp_path / "data" / "batch"
+    assert (output_dir / "a.txt").read_text(encoding="utf-8") == "Persbericht over renovatie"
+    saved = json.loads((output_dir / "summary.json").read_text(encoding="utf-8"))
+    assert saved["failed"] == 2 and len(saved["results"]) == 4
+
+
+def test_run_batch_without_prompts(tmp_path):
+    (tmp_path / "user_input").mkdir()
+    assert run_batch(FakeSystem(tmp_path), _run_pipeline)["prompts"] == 0
@@ -0,0 +1,41 @@
+import json
+
+from corpus.bm25_index import BM25Index, estimate_tokens, select_articles
+
+ARTICLES = [
+    {"title": "Vergunningsaanvragen op laagste peil", "content": "Nieuwbouw daalt terwijl renovatie op peil blijft."},
+    {"title": "Registratierechten op bouwgrond", "content": "De registratierechten moeten omlaag voor bouwgrond."},
+    {"title": "Bouwonderwijs groeit", "content": "Meer leerlingen kiezen voor duaal leren in de bouw."},
+]
+
+
+def test_search_ranks_matching_article_first():
+    index = BM25Index.build(ARTICLES)
+    results = index.search("registratierechten bouwgrond")
+    assert results[0][0] == 1
+    assert all(doc_id != 0 for doc_id, _ in results)
+
+
+def test_stopwords_do_not_match():
+    index = BM25Index.build(ARTICLES)
+    assert index.search("de het een") == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = BM25Index.build(ARTICLES)
+    path = tmp_path / "index.json"
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert loaded.search("duaal leren") == index.search("duaal leren")
+
+
+def test_select_articles_ranks_by_query():
+    index = BM25Index.build(ARTICLES)
+    assert select_articles(ARTICLES, index, "duaal leren", top_k=2) == [ARTICLES[2]]
+
+
+def test_select_articles_without_matching_terms_falls_back_to_the_corpus():
+    index = BM25Index.build(ARTICLES)
+    assert select_articles(ARTICLES, index, "xyz qqq") == ARTICLES
+    budget = estimate_tokens(json.dumps(ARTICLES[0], ensure_ascii=False))
+    assert select_articles(ARTICLES, index, "xyz qqq", token_budget=budget) == [ARTICLES[0]]
@@ -0,0 +1,9 @@
+from pipeline.checkpoint import RunCheckpoint
+
+
+def test_checkpoint_resumes_at_first_incomplete_stage(tmp_path):
+    checkpoint = RunCheckpoint.create(tmp_path, ["strategy", "writing", "editing"], metadata={"parallel": False})
+    checkpoint.save_stage("strategy", "Strategie")
+    loaded = RunCheckpoint.load(tmp_path, checkpoint.run_id)
+    assert loaded.completed_outputs() == {"strategy": "Strategie"}
+    assert loaded.first_incomplete_stage() == "writing"
@@ -0,0 +1,55 @@
+from corpus.claim_verifier import MISMATCHED, UNSOURCED, VERIFIED, extract_claims, verify_claims
+from corpus.fact_table import FactTable
+
+ARTICLES = [
+    {"url": "https://example.org/vergunningen", "publication_date": "20 feb 2025",
+     "content": "Het aantal vergunningsaanvragen voor nieuwbouwwoningen daalde vorig jaar met 40 % in Vlaanderen."},
+]
+
+
+def _statuses(drafts):
+    report = verify_claims(drafts, FactTable.build(ARTICLES))
+    return [claim["status"] for claim in report["claims"]]
+
+
+def test_extract_claims_skips_years_and_small_numbers():
+    claims = extract_claims("In 2024 waren er 3 sectoren en daalden de vergunningsaanvragen met 40 %.")
+    assert [claim["text"] for claim in claims] == ["40 %"]
+
+
+def test_extract_claims_of_one_draft():
+    drafts = "Draft 1\nDe aanvragen daalden met 40 %.\nDraft 2\nDe aanvragen daalden met 41 %."
+    assert [claim["text"] for claim in extract_claims(drafts, draft_label="2")] == ["41 %"]
+
+
+def test_claim_statuses():
+    assert _statuses("De vergunningsaanvragen voor nieuwbouwwoningen daalden met 40 % in Vlaanderen.") == [VERIFIED]
+    assert _statuses("De vergunningsaanvragen voor nieuwbouwwoningen daalden met 30 % in Vlaanderen.") == [MISMATCHED]
+    assert _statuses("Het aantal bouwbedrijven groeide met 12 %.") == [UNSOURCED]
+
+
+PROVINCES = [
+    {"url": "https://example.org/nieuwbouw-vlaams-brabant", "publication_date": "11 dec 2023",
+     "content": "De grootste daling van 18% in Vlaams-Brabant springt eruit, gevolgd door Antwerpen (-12%), "
+                "Limburg (-13%), en Oost-Vlaanderen (-9%)."},
+    {"url": "https://example.org/vergunningen-november", "publication_date": "27 nov 2023",
+     "content": "De grootste daling van 14% in Vlaams-Brabant springt eruit, gevolgd door Antwerpen (-8%), "
+                "Limburg (-8%), en West-Vlaanderen (-7%)."},
+]
+
+
+def test_figure_of_another_province_in_the_same_sentence_is_not_verified():
+    table = FactTable.build(PROVINCES)
+    report = verify_claims("De grootste daling zat in Vlaams-Brabant, gevolgd door Antwerpen (-9%).", table)
+    claim, = report["claims"]
+    assert claim["status"] == MISMATCHED
+    assert claim["sources"][0]["text"] == "-12%"
+
+
+def test_figures_of_each_province_are_verified():
+    table = FactTable.build(PROVINCES)
+    report = verify_claims("De grootste daling van 18% in Vlaams-Brabant springt eruit, "
+                           "gevolgd door Antwerpen (-12%) en Oost-Vlaanderen (-9%).", table)
+    assert [(claim["text"], claim["status"]) for claim in report["claims"]] == \
+        [("18%", VERIFIED), ("-12%", VERIFIED), ("-9%", VERIFIED)]
+    assert {claim["sources"][0]["publication_date"] for claim in report["claims"]} == {"11 dec 2023"}
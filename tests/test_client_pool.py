@@ -0,0 +1,58 @@
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from llm.client_pool import LLMClientPool
+
+
+class FakeChatModel:
+    """Stands in for ChatGoogleGenerativeAI: counts constructions, copies with model_copy."""
+
+    created = 0
+
+    def __init__(self, **fields):
+        FakeChatModel.created += 1
+        self.fields = fields
+        self.api_client = object()
+
+    def model_copy(self, update):
+        copy = object.__new__(FakeChatModel)
+        copy.fields = {**self.fields, **update}
+        copy.api_client = self.api_client
+        return copy
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    FakeChatModel.created = 0
+    monkeypatch.setitem(sys.modules, "langchain_google_genai",
+                        SimpleNamespace(ChatGoogleGenerativeAI=FakeChatModel))
+    return LLMClientPool()
+
+
+def test_agents_share_one_client_per_model_and_key(pool):
+    writer = pool.get("key", {"model": "gemini-2.0-flash", "temperature": 0.7}, cache=None)
+    checker = pool.get("key", {"model": "gemini-2.0-flash", "temperature": 0.2})
+
+    assert FakeChatModel.created == 1
+    assert writer.api_client is checker.api_client
+    assert writer.fields["temperature"] == 0.7
+    assert checker.fields["temperature"] == 0.2
+    assert pool.stats() == {"clients": 1, "models": 2}
+
+    pool.get("other key", {"model": "gemini-2.0-flash"})
+    pool.get("key", {"model": "gemini-2.0-pro"})
+    assert pool.stats() == {"clients": 3, "models": 4}
+
+
+def test_concurrent_agents_create_a_single_client(pool):
+    threads = [threading.Thread(target=pool.get, args=("key", {"model": "gemini-2.0-flash"}))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeChatModel.created == 1
+    assert pool.stats()["models"] == 8
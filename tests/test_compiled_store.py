@@ -0,0 +1,77 @@
+import json
+
+from corpus.compiled_store import CompiledCorpus, repair_mojibake
+
+
+def test_repair_mojibake():
+    assert repair_mojibake("â\x80\x98Bouwbalansâ\x80\x99") == "‘Bouwbalans’"
+    assert repair_mojibake("WalloniÃ«") == "Wallonië"
+
+
+def test_repair_mojibake_leaves_correct_text_alone():
+    assert repair_mojibake("‘Bouwbalans’ in Wallonië: 40 %") == "‘Bouwbalans’ in Wallonië: 40 %"
+
+
+def test_compile_cleans_articles_and_reads_them_lazily(tmp_path):
+    source = tmp_path / "corpus.json"
+    articles = [
+        {"url": "https://example.org/a", "title": "Walloni\u00c3\u00ab  bouwt", "content": "Lijn 1\n\n\n\nLijn 2",
+         "raw_html": "<p>niet nodig</p>"},
+        {"url": "https://example.org/b", "title": "Tweede", "content": "tekst"},
+    ]
+    with open(source, "w", encoding="utf-8") as f:
+        json.dump(articles, f)
+    with CompiledCorpus.compile(source) as store:
+        assert len(store) == 2
+        assert store[0] == {"url": "https://example.org/a", "title": "Walloni\u00eb bouwt", "content": "Lijn 1\n\nLijn 2"}
+        assert store[-1]["title"] == "Tweede"
+        assert store.is_current(source)
+
+
+def _write(path, articles):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(articles, f)
+
+
+def test_sync_patches_changed_articles_and_keeps_doc_ids(tmp_path):
+    source = tmp_path / "corpus.json"
+    articles = [{"url": f"https://example.org/{i}", "title": f"Bericht {i}", "content": "tekst"} for i in range(10)]
+    _write(source, articles)
+    store = CompiledCorpus.compile(source)
+    generation = store.generation
+
+    articles[3]["title"] = "Bericht 3 (bijgewerkt)"
+    articles.append({"url": "https://example.org/new", "title": "Nieuw", "content": "tekst"})
+    _write(source, articles)
+    store, stats = store.sync(source)
+
+    assert stats == {"added": 1, "updated": 1, "removed": 0}
+    assert store.generation == generation
+    assert store[3]["title"] == "Bericht 3 (bijgewerkt)"
+    assert store[10]["url"] == "https://example.org/new"
+    assert set(store.changes_since(0)) == {3, 10}
+    store.close()
+
+
+def test_sync_removes_by_url_and_keeps_the_last_duplicate(tmp_path):
+    source = tmp_path / "corpus.json"
+    articles = [{"url": f"https://example.org/{i}", "title": f"Bericht {i}", "content": "tekst"} for i in range(10)]
+    _write(source, articles)
+    store = CompiledCorpus.compile(source)
+
+    # Article 2 is removed and article 5 occurs twice, the later copy changed
+    del articles[2]
+    articles.append({"url": "https://example.org/5", "title": "Bericht 5 (tweede versie)", "content": "tekst"})
+    _write(source, articles)
+    store, stats = store.sync(source)
+
+    assert stats == {"added": 0, "updated": 1, "removed": 1}
+    assert store.is_removed(2) and store[2] == {}
+    assert store[5]["title"] == "Bericht 5 (tweede versie)"
+    assert store.live_count == 9
+    # The journal keeps the versions the indexes were built from
+    changes = store.changes_since(0)
+    assert sorted(changes) == [2, 5]
+    assert store.read_at(changes[2])["title"] == "Bericht 2"
+    assert store.read_at(changes[5])["title"] == "Bericht 5"
+    store.close()
@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from pipeline.dag_executor import CONTEXT_SEPARATOR, DagExecutor
+
+
+class FakeTask:
+    """A task that records its context and returns a fixed output after a delay."""
+
+    def __init__(self, output, context=(), delay=0.0, error=None):
+        self.output = output
+        self.description = f"Produce {output}"
+        self.context = list(context)
+        self.delay = delay
+        self.error = error
+        self.agent = object()
+        self.received = None
+        self.started = threading.Event()
+
+    def execute(self, context):
+        self.started.set()
+        self.received = context
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.output
+
+
+def _branches(delay=0.1, fail=False):
+    """strategy -> writing -> two fact-check/edit branches -> copywriting."""
+    strategy = FakeTask("strategie")
+    writing = FakeTask("drafts", [strategy])
+    check_1 = FakeTask("check 1", [writing], delay=delay)
+    check_2 = FakeTask("check 2", [writing], delay=0.0 if fail else delay,
+                       error=RuntimeError("quota") if fail else None)
+    edit_1 = FakeTask("edit 1", [check_1], delay=delay)
+    edit_2 = FakeTask("edit 2", [check_2], delay=delay)
+    copywriting = FakeTask("final", [edit_1, edit_2])
+    return {
+        "strategy": strategy, "writing": writing,
+        "fact_checking_1": check_1, "fact_checking_2": check_2,
+        "editing_1": edit_1, "editing_2": edit_2,
+        "copywriting": copywriting,
+    }
+
+
+def test_branches_run_in_parallel_and_join():
+    stages = _branches()
+    executor = DagExecutor(stages, max_workers=4)
+    outputs = executor.run()
+
+    assert outputs["copywriting"] == "final"
+    assert stages["copywriting"].received == CONTEXT_SEPARATOR.join(["edit 1", "edit 2"])
+    assert stages["fact_checking_2"].received == "drafts"
+    # Two branches of 2 x 0.1s each take about 0.2s, not 0.4s
+    assert executor.wall_time < 0.35
+
+
+def test_critical_path_follows_the_slowest_branch():
+    stages = _branches()
+    stages["editing_2"].delay = 0.2
+    executor = DagExecutor(stages, max_workers=4)
+    executor.run()
+    path, length = executor.critical_path()
+    assert path == ["strategy", "writing", "fact_checking_2", "editing_2", "copywriting"]
+    assert 0.3 <= length < 0.5
+
+
+def test_first_failure_cancels_the_other_branch():
+    stages = _branches(delay=0.3, fail=True)
+    executor = DagExecutor(stages, max_workers=4)
+    start = time.time()
+    with pytest.raises(RuntimeError, match="quota"):
+        executor.run()
+    # The failure is raised without waiting for the running fact check
+    assert time.time() - start < 0.25
+    time.sleep(0.4)
+    assert not stages["editing_1"].started.is_set()
+    assert not stages["editing_2"].started.is_set()
+    assert not stages["copywriting"].started.is_set()
+
+
+def test_cycle_and_foreign_dependency_are_rejected():
+    outside = FakeTask("extern")
+    with pytest.raises(ValueError, match="not part of the graph"):
+        DagExecutor({"a": FakeTask("a", [outside])})
+    a = FakeTask("a")
+    b = FakeTask("b", [a])
+    a.context = [b]
+    with pytest.raises(ValueError, match="cycle"):
+        DagExecutor({"a": a, "b": b})
+
+
+def test_reused_stages_are_checkpointed(tmp_path):
+    from pipeline.checkpoint import RunCheckpoint
+    from pipeline.stage_store import StageStore
+
+    store = StageStore(tmp_path / "drafts")
+    DagExecutor(_branches(delay=0.0), store=store).run()
+
+    stages = _branches(delay=0.0)
+    checkpoint = RunCheckpoint.create(tmp_path / "runs", list(stages))
+    executor = DagExecutor(stages, store=store, checkpoint=checkpoint)
+    executor.run()
+
+    assert executor.reused == set(stages)
+    assert checkpoint.first_incomplete_stage() is None
+    assert checkpoint.completed_outputs()["copywriting"] == "final"
+
+
+def test_hooked_context_is_part_of_the_stage_key(tmp_path):
+    from pipeline.stage_store import StageStore
+
+    store = StageStore(tmp_path / "drafts")
+    facts = {"value": "12%"}
+
+    def run():
+        stages = _branches(delay=0.0)
+        hooks = {"fact_checking_1": lambda drafts: f"{drafts} vs {facts['value']}"}
+        executor = DagExecutor(stages, store=store, context_hooks=hooks)
+        executor.run()
+        return stages, executor
+
+    run()
+    stages, executor = run()
+    assert "fact_checking_1" in executor.reused
+
+    # The drafts are unchanged but the looked-up facts are not
+    facts["value"] = "15%"
+    stages, executor = run()
+    assert "fact_checking_1" not in executor.reused
+    assert "fact_checking_2" in executor.reused
+    assert stages["fact_checking_1"].received == "drafts vs 15%"
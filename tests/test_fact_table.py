@@ -0,0 +1,64 @@
+import pytest
+
+from corpus.fact_table import DATE, EUR, NUMBER, PERCENT, POINTS, YEAR, FactTable, iter_clauses, iter_quantities, parse_number
+
+
+def _quantities(text):
+    return [(quantity["value"], quantity["unit"]) for quantity in iter_quantities(text)]
+
+
+def test_parse_number_dutch_separators():
+    assert parse_number("1.250") == (1250.0, 0)
+    assert parse_number("2,5") == (2.5, 1)
+    assert parse_number("1.250,75") == (1250.75, 2)
+    assert parse_number("13.688") == (13688.0, 0)
+    assert parse_number("13 688") == (13688.0, 0)
+    assert parse_number("13\u00a0688") == (13688.0, 0)
+
+
+def test_parse_number_rejects_dot_decimals():
+    with pytest.raises(ValueError):
+        parse_number("12.5")
+
+
+def test_iter_quantities_thousands_and_scales():
+    assert _quantities("al 13.688 minder vergunningen") == [(13688.0, NUMBER)]
+    assert _quantities("al 13 688 minder vergunningen") == [(13688.0, NUMBER)]
+    assert _quantities("goed voor 1,2 miljard") == [(1.2e9, NUMBER)]
+    assert _quantities("een daling van 40 %") == [(40.0, PERCENT)]
+
+
+def test_iter_quantities_skips_dot_decimals():
+    assert _quantities("12.5 miljoen en 3.5% en 1.2345") == []
+
+
+def test_iter_quantities_units():
+    assert _quantities("Een daling van 40 % of 3 procentpunt") == [(40.0, PERCENT), (3.0, POINTS)]
+    assert _quantities("Goed voor €1,2 miljard in 2024") == [(1.2e9, EUR), (2024.0, YEAR)]
+    assert _quantities("Gepubliceerd op 20 feb 2025") == [(20250220.0, DATE)]
+    assert _quantities("-9% nieuwbouw en 250 woningen") == [(-9.0, PERCENT), (250.0, NUMBER)]
+
+
+def test_find_value_uses_claim_precision():
+    table = FactTable.build([{"url": "u", "content": "Nieuwbouw daalt met 39,7 % in Vlaanderen."}])
+    assert table.find_value(40.0, PERCENT, 0.5) == [(0, 0)]
+    assert table.find_value(39.8, PERCENT, 0.05) == []
+
+
+def test_lookup_ranks_by_shared_keywords():
+    table = FactTable.build([
+        {"url": "a", "content": "De renovatie steeg met 5 % in Antwerpen."},
+        {"url": "b", "content": "De nieuwbouw daalde met 5 % in Limburg."},
+    ])
+    facts = table.lookup(5.0, PERCENT, context="nieuwbouw Limburg")
+    assert [fact["url"] for fact in facts] == ["b", "a"]
+    assert facts[0]["overlap"] == 2
+
+
+def test_iter_clauses_separates_listed_figures():
+    sentence = "De grootste daling van 18% in Vlaams-Brabant, gevolgd door Antwerpen (-12%) en Oost-Vlaanderen (-9%)."
+    assert [(quantity["text"], clause.strip()) for quantity, clause in iter_clauses(sentence)] == [
+        ("18%", "De grootste daling van 18% in Vlaams-Brabant"),
+        ("-12%", "gevolgd door Antwerpen (-12%)"),
+        ("-9%", "Oost-Vlaanderen (-9%)."),
+    ]
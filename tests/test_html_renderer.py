@@ -0,0 +1,65 @@
+import html_renderer
+from html_renderer import (
+    FINAL_RELEASE_MARKER, HTMLRenderStage, extract_final_release, parse_release, render_inline, render_release
+)
+
+RELEASE = f"""Versie 2 is sterker.
+
+{FINAL_RELEASE_MARKER}
+
+# Vergunningen op laagste peil
+## Nieuwbouw doet 40 % slechter
+
+Het aantal aanvragen daalt (zie [het bericht](https://www.embuildvlaanderen.be/press-room/a/)).
+
+> "De sector vraagt duidelijkheid", zegt de woordvoerder.
+
+- eerste punt
+- tweede punt
+
+###
+"""
+
+
+def test_extract_final_release_after_marker():
+    text, found = extract_final_release(RELEASE)
+    assert found
+    assert text.startswith("# Vergunningen op laagste peil")
+
+
+def test_extract_final_release_without_marker_returns_whole_text():
+    assert extract_final_release("Alleen een beoordeling.") == ("Alleen een beoordeling.", False)
+
+
+def test_parse_release_structure():
+    release = parse_release(extract_final_release(RELEASE)[0])
+    assert release["headline"] == "Vergunningen op laagste peil"
+    assert release["subheading"] == "Nieuwbouw doet 40 % slechter"
+    assert [block["type"] for block in release["blocks"]] == ["paragraph", "quote", "list", "end"]
+    assert release["blocks"][2]["items"] == ["eerste punt", "tweede punt"]
+
+
+def test_render_inline_escapes_text_and_drops_unsafe_links():
+    assert render_inline("a < b & [klik](javascript:void)") == "a &lt; b &amp; klik"
+    assert render_inline("[bron](https://example.org/x?a=1&b=2)") == \
+        '<a href="https://example.org/x?a=1&amp;b=2">bron</a>'
+
+
+def test_render_release_requires_final_release_when_asked():
+    assert render_release("Geen definitieve tekst.", require_final=True) is None
+    page = render_release(RELEASE, require_final=True)
+    assert "<h1>Vergunningen op laagste peil</h1>" in page
+    assert '<a href="https://www.embuildvlaanderen.be/press-room/a/">het bericht</a>' in page
+
+
+def test_render_stage_key_covers_renderer_version_and_fallback(monkeypatch):
+    from pipeline.stage_store import StageStore
+
+    def key(stage):
+        return StageStore.stage_key(stage, ["qa"])
+
+    local = key(HTMLRenderStage(object()))
+    assert key(HTMLRenderStage(object())) == local
+    assert key(HTMLRenderStage(object(), fallback=lambda context: "")) != local
+    monkeypatch.setattr(html_renderer, "RENDERER_VERSION", html_renderer.RENDERER_VERSION + 1)
+    assert key(HTMLRenderStage(object())) != local
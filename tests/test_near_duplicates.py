@@ -0,0 +1,27 @@
+from corpus.near_duplicates import DuplicateIndex, minhash, shingles, similarity
+
+TEXT = ("Embuild Vlaanderen stelt vast dat het aantal vergunningsaanvragen voor nieuwbouw opnieuw daalt, "
+        "terwijl renovatie op peil blijft. De sector vraagt de Vlaamse regering om snel duidelijkheid te geven "
+        "over de renovatieplicht en de registratierechten op bouwgrond.")
+
+
+def test_identical_texts_have_similarity_one():
+    assert similarity(minhash(shingles(TEXT)), minhash(shingles(TEXT))) == 1.0
+
+
+def test_unrelated_texts_have_low_similarity():
+    other = "Het aantal leerlingen in het bouwonderwijs stijgt dankzij duaal leren en gastlessen op Batibouw."
+    assert similarity(minhash(shingles(TEXT)), minhash(shingles(other))) < 0.2
+
+
+def test_collapse_keeps_longest_article_with_duplicate_urls():
+    articles = [
+        {"url": "https://example.org/a", "content": TEXT},
+        {"url": "https://example.org/b", "content": TEXT + " Meer informatie volgt."},
+        {"url": "https://example.org/c", "content": "Een heel ander bericht over klimaatdaken in Vlaanderen."},
+    ]
+    index = DuplicateIndex.build(articles)
+    assert index.representative(0) == 1
+    collapsed = index.collapse(articles, [0, 2])
+    assert [article["url"] for article in collapsed] == ["https://example.org/b", "https://example.org/c"]
+    assert collapsed[0]["duplicate_urls"] == ["https://example.org/a"]
@@ -0,0 +1,24 @@
+import pytest
+
+from corpus.passage_index import PassageIndex, numpy_available, split_passages
+
+
+def test_split_passages_respects_max_chars():
+    text = "\n".join(f"Paragraaf {i} over de bouwsector en de vergunningen." for i in range(20))
+    spans = split_passages(text, max_chars=200)
+    assert len(spans) > 1
+    assert all(end - start <= 200 for start, end in spans)
+    assert spans[0][0] == 0 and spans[-1][1] == len(text)
+    assert all(previous[1] <= following[0] for previous, following in zip(spans, spans[1:]))
+
+
+@pytest.mark.skipif(not numpy_available(), reason="numpy is not installed")
+def test_search_finds_passage_of_matching_article():
+    articles = [
+        {"title": "Renovatie", "content": "De renovatieplicht voor niet-residentiële gebouwen start in 2025."},
+        {"title": "Onderwijs", "content": "Duaal leren in het bouwonderwijs trekt meer leerlingen aan."},
+        {"title": "Grond", "content": "De registratierechten op bouwgrond moeten dalen volgens de sector."},
+    ]
+    index = PassageIndex.build(articles)
+    passage_id, _ = index.search("leerlingen bouwonderwijs", top_k=1)[0]
+    assert index.passage(articles, passage_id)[0] == 1
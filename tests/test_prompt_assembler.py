@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from prompt_assembler import PromptAssembler
+
+PROMPTS = Path(__file__).resolve().parent.parent / "prompts"
+
+
+def test_repository_prompts_include_source_citation_instructions():
+    assembler = PromptAssembler(
+        PROMPTS / "system_prompt.txt",
+        PROMPTS / "hyperlink_requirements.txt",
+        PROMPTS / "special_instructions",
+        max_topics=1
+    )
+    prompt, _ = assembler.assemble("Schrijf een persbericht over renovatie")
+    assert "(Embuild Vlaanderen, 20 feb 2025)" in prompt
+
+
+def test_prompt_is_rebuilt_when_a_prompt_file_changes(tmp_path):
+    system_prompt = tmp_path / "system_prompt.txt"
+    hyperlinks = tmp_path / "hyperlinks.txt"
+    system_prompt.write_text("Basis", encoding="utf-8")
+    hyperlinks.write_text("Bronnen v1", encoding="utf-8")
+    assembler = PromptAssembler(system_prompt, hyperlinks, tmp_path / "special", max_topics=1)
+    assert "Bronnen v1" in assembler.assemble("prompt")[0]
+    hyperlinks.write_text("Bronnen versie 2", encoding="utf-8")
+    assembler.refresh()
+    assert "Bronnen versie 2" in assembler.assemble("prompt")[0]
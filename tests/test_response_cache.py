@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from llm import response_cache
+from llm.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable clock for the cache's timestamps."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_make_key_depends_on_parameters_and_messages():
+    key = ResponseCache.make_key("gemini", 0.0, None, None, 1024, [{"role": "user", "content": "a"}])
+    assert key == ResponseCache.make_key("gemini", 0.0, None, None, 1024, [{"role": "user", "content": "a"}])
+    assert key != ResponseCache.make_key("gemini", 0.7, None, None, 1024, [{"role": "user", "content": "a"}])
+    assert key != ResponseCache.make_key("gemini", 0.0, None, None, 1024, [{"role": "user", "content": "b"}])
+
+
+def test_hit_and_miss_counters(tmp_path, clock):
+    cache = ResponseCache(tmp_path)
+    assert cache.get("k") is None
+    cache.set("k", "antwoord")
+    assert cache.get("k") == "antwoord"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"], stats["entries"]) == (1, 1, 0.5, 1)
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ResponseCache(tmp_path, ttl_seconds=60)
+    cache.set("k", "antwoord")
+    clock.value += 61
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = ResponseCache(tmp_path, max_entries=2)
+    cache.set("a", "1")
+    clock.value += 1
+    cache.set("b", "2")
+    clock.value += 1
+    cache.get("a")
+    clock.value += 1
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_limit_evicts_oldest(tmp_path, clock):
+    cache = ResponseCache(tmp_path, max_bytes=10)
+    cache.set("a", "x" * 6)
+    clock.value += 1
+    cache.set("b", "y" * 6)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 6
+
+
+def test_cache_persists_across_instances(tmp_path, clock):
+    ResponseCache(tmp_path).set("k", "antwoord")
+    assert ResponseCache(tmp_path).get("k") == "antwoord"
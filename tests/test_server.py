@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from pipeline.tracing import RunTrace
+from server import JobServer, QueueFullError
+
+
+class FakeJobSystem:
+    """A job copy: its crew run blocks until released and records a trace."""
+
+    def __init__(self, base, prompt):
+        self.base = base
+        self.prompt = prompt
+        self.thread = None
+        self.run_id = None
+        self.trace = None
+        self.parallel = False
+        self.html_renderer = "auto"
+
+    def run_crew(self):
+        self.thread = threading.current_thread()
+        self.base.jobs.append(self)
+        self.trace = RunTrace(f"run-{self.prompt}")
+        with self.trace.task_span("writing"):
+            pass
+        self.run_id = self.trace.run_id
+        if not self.base.release.wait(timeout=5):
+            raise RuntimeError("not released")
+        if self.prompt == "fout":
+            raise RuntimeError("model unavailable")
+        return f"Persbericht over {self.prompt}"
+
+    def generate_legacy(self):
+        return None
+
+
+class FakeSystem:
+    """Stands in for the warm system shared by all jobs."""
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.release = threading.Event()
+        self.jobs = []
+        self.warmed = set()
+        self.client = object()
+
+    def with_user_prompt(self, user_prompt, output_path=None):
+        return FakeJobSystem(self, user_prompt)
+
+    def create_thread_agents(self):
+        self.warmed.add(threading.current_thread())
+        return {"writer": object()}
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server(tmp_path):
+    job_server = JobServer(FakeSystem(tmp_path), workers=2, max_queue=1)
+    yield job_server
+    job_server.pr_system.release.set()
+    job_server.shutdown()
+
+
+def test_queue_is_bounded_and_jobs_run_on_warm_workers(server):
+    system = server.pr_system
+    server.warm_up()
+    assert len(system.warmed) == 2
+
+    running = []
+    for prompt, options in (("renovatie", {"parallel": True}), ("fout", None)):
+        running.append(server.submit(prompt, options))
+        _wait_for(lambda: len(system.jobs) == len(running))
+    queued = server.submit("bouwgrond")
+    assert queued["status"] == "queued"
+    with pytest.raises(QueueFullError):
+        server.submit("nog een")
+    assert server.status()["running"] == 2 and server.status()["queued"] == 1
+    assert [stage["stage"] for stage in server.snapshot(running[0]["id"])["stages"]] == ["writing"]
+
+    system.release.set()
+    _wait_for(lambda: all(server.snapshot(job["id"])["finished"] for job in running + [queued]))
+
+    done = server.snapshot(running[0]["id"])
+    assert done["status"] == "succeeded" and done["result"] == "Persbericht over renovatie"
+    assert done["run_id"] == "run-renovatie"
+    assert system.jobs[0].parallel is True
+    assert server.snapshot(running[1]["id"])["status"] == "failed"
+    assert server.snapshot(queued["id"])["status"] == "succeeded"
+    assert {job.thread for job in system.jobs} <= system.warmed
+
+
+def test_submit_rejects_bad_jobs(server):
+    with pytest.raises(ValueError, match="non-empty"):
+        server.submit("  ")
+    with pytest.raises(ValueError, match="Unknown job option"):
+        server.submit("renovatie", {"workers": 4})
+    with pytest.raises(ValueError, match="Unknown HTML renderer"):
+        server.submit("renovatie", {"html_renderer": "pdf"})
+    assert server.snapshot("onbekend") is None
@@ -0,0 +1,59 @@
+from corpus.source_index import SourceIndex, key_phrases, url_key
+from corpus.source_linker import link_sources
+
+ARTICLES = [
+    {"url": "https://www.embuildvlaanderen.be/press-room/vergunningen/", "publication_date": "20 feb 2025",
+     "title": "Vergunningsaanvragen op laagste peil in jaren", "subheading": "Nieuwbouw doet 40 % slechter",
+     "meta_description": "Bouwbalans: nieuwbouw doet 40 % slechter"},
+    {"url": "https://www.embuildvlaanderen.be/press-room/werkbaar-werk/", "publication_date": "23 jan 2025",
+     "title": "Werkbaar werk: bouw scoort beter dan Vlaams gemiddelde", "subheading": "Werkbaarheid in de bouw"},
+    {"url": "https://www.embuildvlaanderen.be/press-room/woonwaarborg/", "publication_date": "23 jan 2025",
+     "title": "Uitstel woonwaarborg slechte zaak", "subheading": "Huishoudens wachten op de woonwaarborg"},
+]
+
+
+def _index():
+    return SourceIndex.build(ARTICLES)
+
+
+def test_url_key_ignores_scheme_www_and_trailing_slash():
+    assert url_key("http://embuildvlaanderen.be/press-room/a") == url_key("https://www.embuildvlaanderen.be/press-room/a/")
+
+
+def test_key_phrases():
+    assert key_phrases(ARTICLES[0]) == ["bouwbalans"]
+    assert key_phrases({"title": "Reactie: iets anders"}) == []
+
+
+def test_links_dated_citation_and_name():
+    text, report = link_sources("De vergunningen dalen (Embuild Vlaanderen, 20 feb 2025). Werkbaar werk blijft.", _index())
+    assert text == ("De vergunningen dalen ([Embuild Vlaanderen, 20 feb 2025]"
+                    "(https://www.embuildvlaanderen.be/press-room/vergunningen/)). "
+                    "[Werkbaar werk](https://www.embuildvlaanderen.be/press-room/werkbaar-werk/) blijft.")
+    assert report["counts"]["linked"] == 2
+
+
+def test_shared_date_resolved_by_context_or_left_unlinked():
+    index = _index()
+    text, _ = link_sources("<p>De woonwaarborg wordt uitgesteld (23 jan 2025).</p>", index)
+    assert '<a href="https://www.embuildvlaanderen.be/press-room/woonwaarborg/">23 jan 2025</a>' in text
+    text, report = link_sources("<p>Iets anders (23 jan 2025).</p>", index)
+    assert "<a " not in text
+    assert report["counts"]["unresolved"] == 1
+
+
+def test_existing_links_corrected_or_unwrapped():
+    index = _index()
+    html = ('<p><a href="https://embuildvlaanderen.be/press-room/vergunningen">bericht</a> '
+            '<a href="https://www.embuildvlaanderen.be/press-room/verzonnen/">verzonnen</a> '
+            '<a href="https://example.org/x">extern</a></p>')
+    text, report = link_sources(html, index)
+    assert '<a href="https://www.embuildvlaanderen.be/press-room/vergunningen/">bericht</a>' in text
+    assert "verzonnen" in text and "press-room/verzonnen" not in text
+    assert '<a href="https://example.org/x">extern</a>' in text
+    assert report["counts"] == {"linked": 0, "corrected": 1, "unwrapped": 1, "unresolved": 0}
+
+
+def test_page_head_is_not_linked():
+    text, _ = link_sources("<html><head><title>Werkbaar werk</title></head><body><p>Tekst</p></body></html>", _index())
+    assert "<title>Werkbaar werk</title>" in text
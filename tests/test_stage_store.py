@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+from pipeline.stage_store import StageStore, output_hash
+
+
+def _task(description):
+    return SimpleNamespace(description=description, expected_output="tekst", agent=None)
+
+
+def test_stage_key_depends_on_every_input():
+    agent = {"role": "Editor"}
+    key = StageStore.stage_key(_task("Bewerk"), [output_hash("a")], agent)
+    assert key == StageStore.stage_key(_task("Bewerk"), [output_hash("a")], agent)
+    assert key != StageStore.stage_key(_task("Bewerk!"), [output_hash("a")], agent)
+    assert key != StageStore.stage_key(_task("Bewerk"), [output_hash("b")], agent)
+    assert key != StageStore.stage_key(_task("Bewerk"), [output_hash("a")], {"role": "Copywriter"})
+
+
+def test_store_round_trip(tmp_path):
+    store = StageStore(tmp_path)
+    key = StageStore.stage_key(_task("Schrijf"), [])
+    assert store.load(key) is None
+    store.save("writing", key, "Persbericht")
+    assert store.load(key) == "Persbericht"
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from corpus.stream import iter_articles
+
+ARTICLES = [
+    {"url": "https://example.org/a", "title": "Vergunningen \"dalen\"", "content": "Nieuwbouw {−12 %} [Antwerpen]"},
+    {"url": "https://example.org/b", "title": "Ééngezinswoningen", "content": "Citaat: \\\"}, {\" blijft tekst", "tags": []},
+    {"url": "https://example.org/c", "title": "Leeg", "content": "", "date": None, "views": 1250},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_articles_split_across_chunks_are_parsed_in_order(tmp_path, chunk_size, indent):
+    path = tmp_path / "corpus.json"
+    path.write_text(json.dumps(ARTICLES, ensure_ascii=False, indent=indent), encoding="utf-8")
+    assert list(iter_articles(path, chunk_size=chunk_size)) == ARTICLES
+
+
+def test_empty_array_and_older_layout(tmp_path):
+    path = tmp_path / "corpus.json"
+    path.write_text(" [ \n ] ", encoding="utf-8")
+    assert list(iter_articles(path, chunk_size=1)) == []
+    path.write_text(json.dumps({"articles": ARTICLES[:1]}), encoding="utf-8")
+    assert list(iter_articles(path)) == ARTICLES[:1]
+
+
+@pytest.mark.parametrize("text, message", [
+    ('"geen array"', "does not contain a JSON array"),
+    ('[{"url": "a"}, {"url": "b"', "Invalid article"),
+    ('[{"url": "a"}', "ends inside the article array"),
+    ('[{"url": "a"} {"url": "b"}]', "Expected ','"),
+])
+def test_malformed_corpus_is_rejected(tmp_path, text, message):
+    path = tmp_path / "corpus.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        list(iter_articles(path, chunk_size=3))
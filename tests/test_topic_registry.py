@@ -0,0 +1,62 @@
+import random
+
+from topic_registry import Topic, TopicRegistry
+
+
+def test_parse_header_lines():
+    topic = Topic.parse("fiscaliteit", "# keywords: Verkooprecht, belasting\n# priority: 3\n\nInstructies.")
+    assert topic.keywords == ["verkooprecht", "belasting"]
+    assert topic.priority == 3
+    assert topic.instructions == "Instructies."
+
+
+def test_score_counts_occurrences_per_topic():
+    registry = TopicRegistry([
+        Topic("bouw", ["bouw", "verbouwing"], "a"),
+        Topic("renovatie", ["renovatie", "verbouw"], "b"),
+    ])
+    # "bouw" inside "verbouwing" counts once for its topic
+    assert registry.score("De verbouwing en de renovatie van de bouw") == {"bouw": 2, "renovatie": 2}
+
+
+def test_detect_ranks_by_score_then_priority():
+    registry = TopicRegistry([
+        Topic("a", ["woning"], "a", priority=1),
+        Topic("b", ["woning"], "b", priority=2),
+        Topic("c", ["grond"], "c"),
+    ])
+    assert registry.detect("woning op grond", max_topics=None) == ["b", "a", "c"]
+    assert registry.detect("niets") == []
+
+
+def _naive_score(topics, text):
+    """Per topic: at each position its longest keyword, unless inside its last counted occurrence."""
+    scores = {}
+    for topic in topics:
+        count, counted_until = 0, 0
+        for start in range(len(text)):
+            lengths = [len(keyword) for keyword in topic.keywords if text.startswith(keyword, start)]
+            if lengths and start >= counted_until:
+                count += 1
+                counted_until = start + max(lengths)
+        if count:
+            scores[topic.name] = count
+    return scores
+
+
+def _random_word(rng):
+    return "".join(rng.choice("ab") for _ in range(rng.randint(1, 4)))
+
+
+def test_score_matches_naive_count_per_topic():
+    rng = random.Random(0)
+    for _ in range(3000):
+        # Short keywords over two letters share prefixes across topics
+        topics = [Topic(f"t{i}", [_random_word(rng) for _ in range(3)], "x") for i in range(3)]
+        text = "".join(rng.choice("ab ") for _ in range(30))
+        assert TopicRegistry(topics).score(text) == _naive_score(topics, text), (text, [t.keywords for t in topics])
+
+
+def test_shared_prefix_keyword_of_another_topic_does_not_hide_occurrences():
+    registry = TopicRegistry([Topic("kort", ["bouw"], "a"), Topic("lang", ["bouwbouw"], "b")])
+    assert registry.score("bouwbouw") == {"kort": 2, "lang": 1}
@@ -0,0 +1,48 @@
+import json
+import threading
+
+import pytest
+
+from pipeline.tracing import RunTrace, current_stage
+
+
+def test_trace_json_attributes_calls_to_their_stage(tmp_path):
+    trace = RunTrace("run-1")
+    with trace.task_span("writing", agent_role="Writer") as span:
+        assert current_stage() == "writing"
+        trace.record_llm_call("fallback role", 10.0, 11.5, 1200, 300, model="gemini-2.0-flash", retries=2)
+        trace.record_llm_call(None, 12.0, 12.0, 1200, 300, cache_hit=True)
+        span["reused"] = False
+    with pytest.raises(RuntimeError):
+        with trace.task_span("fact_checking", agent_role="Fact Checker"):
+            raise RuntimeError("quota")
+    trace.record_llm_call("legacy", 13.0, 14.0, 500, 100, estimated_tokens=True)
+    trace.finish()
+
+    path = trace.write(tmp_path)
+    assert path == tmp_path / "run-1" / "trace.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    assert data["run_id"] == "run-1" and data["mode"] == "crew"
+    assert data["totals"] == {
+        "llm_calls": 3, "prompt_tokens": 2900, "completion_tokens": 700,
+        "retries": 2, "cache_hits": 1, "llm_time": 2.5,
+    }
+    assert [task["stage"] for task in data["tasks"]] == ["writing", "fact_checking"]
+    assert data["tasks"][1]["status"] == "failed"
+    assert data["tasks"][1]["error"] == "RuntimeError: quota"
+    first, second, legacy = data["llm_calls"]
+    assert (first["stage"], first["agent_role"], first["model"]) == ("writing", "Writer", "gemini-2.0-flash")
+    assert second["cache_hit"] and second["stage"] == "writing"
+    assert (legacy["stage"], legacy["agent_role"], legacy["estimated_tokens"]) == (None, "legacy", True)
+    assert current_stage() is None
+
+
+def test_spans_on_other_threads_do_not_leak_their_stage():
+    trace = RunTrace("run-2")
+    seen = []
+    with trace.task_span("editing_1"):
+        worker = threading.Thread(target=lambda: seen.append(current_stage()))
+        worker.start()
+        worker.join()
+    assert seen == [None]
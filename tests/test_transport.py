@@ -0,0 +1,32 @@
+import email.utils
+import time
+
+from llm.rate_limiter import RateLimiter
+from llm.transport import GeminiTransport, parse_retry_after
+
+
+def test_acquire_within_quota_does_not_wait():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=10000)
+    assert limiter.acquire(tokens=100) == 0
+
+
+def test_exhausted_request_bucket_waits_for_refill():
+    limiter = RateLimiter(requests_per_minute=6000)
+    limiter._requests = 0
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.005
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("morgen") is None
+    future = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= parse_retry_after(future) <= 31
+
+
+def test_backoff_delay_honours_retry_after():
+    transport = GeminiTransport("http://localhost", "key")
+    assert transport.backoff_delay(0, retry_after=5.0) >= 5.0
+    assert 0 <= transport.backoff_delay(10) <= transport.backoff_max
@@ -0,0 +1,70 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "reserve"))
+
+from verify_output import scan_output, verify_outputs  # noqa: E402
+
+ARTICLES = [
+    {"url": "https://www.embuildvlaanderen.be/press-room/vergunningen/", "title": "Vergunningen"},
+    {"url": "https://www.embuildvlaanderen.be/press-room/renovatie/", "title": "Renovatie"},
+]
+
+HTML = """<p>Het aantal vergunningen daalt (<a href="https://embuildvlaanderen.be/press-room/vergunningen">bericht van 20 feb 2025</a>).</p>
+<p>Renovatie blijft achter (<a href="https://www.embuildvlaanderen.be/press-room/renovatie/?utm=x">bericht van 3 mrt 2025</a>).</p>
+<p>De sector vraagt duidelijkheid (<a href="https://example.org/elders">elders</a>).</p>
+<p>Geen link hier.</p>"""
+
+MARKDOWN = """Eerste alinea met [bericht van 20 feb 2025](https://www.embuildvlaanderen.be/press-room/vergunningen/).
+
+Tweede alinea zonder link.
+"""
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    corpus = tmp_path / "emv_pers.json"
+    corpus.write_text(json.dumps(ARTICLES), encoding="utf-8")
+    batch = tmp_path / "batch"
+    batch.mkdir()
+    (batch / "a.html").write_text(HTML, encoding="utf-8")
+    (batch / "b.md").write_text(MARKDOWN, encoding="utf-8")
+    (batch / "c.txt").write_bytes(b"\xff\xfe kapot")
+    (batch / "notes.json").write_text("{}", encoding="utf-8")
+    return corpus, batch
+
+
+def test_scan_output_counts_paragraphs_and_links():
+    links, paragraphs = scan_output(HTML)
+    assert paragraphs == [True, True, True, False]
+    assert [link["format"] for link in links] == ["html"] * 3
+    links, paragraphs = scan_output(MARKDOWN)
+    assert paragraphs == [True, False]
+    assert links[0]["text"] == "bericht van 20 feb 2025"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_outputs_batch_reports(outputs, tmp_path, workers):
+    corpus, batch = outputs
+    report_dir = tmp_path / "reports"
+    reports, summary = verify_outputs([str(batch)], str(corpus), report_dir=str(report_dir), workers=workers)
+
+    assert [Path(report["file"]).name for report in reports] == ["a.html", "b.md", "c.txt"]
+    html, markdown, broken = reports
+    assert (html["total_links_found"], html["matching_urls"], html["links_include_dates"]) == (3, 2, 2)
+    assert html["score"] == 2
+    assert markdown["matching_urls"] == 1 and markdown["score"] == 3
+    assert "error" in broken
+
+    assert summary["files"] == 3 and summary["corpus_urls"] == 2
+    assert [Path(error["file"]).name for error in summary["errors"]] == ["c.txt"]
+    assert summary["totals"]["total_links_found"] == 4
+    assert summary["scores"] == {"0": 0, "1": 0, "2": 1, "3": 1, "4": 0}
+    assert len(summary["below_requirements"]) == 2
+
+    written = sorted(path.name for path in report_dir.iterdir())
+    assert written == ["a.html.verify.json", "b.md.verify.json", "c.txt.verify.json", "summary.json"]
+    assert json.loads((report_dir / "summary.json").read_text(encoding="utf-8"))["files"] == 3
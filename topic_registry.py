@@ -0,0 +1,165 @@
+"""
+Topic registry: special instruction files and the keywords that select them.
+
+Each file in prompts/special_instructions/ is a topic named after the file.
+Its keywords are declared in header lines at the top of the file, which are
+stripped from the instructions added to the system prompt:
+
+    # keywords: verkooprecht, registratierecht, belasting, fiscaal
+    # priority: 3
+
+Keywords match case-insensitively anywhere in the prompt ("bouw" also
+matches "bouwsector"); a topic scores a point per occurrence. All keywords of all topics are compiled into one
+trie-shaped regular expression, so a prompt is scanned once however many
+topics are registered, and every topic is scored in that pass.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Header lines of an instruction file: "# <field>: <value>"
+_HEADER_PATTERN = re.compile(r"#\s*(\w+)\s*:\s*(.*)")
+
+
+class Topic:
+    """One special instruction file."""
+
+    def __init__(self, name: str, keywords: Iterable[str], instructions: str, priority: int = 0):
+        self.name = name
+        self.keywords = [keyword.strip().lower() for keyword in keywords if keyword.strip()]
+        self.instructions = instructions
+        self.priority = priority
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Topic":
+        """Read an instruction file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.parse(Path(path).stem, f.read())
+
+    @classmethod
+    def parse(cls, name: str, text: str) -> "Topic":
+        """Parse the text of an instruction file: its header lines, then the instructions."""
+        lines = text.splitlines()
+        fields = {}
+        body_start = 0
+        for body_start, line in enumerate(lines):
+            header = _HEADER_PATTERN.fullmatch(line.strip())
+            if not header:
+                if line.strip():
+                    break
+                continue
+            fields[header.group(1).lower()] = header.group(2)
+        else:
+            body_start = len(lines)
+        try:
+            priority = int(fields.get("priority", 0))
+        except ValueError:
+            priority = 0
+        return cls(
+            name=name,
+            keywords=fields.get("keywords", "").split(","),
+            instructions="\n".join(lines[body_start:]).strip(),
+            priority=priority
+        )
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regular expression matching any of the keywords, shaped as a trie so the
+    engine follows one branch per character instead of trying every keyword.
+    Optional suffixes are greedy, so the longest keyword at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class TopicRegistry:
+    """Special instruction topics with a single-pass keyword matcher."""
+
+    def __init__(self, topics: Iterable[Topic] = ()):
+        self.topics: Dict[str, Topic] = {topic.name: topic for topic in topics}
+        self._keyword_topics: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self._pattern = None
+        self._compile()
+
+    @classmethod
+    def load(cls, directory: Path) -> "TopicRegistry":
+        """Load every .txt instruction file of a directory (an empty registry if it is missing)."""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return cls()
+        return cls(Topic.from_file(path) for path in sorted(directory.glob("*.txt")))
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def _compile(self) -> None:
+        owners: Dict[str, List[str]] = {}
+        for topic in self.topics.values():
+            for keyword in topic.keywords:
+                owners.setdefault(keyword, []).append(topic.name)
+        if not owners:
+            return
+        # A match is the longest keyword starting at a position; the keywords
+        # that are prefixes of it occur there as well. Each topic is paired
+        # with the length of its own longest keyword among them.
+        for keyword in owners:
+            lengths: Dict[str, int] = {}
+            for end in range(1, len(keyword) + 1):
+                for name in owners.get(keyword[:end], ()):
+                    lengths[name] = end
+            self._keyword_topics[keyword] = tuple(lengths.items())
+        # The lookahead tests every position, so overlapping occurrences count too
+        self._pattern = re.compile("(?=(" + _trie_pattern(owners) + "))")
+
+    def score(self, text: Optional[str]) -> Dict[str, int]:
+        """Keyword occurrences per topic in a text (topics without any are left out)."""
+        scores: Dict[str, int] = {}
+        if not text or self._pattern is None:
+            return scores
+        keyword_topics = self._keyword_topics
+        # End of the last counted occurrence per topic: a keyword inside
+        # another keyword of the same topic ("bouw" in "verbouwing") counts once
+        counted_until: Dict[str, int] = {}
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            start = match.start()
+            for name, length in keyword_topics[keyword]:
+                if start >= counted_until.get(name, 0):
+                    scores[name] = scores.get(name, 0) + 1
+                    counted_until[name] = start + length
+        return scores
+
+    def detect(self, text: Optional[str], max_topics: Optional[int] = 1) -> List[str]:
+        """
+        Names of the best matching topics for a text.
+
+        Topics are ranked by keyword occurrences, then by priority, then by name.
+
+        Args:
+            text: Prompt text
+            max_topics: Maximum number of topics returned (None for all matching topics)
+        """
+        scores = self.score(text)
+        ranked = sorted(scores, key=lambda name: (-scores[name], -self.topics[name].priority, name))
+        return ranked if max_topics is None else ranked[:max_topics]
+
+    def instructions(self, names: Iterable[str]) -> List[str]:
+        """Instruction texts of the given topics, skipping empty ones."""
+        return [self.topics[name].instructions for name in names if self.topics[name].instructions]